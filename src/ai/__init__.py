@@ -0,0 +1 @@
+"""AI module: win-probability estimates and computer players."""
@@ -0,0 +1,197 @@
+"""
+Monte Carlo win-probability estimates for a game in progress.
+
+estimate_win_probability(game, player) answers "what are my odds here?"
+from the point of view of one player, without looking at what that player
+cannot see. Every rollout determinizes the hidden information, then plays
+the game out on a CompactEngine with a policy for both sides:
+
+- the opponent's hand is redealt from the opponent's unseen cards (hand and
+  deck together), with a Basic Pokemon in it while the opponent still has
+  to choose an Active Pokemon;
+- both decks are shuffled.
+
+A win scores 1, a draw 1/2. Rollouts run in batches until the standard
+error of the mean score drops below the tolerance, the rollout or time
+budget runs out, whichever comes first. Batches can be spread over a
+process pool; a rollout's random stream only depends on the seed and its
+number, so the estimate does not depend on how rollouts are scheduled.
+The live game and its random stream are never touched.
+"""
+import math
+import time
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from ..cards.catalog import CardCatalog, get_catalog
+from ..game.compact import EMPTY, SLOTS, CompactEngine, CompactState
+from ..game.rng import GameRandom, new_seed, stream_seed
+from ..sim.policies import get_policy
+from ..sim.simulate import play_out
+
+
+@dataclass
+class WinEstimate:
+    """Estimated win probability of one player."""
+    player: int
+    win_probability: float  # Draws count as half a win
+    standard_error: float
+    rollouts: int
+    wins: int
+    draws: int
+    seconds: float
+    converged: bool  # Stopped because the standard error reached the tolerance
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        """Approximate 95% confidence interval."""
+        margin = 1.96 * self.standard_error
+        return max(0.0, self.win_probability - margin), min(1.0, self.win_probability + margin)
+
+
+def compact_view(game) -> Tuple[CompactState, CardCatalog, int]:
+    """The compact state, catalog and acting player of a GameEngine or CompactEngine game.
+
+    Raises ValueError for games holding cards the compact engine cannot represent.
+    """
+    if isinstance(game, CompactEngine):
+        return game.state, game.catalog, game.acting_player
+    return CompactState.from_game(game), game.catalog, game.acting_player_index
+
+
+def determinize(state: CompactState, player: int, rng: GameRandom, basic: Sequence[bool]) -> CompactState:
+    """Copy a state with the information hidden from player resampled.
+
+    The opponent's hand is redealt from its hand and deck, and both decks
+    are shuffled; everything player can see is kept. basic tells the Basic
+    Pokemon apart by catalog index (CardTables.basic): while the opponent has
+    no Active Pokemon yet, only hands holding a Basic are dealt, as the
+    mulligan rule guarantees, so the opponent always has a setup move.
+    """
+    state = state.clone()
+    opponent = 1 - player
+    hand, deck = state.hand[opponent], state.deck[opponent]
+    unseen = list(hand) + list(deck)
+    rng.shuffle(unseen)
+    if (state.setup_phase and state.card[opponent * SLOTS] == EMPTY and hand
+            and any(basic[idx] for idx in unseen)):
+        while not any(basic[idx] for idx in unseen[:len(hand)]):
+            rng.shuffle(unseen)
+    hand[:] = array('h', unseen[:len(hand)])
+    deck[:] = array('h', unseen[len(hand):])
+    own = list(state.deck[player])
+    rng.shuffle(own)
+    state.deck[player][:] = array('h', own)
+    return state
+
+
+def run_rollouts(engine: CompactEngine, state: CompactState, player: int, policy: str, seed: int,
+                 start: int, stop: int) -> Tuple[int, int, float]:
+    """Play rollouts start..stop-1 from state; returns (wins, draws, sum of squared scores)."""
+    policies = (get_policy(policy),) * 2
+    wins = draws = 0
+    for i in range(start, stop):
+        rng = GameRandom(stream_seed(seed, i))
+        engine.rng = rng
+        engine.load_state(determinize(state, player, rng, engine.tables.basic))
+        play_out(engine, policies, rng)
+        winner = engine.winner
+        if winner == player:
+            wins += 1
+        elif winner is None:
+            draws += 1
+    # Scores are 0, 1/2 or 1, so the sum of squares follows from the counts
+    return wins, draws, wins + draws / 4
+
+
+def _worker_rollouts(snapshot: bytes, player: int, policy: str, seed: int, start: int, stop: int) -> tuple:
+    """Worker side of run_rollouts, on a state snapshot and the worker's catalog."""
+    return run_rollouts(CompactEngine(get_catalog()), CompactState.from_bytes(snapshot), player, policy, seed,
+                        start, stop)
+
+
+def estimate_win_probability(game, player: Optional[int] = None, max_rollouts: int = 2000,
+                             policy: str = 'greedy', tolerance: float = 0.01, min_rollouts: int = 100,
+                             batch_size: int = 50, time_limit: Optional[float] = None, workers: int = 1,
+                             executor: Optional[Executor] = None, seed: Optional[int] = None,
+                             catalog: Optional[CardCatalog] = None) -> WinEstimate:
+    """Estimate the win probability of player (default: the acting player) in a GameEngine or CompactEngine game.
+
+    Stops once min_rollouts are done and the standard error is at most
+    tolerance, after max_rollouts, or once time_limit seconds have passed
+    (checked between batches, so at least one batch always runs). With workers > 1, or a given executor, batches
+    run in worker processes, which use the default catalog; pass a
+    long-lived executor to avoid starting a pool per estimate. Raises
+    ValueError for games holding cards the compact engine cannot represent
+    (see compact_view), or for max_rollouts or batch_size below 1.
+    """
+    start_time = time.perf_counter()
+    if max_rollouts < 1:
+        raise ValueError(f"max_rollouts must be at least 1, got {max_rollouts}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    state, game_catalog, acting = compact_view(game)
+    catalog = catalog or game_catalog
+    player = acting if player is None else player
+    get_policy(policy)  # Fail early on unknown names
+    if state.game_over:
+        score = 0.5 if state.winner < 0 else float(state.winner == player)
+        return WinEstimate(player, score, 0.0, 0, int(score == 1.0), int(score == 0.5), 0.0, True)
+
+    seed = new_seed() if seed is None else seed
+    own_pool = None
+    if executor is None and workers > 1:
+        executor = own_pool = ProcessPoolExecutor(max_workers=workers, initializer=get_catalog)
+    parallel = max(1, workers) if executor is not None else 1
+    engine = CompactEngine(catalog)
+    snapshot = state.to_bytes()
+    done = wins = draws = 0
+    squares = 0.0
+    try:
+        while done < max_rollouts:
+            # One batch per worker per round
+            bounds: List[Tuple[int, int]] = []
+            for _ in range(parallel):
+                stop = min(done + batch_size, max_rollouts)
+                if stop > done:
+                    bounds.append((done, stop))
+                    done = stop
+            if executor is None:
+                results = [run_rollouts(engine, state, player, policy, seed, lo, hi) for lo, hi in bounds]
+            else:
+                futures = [executor.submit(_worker_rollouts, snapshot, player, policy, seed, lo, hi)
+                           for lo, hi in bounds]
+                results = [future.result() for future in futures]
+            for batch_wins, batch_draws, batch_squares in results:
+                wins += batch_wins
+                draws += batch_draws
+                squares += batch_squares
+            error = _standard_error(wins + draws / 2, squares, done)
+            if done >= min_rollouts and error <= tolerance:
+                break
+            # Checked after the batch, so the mean below is never over zero rollouts
+            if time_limit is not None and time.perf_counter() - start_time >= time_limit:
+                break
+    finally:
+        if own_pool is not None:
+            own_pool.shutdown()
+    mean = (wins + draws / 2) / done
+    error = _standard_error(wins + draws / 2, squares, done)
+    return WinEstimate(player, mean, error, done, wins, draws, time.perf_counter() - start_time,
+                       done >= min_rollouts and error <= tolerance)
+
+
+def _standard_error(total: float, squares: float, n: int) -> float:
+    """Standard error of the mean of n scores from their sum and sum of squares.
+
+    One pseudo win and one pseudo loss are added, so that runs of identical
+    results do not claim a zero error.
+    """
+    if n < 2:
+        return float('inf')
+    total, squares, n = total + 1, squares + 1, n + 2
+    mean = total / n
+    variance = max(0.0, (squares - n * mean * mean) / (n - 1))
+    return math.sqrt(variance / n)
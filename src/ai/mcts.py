@@ -0,0 +1,180 @@
+"""
+Monte Carlo Tree Search computer player.
+
+MCTSAgent picks moves through the engines' Action interface with an
+information-set search over the compact engine, from the point of view of
+the player it plays for:
+
+- every iteration starts from a fresh determinization of the hidden
+  information (see estimator.determinize) and a fresh random stream;
+- decision nodes keep one edge per action; since the legal actions vary
+  between determinizations, edges are compared with UCB over the number of
+  iterations in which they were available;
+- chance is explicit: the outcomes of an edge are keyed by what the player
+  observes after the action, so coin flips (Stomp, Double Horn, Sleep and
+  Burn checks, ...) and the agent's own draws lead to separate child nodes,
+  visited in proportion to how often they come up;
+- leaves are evaluated with a policy rollout to the end of the game.
+
+The search runs until a wall-clock or iteration budget is spent. Between
+decisions the tree is kept: the next search starts from the node whose
+observation matches the new position, if the moves played since are in the
+tree.
+"""
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from ..cards.catalog import CardCatalog
+from ..game.actions import Action
+from ..game.compact import CompactEngine, CompactState
+from ..game.rng import GameRandom, new_seed
+from ..sim.policies import get_policy
+from ..sim.simulate import play_out
+from .estimator import compact_view, determinize
+
+REUSE_DEPTH = 24  # Plies searched below the previous root when reusing the tree
+
+
+class Node:
+    """A decision point: the player's observation and one edge per action tried there."""
+
+    __slots__ = ('observation', 'edges')
+
+    def __init__(self, observation: bytes):
+        self.observation = observation
+        self.edges: Dict[Action, 'Edge'] = {}
+
+
+class Edge:
+    """An action from a node, with its statistics and one child node per observed outcome."""
+
+    __slots__ = ('visits', 'value', 'available', 'outcomes')
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0  # Summed rewards of the player taking the action
+        self.available = 0  # Iterations in which the action was legal here
+        self.outcomes: Dict[bytes, Node] = {}
+
+
+class MCTSAgent:
+    """A computer player searching each decision with MCTS within a time or iteration budget.
+
+    It can be called as a policy (agent(engine, actions, rng)) or asked for
+    a move with choose(game), for a GameEngine or a CompactEngine game. A
+    budget of None leaves that limit out; at least one must be set.
+    """
+
+    def __init__(self, time_limit: Optional[float] = 0.2, iterations: Optional[int] = None,
+                 exploration: float = 0.7, rollout_policy: str = 'greedy', seed: Optional[int] = None,
+                 catalog: Optional[CardCatalog] = None):
+        """Create an agent; time_limit is in seconds per decision."""
+        if time_limit is None and iterations is None:
+            raise ValueError("MCTSAgent needs a time limit or an iteration budget")
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.exploration = exploration
+        self.rollout_policy = get_policy(rollout_policy)
+        self.rng = GameRandom(new_seed() if seed is None else seed)
+        self.catalog = catalog
+        self._engine: Optional[CompactEngine] = None
+        self._root: Optional[Node] = None
+        self._player = -1
+        self.last_iterations = 0  # Iterations of the last search
+        self.last_reused = False  # Whether the last search started from a kept subtree
+
+    def __call__(self, engine, actions: List[Action], rng: GameRandom) -> Action:
+        """Policy interface: search the engine's position (rng is not used)."""
+        return self.choose(engine)
+
+    def choose(self, game) -> Action:
+        """Search the position of the acting player and return the most visited legal action."""
+        start = time.perf_counter()
+        state, catalog, player = compact_view(game)
+        actions = game.legal_actions()
+        if len(actions) == 1:
+            return actions[0]
+        if self._engine is None or self._engine.catalog is not (self.catalog or catalog):
+            self._engine = CompactEngine(self.catalog or catalog)
+            self._root = None
+        root = self._reuse(state.observation(player), player)
+        self.last_reused = root is not None
+        if root is None:
+            root = Node(state.observation(player))
+        self._root, self._player = root, player
+
+        deadline = None if self.time_limit is None else start + self.time_limit
+        done = 0
+        while (self.iterations is None or done < self.iterations) and (deadline is None or time.perf_counter() < deadline):
+            self._iterate(root, state, player)
+            done += 1
+        self.last_iterations = done
+
+        legal = set(actions)
+        visited = [(edge.visits, edge.value, action) for action, edge in root.edges.items() if action in legal]
+        if not visited:
+            return actions[0]
+        return max(visited, key=lambda item: (item[0], item[1]))[2]
+
+    def _reuse(self, observation: bytes, player: int) -> Optional[Node]:
+        """Find the node of the previous tree matching the new position, if any."""
+        if self._root is None or player != self._player:
+            return None
+        queue = deque([(self._root, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if node.observation == observation:
+                return node
+            if depth < REUSE_DEPTH:
+                queue.extend((child, depth + 1) for edge in node.edges.values() for child in edge.outcomes.values())
+        return None
+
+    def _iterate(self, root: Node, state: CompactState, player: int) -> None:
+        """Run one iteration: determinize, select and expand, roll out and back up."""
+        rng = GameRandom(self.rng.getrandbits(64))
+        engine = self._engine
+        engine.rng = rng
+        engine.load_state(determinize(state, player, rng, engine.tables.basic), rehash=False)  # The search never reads the hash
+        c = self.exploration
+        node = root
+        path = []  # (edge, player who took the action)
+        while not engine.is_terminal():
+            actions = engine.legal_actions()
+            if not actions:
+                break  # Not reachable in a real game; play_out scores it as a draw
+            edges = node.edges
+            untried = []
+            for action in actions:
+                edge = edges.get(action)
+                if edge is None:
+                    untried.append(action)
+                else:
+                    edge.available += 1
+            if untried:
+                action = untried[int(rng.random() * len(untried))]
+                edge = edges[action] = Edge()
+                edge.available = 1
+            else:
+                best = -1.0
+                for candidate in actions:
+                    candidate_edge = edges[candidate]
+                    score = (candidate_edge.value / candidate_edge.visits
+                             + c * math.sqrt(math.log(candidate_edge.available) / candidate_edge.visits))
+                    if score > best:
+                        best, action, edge = score, candidate, candidate_edge
+            path.append((edge, engine.acting_player))
+            engine.apply(action, validate=False)
+            observation = engine.state.observation(player)
+            child = edge.outcomes.get(observation)
+            if child is None:
+                edge.outcomes[observation] = Node(observation)
+                break  # Expanded: evaluate the new node with a rollout
+            node = child
+        policy = self.rollout_policy
+        play_out(engine, (policy, policy), rng)
+        winner = engine.winner
+        for edge, actor in path:
+            edge.visits += 1
+            edge.value += 0.5 if winner is None else float(winner == actor)
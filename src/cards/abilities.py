@@ -1,14 +1,173 @@
-"""Module for handling Pokemon abilities."""
-from typing import Optional
+"""Module for handling Pokemon abilities.
+
+Abilities are compiled like attack effects (see effects.py): the text is
+matched against a table of patterns once, when the catalog is compiled, and
+every distinct ability shares one Ability object with a parameterized handler.
+Entries whose ability is "No ability" / "N/A" compile to None.
+"""
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Pattern, Tuple, TYPE_CHECKING
+
 from ..models.cards import Ability
+from ..game.events import EffectFailed, EnergyAttached, Healed
+from .effects import PRIMITIVES, STATUS_WORDS
+
+if TYPE_CHECKING:
+    from ..game.player import Player
+    from ..models.cards import PokemonCard
+
+NO_ABILITY_NAMES = frozenset({'No ability', 'N/A', ''})
+NO_ABILITY_EFFECTS = frozenset({'N/A', ''})
+
+# Abilities the player chooses to use; everything else is passive
+_ACTIVATABLE = re.compile(r"(Once during your turn|As often as you like during your turn)")
+
+AbilitySpec = Optional[Tuple[str, tuple]]
+
+
+class AbilityPattern(NamedTuple):
+    """Maps ability text to a handler and the parameters read from it."""
+    regex: Pattern
+    key: str
+    params: Callable[['re.Match'], tuple]
+
+
+# Handlers are called as fn(player, opponent, pokemon, *params)
+HANDLERS: Dict[str, Callable] = {}
+PATTERNS: List[AbilityPattern] = []
+
+
+def handler(key: str):
+    """Register an ability handler under key."""
+    def register(fn):
+        HANDLERS[key] = fn
+        return fn
+    return register
+
+
+def pattern(regex: str, key: str, params: Callable[['re.Match'], tuple] = lambda m: ()):
+    """Register an ability text pattern."""
+    PATTERNS.append(AbilityPattern(re.compile(regex + r'$'), key, params))
+
+
+@handler('heal_all')
+def heal_all(player, opponent, pokemon, amount):
+    events = player.events
+    for poke in [player.active] + player.bench:
+        if poke:
+            healed = min(amount, poke.max_hp - poke.hp)
+            poke.hp += healed
+            if healed and events.enabled:
+                events.emit(Healed(player.name, poke.name, healed))
+
+
+@handler('snipe_one')
+def snipe_one(player, opponent, pokemon, amount):
+    PRIMITIVES['snipe_one'].fn(player, opponent, amount, False)
+
+
+@handler('active_status')
+def active_status(player, opponent, pokemon, status):
+    if pokemon is player.active:
+        PRIMITIVES['apply_status'].fn(player, opponent, status)
+    elif player.events.enabled:
+        player.events.emit(EffectFailed(player.name, f"{pokemon.name} must be in the Active Spot to use this ability."))
+
+
+@handler('coin_status')
+def coin_status(player, opponent, pokemon, status):
+    PRIMITIVES['coin_status'].fn(player, opponent, status)
+
+
+@handler('energy_to_self')
+def energy_to_self(player, opponent, pokemon):
+    t = pokemon.pokemon_type
+    pokemon.attached_energy[t] = pokemon.attached_energy.get(t, 0) + 1
+    if player.events.enabled:
+        player.events.emit(EnergyAttached(player.name, pokemon.name, t.name))
+
+
+@handler('energy_to_active')
+def energy_to_active(player, opponent, pokemon):
+    if player.active:
+        energy_to_self(player, opponent, player.active)
+
+
+@handler('draw')
+def draw(player, opponent, pokemon, count):
+    PRIMITIVES['draw'].fn(player, opponent, count)
+
+
+@handler('announce')
+def announce(player, opponent, pokemon):
+    # Not simulated yet; compile_ability makes these abilities passive
+    pass
+
+
+pattern(r"Once during your turn, you may heal (\d+) damage from each of your Pokémon\.", 'heal_all',
+        lambda m: (int(m[1]),))
+pattern(r"Once during your turn, you may do (\d+) damage to 1 of your opponent's Pokémon\.", 'snipe_one',
+        lambda m: (int(m[1]),))
+pattern(r"Once during your turn, if this Pokémon is in the Active Spot, you may make your opponent's Active Pokémon "
+        r"(Poisoned|Burned|Asleep|Paralyzed|Confused)\.", 'active_status', lambda m: (STATUS_WORDS[m[1]].name,))
+pattern(r"Once during your turn, you may flip a coin\. If heads, your opponent's Active Pokémon is now "
+        r"(Poisoned|Burned|Asleep|Paralyzed|Confused)\.", 'coin_status', lambda m: (STATUS_WORDS[m[1]].name,))
+pattern(r"Once during your turn, you may take a +Energy from your Energy Zone and attach it to this Pokémon\.",
+        'energy_to_self')
+pattern(r"Once during your turn, you may take 1 +Energy from your Energy Zone and attach it to the +Pokémon in the Active Spot\.",
+        'energy_to_active')
+
+
+class AbilityEffect:
+    """Shared handler of an ability: effect(player, opponent=None, pokemon=None)."""
+
+    def __init__(self, key: str, params: tuple, text: str):
+        """Resolve the handler of an ability spec."""
+        self.key = key
+        self.params = params
+        self.__doc__ = text
+        self._fn = HANDLERS[key]
+
+    def __call__(self, player: 'Player', opponent: Optional['Player'] = None,
+                 pokemon: Optional['PokemonCard'] = None) -> None:
+        self._fn(player, opponent, pokemon, *self.params)
+
+    def __repr__(self) -> str:
+        return f"AbilityEffect({self.key!r}, {self.params!r})"
+
+
+def compile_ability(name: str, effect_text: str) -> Optional[tuple]:
+    """Compile an ability to a plain (name, text, activatable, spec) record, or None if there is none.
+
+    Abilities whose text matches no pattern compile to 'announce' and are
+    never activatable: using one would do nothing, so it is left out of the
+    legal actions of both engines.
+    """
+    if not name or not effect_text or name in NO_ABILITY_NAMES or effect_text.strip() in NO_ABILITY_EFFECTS:
+        return None
+    effect_text = effect_text.strip()
+    for entry in PATTERNS:
+        m = entry.regex.match(effect_text)
+        if m:
+            return (name, effect_text, bool(_ACTIVATABLE.search(effect_text)), (entry.key, entry.params(m)))
+    return (name, effect_text, False, ('announce', ()))
+
+
+_abilities: Dict[tuple, Ability] = {}
+
+
+def build_ability(record: Optional[tuple]) -> Optional[Ability]:
+    """Get the shared Ability of a compiled record (one instance per distinct ability)."""
+    if record is None:
+        return None
+    ability = _abilities.get(record)
+    if ability is None:
+        name, effect_text, activatable, (key, params) = record
+        ability = _abilities[record] = Ability(name=name, effect=AbilityEffect(key, params, effect_text),
+                                               activatable=activatable)
+    return ability
+
 
 def create_ability(name: str, effect_text: str) -> Optional[Ability]:
     """Create an Ability object based on name and effect text."""
-    if not name or not effect_text:
-        return None
-        
-    # Default effect that just prints the ability description
-    def default_effect(player):
-        print(f"Activated {name}: {effect_text}")
-    
-    return Ability(name=name, effect=default_effect)
+    return build_ability(compile_ability(name, effect_text))
@@ -0,0 +1,203 @@
+"""
+Card loading benchmark and memory report.
+
+Times the catalog load cold (no compiled catalog, empty effect caches) and
+warm (compiled catalog present), breaks the cold load down into its stages,
+counts the objects the catalog holds and measures memory with tracemalloc.
+Results are printed and can be written as JSON to compare releases:
+
+    python -m src.cards.benchmark [--cards path/to/cards.json] [--scale N] [--output report.json]
+
+--scale N benchmarks a synthetic cards.json holding N copies of every entry
+(each copy in its own set), to see how loading grows with new sets.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from . import abilities, effects
+from .abilities import create_ability
+from .card_loader import compile_card_records, iter_card_entries, load_cards_from_json, parse_attack, read_text_chunks
+from .catalog import DEFAULT_CARDS_PATH, CardCatalog
+from .catalog_cache import cache_path_for
+
+REPORT_VERSION = 1
+
+
+def reset_caches() -> None:
+    """Forget every compiled effect and ability so the next load starts cold."""
+    effects.compile_effect.cache_clear()
+    effects._effects.clear()
+    abilities._abilities.clear()
+
+
+def _timed(fn: Callable, repeat: int) -> Tuple[float, object]:
+    """Best wall time of fn over repeat runs (caches reset before each run) and its last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        reset_caches()
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def write_scaled_cards(json_path: str, scale: int, out_path: str) -> int:
+    """Write scale copies of every cards.json entry to out_path, each copy in its own set."""
+    with open(json_path, encoding='utf-8') as f:
+        entries = json.load(f)
+    scaled = []
+    for copy in range(scale):
+        for entry in entries:
+            entry = dict(entry)
+            if copy:
+                entry['set_details'] = f"Synthetic {copy} (S{copy}-{entry.get('set_details', '')})"
+            scaled.append(entry)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(scaled, f, ensure_ascii=False)
+    return len(scaled)
+
+
+def measure_stages(json_path: str, repeat: int) -> Dict[str, float]:
+    """Time each stage of a cold load separately, in seconds."""
+    entries = list(iter_card_entries(read_text_chunks(json_path)))
+    attack_entries = [attack for entry in entries for attack in entry.get('attacks', [])]
+    ability_entries = [entry['ability'] for entry in entries if isinstance(entry.get('ability'), dict)]
+    stages = {}
+    stages['json_parse'], _ = _timed(lambda: list(iter_card_entries(read_text_chunks(json_path))), repeat)
+    stages['parse_attack'], _ = _timed(lambda: [parse_attack(attack) for attack in attack_entries], repeat)
+    stages['create_ability'], _ = _timed(
+        lambda: [create_ability(ability.get('name', ''), ability.get('effect', '')) for ability in ability_entries],
+        repeat)
+    stages['compile_records'], _ = _timed(lambda: compile_card_records(entries), repeat)
+    return stages
+
+
+def count_objects(catalog: CardCatalog) -> Dict[str, int]:
+    """Count the cards of a catalog and the distinct objects they share."""
+    pokemon = catalog.pokemon
+    attacks = [attack for card in pokemon for attack in card.attacks]
+    ability_list = [card.ability for card in pokemon if card.ability]
+    return {
+        'cards': len(catalog),
+        'pokemon': len(pokemon),
+        'attacks': len(attacks),
+        'distinct_attack_effects': len({id(attack.effect) for attack in attacks if attack.effect}),
+        'abilities': len(ability_list),
+        'distinct_abilities': len({id(ability) for ability in ability_list}),
+        'species': len(catalog.evolution),
+    }
+
+
+def measure_memory(json_path: str) -> Dict[str, int]:
+    """Peak and retained tracemalloc memory of a warm load, in bytes."""
+    reset_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        catalog = CardCatalog.from_json(json_path)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del catalog
+    return {'peak_bytes': peak, 'retained_bytes': retained}
+
+
+def run_benchmark(json_path: str = DEFAULT_CARDS_PATH, scale: int = 1, repeat: int = 5) -> dict:
+    """Run the whole benchmark on a private copy of cards.json and return the report."""
+    workdir = tempfile.mkdtemp(prefix='card-bench-')
+    try:
+        bench_path = os.path.join(workdir, 'cards.json')
+        if scale > 1:
+            entries = write_scaled_cards(json_path, scale, bench_path)
+        else:
+            shutil.copyfile(json_path, bench_path)
+            with open(bench_path, encoding='utf-8') as f:
+                entries = len(json.load(f))
+        cache_path = cache_path_for(bench_path)
+
+        def cold_load() -> List:
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            return load_cards_from_json(bench_path)
+
+        cold, _ = _timed(cold_load, repeat)
+        load_cards_from_json(bench_path)  # Make sure the compiled catalog exists
+        warm, _ = _timed(lambda: load_cards_from_json(bench_path), repeat)
+        uncached, _ = _timed(lambda: load_cards_from_json(bench_path, use_cache=False), repeat)
+
+        reset_caches()
+        catalog = CardCatalog.from_json(bench_path)
+        return {
+            'version': REPORT_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': scale,
+            'json_entries': entries,
+            'json_bytes': os.path.getsize(bench_path),
+            'catalog_bytes': os.path.getsize(cache_path),
+            'timings': {
+                'cold_load': cold,
+                'warm_load': warm,
+                'uncached_load': uncached,
+            },
+            'stages': measure_stages(bench_path, repeat),
+            'objects': count_objects(catalog),
+            'memory': measure_memory(bench_path),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_report(report: dict) -> None:
+    """Print a benchmark report in a readable form."""
+    print(f"Card loading benchmark (Python {report['python']}, scale x{report['scale']})")
+    print(f"  cards.json: {report['json_entries']} entries, {report['json_bytes'] / 1024:.1f} KiB"
+          f" | compiled catalog: {report['catalog_bytes'] / 1024:.1f} KiB")
+    print("Load times:")
+    for name, seconds in report['timings'].items():
+        print(f"  {name:<16} {seconds * 1000:9.2f} ms")
+    print("Cold load stages:")
+    for name, seconds in report['stages'].items():
+        print(f"  {name:<16} {seconds * 1000:9.2f} ms")
+    print("Objects:")
+    for name, count in report['objects'].items():
+        print(f"  {name:<24} {count:6d}")
+    memory = report['memory']
+    print(f"Memory: peak {memory['peak_bytes'] / 1024:.1f} KiB, retained {memory['retained_bytes'] / 1024:.1f} KiB")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark loading the card catalog.")
+    parser.add_argument('--cards', default=DEFAULT_CARDS_PATH, help="cards.json to benchmark")
+    parser.add_argument('--scale', type=int, default=1, help="copies of every entry in a synthetic cards.json")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per timing (the best is kept)")
+    parser.add_argument('--output', help="write the report as JSON to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.cards, max(1, args.scale), max(1, args.repeat))
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,17 @@
 import json
-from typing import List
-from ..models.cards import PokemonCard, Attack, SupporterCard, ItemCard, ToolCard, Card
+import re
+from typing import Collection, Dict, Iterable, Iterator, List, Optional
+from ..models.cards import PokemonDefinition, Attack
 from ..models.enums import PokemonType
+from .abilities import build_ability, compile_ability
+from .effects import build_effect, compile_effect
+
+# Fields of a cards.json entry needed to play; everything else is display metadata
+GAMEPLAY_FIELDS = ('id', 'name', 'hp', 'card_type', 'evolution_type', 'attacks', 'ability',
+                   'weakness', 'retreat', 'ex', 'set_details', 'type', 'evolves_from')
+DISPLAY_FIELDS = ('image', 'alternate_versions', 'probability', 'artist', 'pack', 'rarity',
+                  'crafting_cost', 'fullart')
+STREAM_CHUNK_SIZE = 64 * 1024
 
 # Map string to PokemonType
 POKEMON_TYPE_MAP = {
@@ -9,6 +19,7 @@ POKEMON_TYPE_MAP = {
     'Fire': PokemonType.FIRE,
     'Water': PokemonType.WATER,
     'Electric': PokemonType.ELECTRIC,
+    'Lightning': PokemonType.ELECTRIC,
     'Fighting': PokemonType.FIGHTING,
     'Psychic': PokemonType.PSYCHIC,
     'Darkness': PokemonType.DARKNESS,
@@ -17,139 +28,62 @@ POKEMON_TYPE_MAP = {
     'Colorless': PokemonType.NORMAL,
 }
 
-def parse_attack(attack_json) -> Attack:
+def compile_attack(attack_json) -> tuple:
+    """Reduce an attack entry to a plain record, resolving its effect text to a spec."""
     name = attack_json.get('name', 'Unknown')
     damage = attack_json.get('damage', '0')
     try:
         damage_val = int(''.join(filter(str.isdigit, damage)))
     except Exception:
         damage_val = 0
-    cost = attack_json.get('cost', [])
-    energy_cost = len(cost)
-    cost_types = cost  # e.g. ["Grass", "Colorless"]
+    cost = tuple(attack_json.get('cost', []))  # e.g. ("Grass", "Colorless")
     effect_text = attack_json.get('effect', '').strip()
-    effect_fn = None
-    # Venusaur - Mega Drain: Heal 30 damage from this Pokémon.
-    if name == "Mega Drain" and effect_text.startswith("Heal 30 damage"):
-        def mega_drain_effect(self_player, opp_player):
-            poke = self_player.active
-            if poke:
-                healed = min(30, poke.max_hp - poke.hp)
-                poke.hp += healed
-                print(f"{poke.name} healed {healed} HP with Mega Drain!")
-        effect_fn = mega_drain_effect
-    # Venusaur ex - Giant Bloom: Heal 30 damage from this Pokémon.
-    elif name == "Giant Bloom" and effect_text.startswith("Heal 30 damage"):
-        def giant_bloom_effect(self_player, opp_player):
-            poke = self_player.active
-            if poke:
-                healed = min(30, poke.max_hp - poke.hp)
-                poke.hp += healed
-                print(f"{poke.name} healed {healed} HP with Giant Bloom!")
-        effect_fn = giant_bloom_effect
-    # Caterpie - Find a: Put 1 random [G] Pokémon from your deck into your hand.
-    elif name == "Find a" and "random [G] Pokémon" in effect_text:
-        import random
-        def find_a_effect(self_player, opp_player):
-            grass_pokemon = [card for card in self_player.deck if hasattr(card, 'pokemon_type') and getattr(card, 'pokemon_type', None) and getattr(card, 'pokemon_type').name == 'GRASS']
-            if grass_pokemon:
-                chosen = random.choice(grass_pokemon)
-                self_player.deck.remove(chosen)
-                self_player.hand.append(chosen)
-                print(f"Caterpie's Find a: Put {chosen.name} into your hand from your deck.")
-            else:
-                print("Caterpie's Find a: No [G] Pokémon found in deck.")
-        effect_fn = find_a_effect
-    # Vileplume - Soothing Scent: Your opponent's Active Pokémon is now Asleep.
-    elif name == "Soothing Scent" and "Asleep" in effect_text:
-        from ..models.enums import StatusCondition
-        def soothing_scent_effect(self_player, opp_player):
-            if opp_player.active:
-                opp_player.active.status = StatusCondition.SLEEP
-                print(f"Vileplume's Soothing Scent: {opp_player.active.name} is now Asleep!")
-        effect_fn = soothing_scent_effect
-    # Venomoth - Poison Powder: Your opponent's Active Pokémon is now Poisoned.
-    elif name == "Poison Powder" and "Poisoned" in effect_text:
-        from ..models.enums import StatusCondition
-        def poison_powder_effect(self_player, opp_player):
-            if opp_player.active:
-                opp_player.active.status = StatusCondition.POISON
-                print(f"Venomoth's Poison Powder: {opp_player.active.name} is now Poisoned!")
-        effect_fn = poison_powder_effect
-    # Exeggutor - Stomp: Flip a coin. If heads, this attack does 30 more damage.
-    elif name == "Stomp" and "30 more damage" in effect_text:
-        import random
-        def stomp_effect(self_player, opp_player):
-            if random.choice([True, False]):
-                print("Exeggutor's Stomp: Coin flip heads! +30 damage!")
-                if self_player.active:
-                    self_player.active._bonus_damage = 30
-            else:
-                print("Exeggutor's Stomp: Coin flip tails. No bonus damage.")
-                if self_player.active:
-                    self_player.active._bonus_damage = 0
-        effect_fn = stomp_effect
-    # Exeggutor ex - Tropical Swing: Flip a coin. If heads, this attack does 40 more damage.
-    elif name == "Tropical Swing" and "40 more damage" in effect_text:
-        import random
-        def tropical_swing_effect(self_player, opp_player):
-            if random.choice([True, False]):
-                print("Exeggutor ex's Tropical Swing: Coin flip heads! +40 damage!")
-                if self_player.active:
-                    self_player.active._bonus_damage = 40
-            else:
-                print("Exeggutor ex's Tropical Swing: Coin flip tails. No bonus damage.")
-                if self_player.active:
-                    self_player.active._bonus_damage = 0
-        effect_fn = tropical_swing_effect
-    # Tangela - Absorb: Heal 10 damage from this Pokémon.
-    elif name == "Absorb" and effect_text.startswith("Heal 10 damage"):
-        def absorb_effect(self_player, opp_player):
-            poke = self_player.active
-            if poke:
-                healed = min(10, poke.max_hp - poke.hp)
-                poke.hp += healed
-                print(f"{poke.name} healed {healed} HP with Absorb!")
-        effect_fn = absorb_effect
-    # Pinsir - Double Horn: Flip 2 coins. This attack does 50 damage for each heads.
-    elif name == "Double Horn" and "50 damage for each heads" in effect_text:
-        import random
-        def double_horn_effect(self_player, opp_player):
-            heads = sum(random.choice([True, False]) for _ in range(2))
-            bonus = 50 * heads
-            print(f"Pinsir's Double Horn: {heads} heads, +{bonus} damage!")
-            if self_player.active:
-                self_player.active._bonus_damage = bonus
-        effect_fn = double_horn_effect
-    # Petilil - Blot: Heal 10 damage from this Pokémon.
-    elif name == "Blot" and effect_text.startswith("Heal 10 damage"):
-        def blot_effect(self_player, opp_player):
-            poke = self_player.active
-            if poke:
-                healed = min(10, poke.max_hp - poke.hp)
-                poke.hp += healed
-                print(f"{poke.name} healed {healed} HP with Blot!")
-        effect_fn = blot_effect
-    # Lilligant - Leaf Supply: Take a [G] Energy from your Energy Zone and attach it to 1 of your Benched [G] Pokémon.
-    elif name == "Leaf Supply" and "attach it to 1 of your Benched [G] Pokémon" in effect_text:
-        def leaf_supply_effect(self_player, opp_player):
-            # Only works if player has at least 1 energy in their pool and a benched Grass Pokémon
-            if self_player.energy > 0:
-                grass_bench = [poke for poke in self_player.bench if getattr(poke, 'pokemon_type', None) and poke.pokemon_type.name == 'GRASS']
-                if grass_bench:
-                    # Attach to the first benched Grass Pokémon
-                    poke = grass_bench[0]
-                    if not hasattr(poke, 'attached_energy'):
-                        poke.attached_energy = {}
-                    poke.attached_energy[PokemonType.GRASS] = poke.attached_energy.get(PokemonType.GRASS, 0) + 1
-                    self_player.energy -= 1
-                    print(f"Lilligant's Leaf Supply: Attached 1 [G] energy to {poke.name} on the bench.")
-                else:
-                    print("Lilligant's Leaf Supply: No benched [G] Pokémon to attach energy to.")
-            else:
-                print("Lilligant's Leaf Supply: No [G] energy in your Energy Zone.")
-        effect_fn = leaf_supply_effect
-    return Attack(name=name, damage=damage_val, energy_cost=energy_cost, cost_types=cost_types, effect=effect_fn)
+    return (name, damage_val, cost, effect_text, compile_effect(effect_text, cost))
+
+def build_attack(record: tuple) -> Attack:
+    """Build an Attack from a record produced by compile_attack."""
+    name, damage_val, cost, effect_text, effect_spec = record
+    return Attack(name=name, damage=damage_val, energy_cost=len(cost), cost_types=list(cost),
+                  effect=build_effect(effect_spec, effect_text))
+
+def parse_attack(attack_json) -> Attack:
+    """Build an Attack straight from its cards.json entry."""
+    return build_attack(compile_attack(attack_json))
+
+def parse_set_code(set_details: str) -> str:
+    """Extract the set code, e.g. 'Genetic Apex  (A1)' -> 'A1' and 'Promo-A' -> 'P-A'."""
+    match = re.search(r'\(([^)]+)\)', set_details)
+    if match:
+        return match.group(1)
+    if set_details.startswith('Promo-'):
+        return 'P-' + set_details[len('Promo-'):]
+    return set_details.strip() or 'UNKNOWN'
+
+def parse_evolves_from(card_type: str) -> Optional[str]:
+    """Extract the pre-evolution name from e.g. 'Pokémon - Stage 1 - Evolves from Eevee'."""
+    marker = 'Evolves from '
+    idx = card_type.find(marker)
+    if idx == -1:
+        return None
+    return card_type[idx + len(marker):].strip() or None
+
+def infer_pokemon_type(entry) -> str:
+    """cards.json has no type field, so use the dominant non-Colorless attack energy."""
+    if entry.get('type'):
+        return entry['type']
+    counts = {}
+    for attack_json in entry.get('attacks', []):
+        for cost in attack_json.get('cost', []):
+            if cost != 'Colorless':
+                counts[cost] = counts.get(cost, 0) + 1
+    if not counts:
+        return 'Colorless'
+    return max(counts, key=counts.get)
+
+def qualified_card_id(entry) -> str:
+    """Ids restart in every set, so qualify them with the set code to make them unique."""
+    raw_id = entry.get('id', 'UNKNOWN_ID')  # Using 'id' instead of 'card_id'
+    return f"{parse_set_code(entry.get('set_details', ''))}-{raw_id.zfill(3)}"
 
 def safe_int(val, default=0):
     try:
@@ -157,50 +91,146 @@ def safe_int(val, default=0):
     except Exception:
         return default
 
-def load_cards_from_json(json_path: str) -> List[Card]:
-    with open(json_path, encoding='utf-8') as f:
-        data = json.load(f)
-    cards: List[Card] = []
-    for entry in data:
-        card_type = entry.get('card_type', '')
-        name = entry.get('name', 'Unknown')
-        card_id = entry.get('id', 'UNKNOWN_ID')  # Using 'id' instead of 'card_id'
-        hp = safe_int(entry.get('hp', '0'), 0)
-        ex = entry.get('ex', 'No') == 'Yes'
-        # Only handle Pokemon for now
-        if 'Pokémon' in card_type:
-            type_str = entry.get('type', 'Colorless')
-            pokemon_type = POKEMON_TYPE_MAP.get(type_str, PokemonType.NORMAL)
-            card = PokemonCard(name=name, card_id=card_id, hp=hp, pokemon_type=pokemon_type, is_ex=ex)
-            
-            # Set evolution data
-            evolves_from = entry.get('evolves_from', None)
-            if evolves_from:
-                card.can_evolve_from = evolves_from
-            
-            # Set weakness
-            weakness_str = entry.get('weakness', None)
-            if weakness_str:
-                card.weakness = POKEMON_TYPE_MAP.get(weakness_str, None)
-                
-            # Set retreat cost
-            card.retreat_cost = safe_int(entry.get('retreat_cost', '1'), 1)
-            
-            # Set ability information
-            ability_data = entry.get('ability', None)
-            if ability_data:
-                from .abilities import create_ability
-                ability = create_ability(ability_data.get('name', ''), ability_data.get('effect', ''))
-                if ability:
-                    card.ability = ability
-            
-            # Parse attacks
-            attacks_json = entry.get('attacks', [])
-            for attack in attacks_json:
-                attack_obj = parse_attack(attack)
-                if attack_obj:
-                    card.attacks.append(attack_obj)
-                    
-            cards.append(card)
+def compile_card_entry(entry) -> Optional[tuple]:
+    """Reduce a cards.json entry to the plain gameplay record used to build cards.
+
+    Records only hold builtin types so they can be stored in the compiled
+    catalog (see catalog_cache.py). Returns None for entries that are not parsed yet.
+    """
+    card_type = entry.get('card_type', '')
+    # Only handle Pokemon for now
+    if 'Pokémon' not in card_type:
         # TODO: Add Supporter, Item, Tool parsing
-    return cards
+        return None
+    ability = None
+    ability_data = entry.get('ability', None)
+    if ability_data:
+        ability = compile_ability(ability_data.get('name', ''), ability_data.get('effect', ''))
+    attacks = tuple(compile_attack(attack_json) for attack_json in entry.get('attacks', []))
+    card_id = qualified_card_id(entry)
+    return (
+        entry.get('name', 'Unknown'),
+        card_id,
+        safe_int(entry.get('hp', '0'), 0),
+        infer_pokemon_type(entry),
+        entry.get('ex', 'No') == 'Yes',
+        entry.get('evolves_from', None) or parse_evolves_from(card_type),
+        entry.get('evolution_type', 'Basic'),
+        entry.get('weakness', None),
+        safe_int(entry.get('retreat', entry.get('retreat_cost', '1')), 1),
+        ability,
+        attacks,
+    )
+
+def compile_card_records(data) -> List[tuple]:
+    """Compile the decoded cards.json list into gameplay records."""
+    records = []
+    for entry in data:
+        record = compile_card_entry(entry)
+        if record is not None:
+            records.append(record)
+    return records
+
+def build_card(record: tuple) -> PokemonDefinition:
+    """Build a card definition from a record produced by compile_card_entry."""
+    name, card_id, hp, type_str, ex, evolves_from, stage, weakness_str, retreat_cost, ability, attacks = record
+    return PokemonDefinition(
+        name=name,
+        card_id=card_id,
+        hp=hp,
+        pokemon_type=POKEMON_TYPE_MAP.get(type_str, PokemonType.NORMAL),
+        is_ex=ex,
+        weakness=POKEMON_TYPE_MAP.get(weakness_str, None) if weakness_str else None,
+        attacks=tuple(build_attack(attack) for attack in attacks),
+        ability=build_ability(ability),
+        can_evolve_from=evolves_from or None,
+        retreat_cost=retreat_cost,
+        stage=stage,
+    )
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[object]:
+    """Decode the elements of a top-level JSON array one at a time.
+
+    chunks is any iterable of text pieces (e.g. blocks read from a file), so
+    only one decoded element and one block of text are alive at a time.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    started = False
+    chunks = iter(chunks)
+    exhausted = False
+    while True:
+        # Skip whitespace and separators up to the next element
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        if not started and pos < len(buf):
+            if buf[pos] != '[':
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        if started and pos < len(buf) and buf[pos] == ']':
+            return
+        if pos < len(buf):
+            try:
+                element, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Most likely the element is cut off at the end of the buffer
+                if exhausted:
+                    raise
+            else:
+                yield element
+                pos = end
+                continue
+        if exhausted:
+            raise ValueError("Unexpected end of JSON array")
+        # Need more text: drop what was consumed and read the next chunk
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+        else:
+            buf = buf[pos:] + chunk
+            pos = 0
+
+def read_text_chunks(json_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Read a UTF-8 file as a sequence of text blocks."""
+    with open(json_path, encoding='utf-8') as f:
+        for block in iter(lambda: f.read(chunk_size), ''):
+            yield block
+
+def iter_card_entries(chunks: Iterable[str], fields: Collection[str] = GAMEPLAY_FIELDS) -> Iterator[dict]:
+    """Stream cards.json entries, keeping only the requested fields of each."""
+    for entry in iter_json_array(chunks):
+        yield {key: entry[key] for key in fields if key in entry}
+
+def read_card_records(json_path: str) -> List[tuple]:
+    """Parse cards.json directly into gameplay records, bypassing the compiled cache."""
+    return compile_card_records(iter_card_entries(read_text_chunks(json_path)))
+
+def load_card_metadata(json_path: str) -> Dict[str, dict]:
+    """Load the display-only fields of every card, keyed by card id.
+
+    These are never needed to play, so the catalog only calls this the first
+    time something asks for an image, rarity, artist, ...
+    """
+    metadata = {}
+    for entry in iter_card_entries(read_text_chunks(json_path), DISPLAY_FIELDS + ('id', 'set_details')):
+        card_id = qualified_card_id(entry)
+        entry.pop('id', None)
+        entry.pop('set_details', None)
+        metadata[card_id] = entry
+    return metadata
+
+def load_cards_from_json(json_path: str, use_cache: bool = True) -> List[PokemonDefinition]:
+    """Load the definitions of all playable cards from cards.json.
+
+    With use_cache the records come from the compiled catalog next to the JSON
+    file, which is rebuilt automatically whenever cards.json changes.
+    """
+    if use_cache:
+        from .catalog_cache import load_card_records
+        records = load_card_records(json_path)
+    else:
+        records = read_card_records(json_path)
+    return [build_card(record) for record in records]
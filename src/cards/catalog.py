@@ -0,0 +1,205 @@
+"""
+Process-wide card catalog with prebuilt lookup indexes.
+"""
+import hashlib
+import os
+from dataclasses import replace
+import threading
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from ..models.cards import PokemonDefinition
+from ..models.enums import PokemonType
+from .card_loader import load_card_metadata, load_cards_from_json
+from .evolution import EvolutionGraph
+
+if TYPE_CHECKING:
+    from .deck_generator import DeckGenerator
+
+DEFAULT_CARDS_PATH = os.path.join(os.path.dirname(__file__), 'cards.json')
+
+
+def _freeze(index: Dict[object, List[PokemonDefinition]]) -> MappingProxyType:
+    return MappingProxyType({key: tuple(cards) for key, cards in index.items()})
+
+
+class CardCatalog:
+    """Immutable collection of every parsed card definition, indexed for O(1) lookups.
+
+    Definitions are stored in load order; a definition's position is its catalog
+    index, which is stable for a given cards.json. Stage and evolution
+    questions are answered by the catalog's EvolutionGraph; Pokemon without
+    stage data are stored with the stage it gives them. Games never hold these
+    directly, they create in-play cards with PokemonDefinition.create_card().
+    """
+
+    __slots__ = ('_cards', '_pokemon', '_index_of', '_by_id', '_by_name', '_by_type',
+                 '_by_stage', '_by_ex', '_by_evolves_from', '_evolution', '_deck_generator',
+                 '_json_path', '_metadata', '_fingerprint')
+
+    def __init__(self, cards: Sequence[PokemonDefinition], json_path: Optional[str] = None):
+        """Build the catalog and all of its indexes.
+
+        json_path is where display metadata (images, rarity, ...) is read from
+        on demand; catalogs built without one have no metadata.
+        """
+        self._evolution = evolution = EvolutionGraph(cards)
+        # Pokemon without stage data get the stage of their depth in the graph
+        self._cards: Tuple[PokemonDefinition, ...] = tuple(
+            replace(card, stage=evolution.stage_of(card.name))
+            if isinstance(card, PokemonDefinition) and not card.stage else card
+            for card in cards)
+        self._json_path = json_path
+        self._metadata: Optional[Dict[str, dict]] = None
+        self._deck_generator = None
+        self._fingerprint: Optional[bytes] = None
+        by_name: Dict[object, List[PokemonDefinition]] = {}
+        by_type: Dict[object, List[PokemonDefinition]] = {}
+        by_stage: Dict[object, List[PokemonDefinition]] = {}
+        by_ex: Dict[object, List[PokemonDefinition]] = {True: [], False: []}
+        by_evolves_from: Dict[object, List[PokemonDefinition]] = {}
+        by_id: Dict[str, PokemonDefinition] = {}
+        index_of: Dict[int, int] = {}
+        for idx, card in enumerate(self._cards):
+            index_of[id(card)] = idx
+            by_name.setdefault(card.name, []).append(card)
+            if not isinstance(card, PokemonDefinition):
+                continue
+            if card.card_id in by_id:
+                raise ValueError(f"Duplicate card id in catalog: {card.card_id}")
+            by_id[card.card_id] = card
+            by_type.setdefault(card.pokemon_type, []).append(card)
+            by_stage.setdefault(self._evolution.stage_of(card.name), []).append(card)
+            by_ex[card.is_ex].append(card)
+            if card.can_evolve_from:
+                by_evolves_from.setdefault(card.can_evolve_from, []).append(card)
+        self._pokemon: Tuple[PokemonDefinition, ...] = tuple(by_id.values())
+        self._index_of = MappingProxyType(index_of)
+        self._by_id = MappingProxyType(by_id)
+        self._by_name = _freeze(by_name)
+        self._by_type = _freeze(by_type)
+        self._by_stage = _freeze(by_stage)
+        self._by_ex = _freeze(by_ex)
+        self._by_evolves_from = _freeze(by_evolves_from)
+
+    @classmethod
+    def from_json(cls, json_path: str = DEFAULT_CARDS_PATH) -> 'CardCatalog':
+        """Load a catalog from a cards.json file (through the compiled cache)."""
+        return cls(load_cards_from_json(json_path), json_path)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self) -> Iterator[PokemonDefinition]:
+        return iter(self._cards)
+
+    def __getitem__(self, index: int) -> PokemonDefinition:
+        """Get a card by its catalog index."""
+        return self._cards[index]
+
+    @property
+    def cards(self) -> Tuple[PokemonDefinition, ...]:
+        """All cards in catalog order."""
+        return self._cards
+
+    def index_of(self, card: PokemonDefinition) -> int:
+        """Get the catalog index of one of the catalog's own cards."""
+        return self._index_of[id(card)]
+
+    def get(self, card_id: str) -> Optional[PokemonDefinition]:
+        """Look up a card by its set-qualified id, e.g. 'A1-001'."""
+        return self._by_id.get(card_id)
+
+    def by_name(self, name: str) -> Tuple[PokemonDefinition, ...]:
+        """All printings of a card name (regular, ex and promo versions differ)."""
+        return self._by_name.get(name, ())
+
+    def by_type(self, pokemon_type: PokemonType) -> Tuple[PokemonDefinition, ...]:
+        """All Pokemon of a type."""
+        return self._by_type.get(pokemon_type, ())
+
+    def by_stage(self, stage: str) -> Tuple[PokemonDefinition, ...]:
+        """All Pokemon of a stage ("Basic", "Stage 1", "Stage 2")."""
+        return self._by_stage.get(stage, ())
+
+    def by_ex(self, is_ex: bool = True) -> Tuple[PokemonDefinition, ...]:
+        """All Pokemon-ex (or all regular Pokemon with is_ex=False)."""
+        return self._by_ex[bool(is_ex)]
+
+    def evolutions_of(self, name: str) -> Tuple[PokemonDefinition, ...]:
+        """All Pokemon whose can_evolve_from is the given name."""
+        return self._by_evolves_from.get(name, ())
+
+    @property
+    def evolution(self) -> EvolutionGraph:
+        """The evolution graph of the catalog's Pokemon."""
+        return self._evolution
+
+    @property
+    def deck_generator(self) -> 'DeckGenerator':
+        """The catalog's deck generator, built on first use."""
+        if self._deck_generator is None:
+            from .deck_generator import DeckGenerator
+            self._deck_generator = DeckGenerator(self)
+        return self._deck_generator
+
+    @property
+    def fingerprint(self) -> bytes:
+        """8-byte digest of the gameplay data of every card, in catalog order.
+
+        Catalogs with equal fingerprints give the same catalog indices the
+        same cards, so snapshots and cached results made with one are valid
+        with the other.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=8)
+            for card in self._cards:
+                if isinstance(card, PokemonDefinition):
+                    attacks = tuple((a.name, a.damage, tuple(a.cost_types), getattr(a.effect, 'spec', None))
+                                    for a in card.attacks)
+                    data = (card.card_id, card.name, card.hp, card.pokemon_type.name, card.is_ex,
+                            card.weakness.name if card.weakness else None, card.retreat_cost, card.can_evolve_from,
+                            attacks, card.ability.name if card.ability else None)
+                else:
+                    data = (type(card).__name__, card.name)
+                digest.update(repr(data).encode('utf-8'))
+            self._fingerprint = digest.digest()
+        return self._fingerprint
+
+    def metadata(self, card_id: str) -> dict:
+        """Get the display-only fields of a card (image, rarity, artist, pack, ...).
+
+        They are not part of the gameplay load and are read from cards.json
+        the first time any card's metadata is requested.
+        """
+        if self._metadata is None:
+            self._metadata = load_card_metadata(self._json_path) if self._json_path else {}
+        return self._metadata.get(card_id, {})
+
+    def image_url(self, card_id: str) -> Optional[str]:
+        """Get the image URL of a card, if known."""
+        return self.metadata(card_id).get('image')
+
+    @property
+    def pokemon(self) -> Tuple[PokemonDefinition, ...]:
+        """All Pokemon cards in catalog order."""
+        return self._pokemon
+
+    @property
+    def basics(self) -> Tuple[PokemonDefinition, ...]:
+        """All Basic Pokemon."""
+        return self.by_stage("Basic")
+
+
+_catalog: Optional[CardCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> CardCatalog:
+    """Get the process-wide catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = CardCatalog.from_json(DEFAULT_CARDS_PATH)
+    return _catalog
@@ -0,0 +1,144 @@
+"""
+Compiled binary cache of the card catalog.
+
+Parsing cards.json and compiling every attack effect text dominates the time
+it takes to load the cards. The compiled catalog stores the already
+normalized gameplay records (see card_loader.compile_card_entry) with marshal,
+behind a small fixed-size header describing the source file and the compiler:
+
+    magic | format version | marshal version | compiler digest | source size | source mtime_ns | source sha256
+
+The compiler digest hashes the sources of the modules that compile the
+records (card_loader, effects and abilities), so editing a pattern or a
+primitive invalidates the cache by itself; CACHE_FORMAT_VERSION only
+changes with the header. The cache is valid when the compiler digest
+matches and the size and mtime of cards.json match the header, or failing
+that, when the content hash still matches (e.g. after a fresh checkout that
+touched the mtime). Otherwise it is recompiled from cards.json.
+
+Regenerate it explicitly with:
+    python -m src.cards.catalog_cache [path/to/cards.json]
+"""
+import codecs
+import hashlib
+import marshal
+import os
+import struct
+import sys
+from typing import List, Optional
+
+from . import abilities, card_loader, effects
+from .card_loader import STREAM_CHUNK_SIZE, compile_card_records, iter_card_entries
+
+CACHE_MAGIC = b'PTCG'
+CACHE_FORMAT_VERSION = 7
+# magic, format version, marshal version, compiler digest, source size, source mtime_ns, sha256 digest
+_HEADER = struct.Struct('<4sHH16sQq32s')
+_COMPILER_MODULES = (card_loader, effects, abilities)
+
+_compiler_digest: Optional[bytes] = None
+
+
+def compiler_digest() -> bytes:
+    """Digest of the sources of the modules that compile card records (computed once per process)."""
+    global _compiler_digest
+    if _compiler_digest is None:
+        digest = hashlib.blake2b(digest_size=16)
+        for module in _COMPILER_MODULES:
+            try:
+                with open(module.__file__, 'rb') as f:
+                    digest.update(f.read())
+            except (OSError, TypeError):
+                # No readable source (e.g. a zipped install); the module name still keys the cache
+                digest.update(module.__name__.encode('utf-8'))
+        _compiler_digest = digest.digest()
+    return _compiler_digest
+
+
+def cache_path_for(json_path: str) -> str:
+    """Get the path of the compiled catalog belonging to a cards.json file."""
+    return os.path.splitext(json_path)[0] + '.catalog'
+
+
+def _read_header(data: bytes) -> Optional[tuple]:
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, marshal_version, compiler, size, mtime_ns, digest = _HEADER.unpack_from(data)
+    if (magic != CACHE_MAGIC or version != CACHE_FORMAT_VERSION or marshal_version != marshal.version
+            or compiler != compiler_digest()):
+        return None
+    return size, mtime_ns, digest
+
+
+def write_compiled_catalog(cache_path: str, records: List[tuple], size: int, mtime_ns: int, digest: bytes) -> bool:
+    """Write records to cache_path. Returns False if the location is not writable."""
+    header = _HEADER.pack(CACHE_MAGIC, CACHE_FORMAT_VERSION, marshal.version, compiler_digest(), size, mtime_ns,
+                          digest)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(marshal.dumps(records))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def compile_catalog(json_path: str, cache_path: Optional[str] = None) -> List[tuple]:
+    """Compile cards.json into the binary catalog and return the records.
+
+    The file is hashed and parsed in the same streaming pass, keeping only the
+    gameplay fields of each entry.
+    """
+    cache_path = cache_path or cache_path_for(json_path)
+    digest = hashlib.sha256()
+    with open(json_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+
+        def text_chunks():
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for block in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+                digest.update(block)
+                yield decoder.decode(block)
+            yield decoder.decode(b'', final=True)
+
+        records = compile_card_records(iter_card_entries(text_chunks()))
+    write_compiled_catalog(cache_path, records, stat.st_size, stat.st_mtime_ns, digest.digest())
+    return records
+
+
+def load_card_records(json_path: str, cache_path: Optional[str] = None) -> List[tuple]:
+    """Load gameplay records from the compiled catalog, recompiling it if stale."""
+    cache_path = cache_path or cache_path_for(json_path)
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()  # Single bulk read of the whole catalog
+    except OSError:
+        return compile_catalog(json_path, cache_path)
+    header = _read_header(data)
+    if header is None:
+        return compile_catalog(json_path, cache_path)
+    size, mtime_ns, digest = header
+    stat = os.stat(json_path)
+    if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+        # The file was touched; only recompile if the content really changed
+        with open(json_path, 'rb') as f:
+            source = f.read()
+        if hashlib.sha256(source).digest() != digest:
+            return compile_catalog(json_path, cache_path)
+        records = marshal.loads(memoryview(data)[_HEADER.size:])
+        write_compiled_catalog(cache_path, records, stat.st_size, stat.st_mtime_ns, digest)
+        return records
+    return marshal.loads(memoryview(data)[_HEADER.size:])
+
+
+if __name__ == "__main__":
+    default_path = os.path.join(os.path.dirname(__file__), 'cards.json')
+    path = sys.argv[1] if len(sys.argv) > 1 else default_path
+    compiled = compile_catalog(path)
+    print(f"Compiled {len(compiled)} cards into {cache_path_for(path)}")
@@ -0,0 +1,79 @@
+"""
+Compact deck storage and shareable deck codes.
+
+A deck is stored as a fixed-width array of catalog indices (unsigned 16-bit)
+in canonical sorted order, so equal decks have equal bytes and can be hashed,
+deduplicated and sent to worker processes without any card objects.
+
+Deck codes are the canonical indices as varint-encoded gaps behind a version
+byte, in URL-safe base64: a 20-card deck is about 30 characters.
+"""
+import base64
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+DECK_CODE_VERSION = 1
+DECK_ARRAY_TYPECODE = 'H'
+
+
+def canonical_deck(indices: Iterable[int]) -> Tuple[int, ...]:
+    """Get the canonical (sorted) form of a deck of catalog indices."""
+    return tuple(sorted(indices))
+
+
+def pack_deck(indices: Iterable[int]) -> array:
+    """Store a deck as a fixed-width array of catalog indices in canonical order."""
+    return array(DECK_ARRAY_TYPECODE, canonical_deck(indices))
+
+
+def deck_key(indices: Iterable[int]) -> bytes:
+    """Get a hashable byte string identifying a deck (equal for any order of the same cards)."""
+    return pack_deck(indices).tobytes()
+
+
+def encode_deck(indices: Iterable[int]) -> str:
+    """Encode a deck of catalog indices as a short text code."""
+    data = bytearray([DECK_CODE_VERSION])
+    previous = 0
+    for idx in canonical_deck(indices):
+        if idx < 0:
+            raise ValueError(f"Invalid catalog index: {idx}")
+        gap = idx - previous
+        previous = idx
+        while gap >= 0x80:
+            data.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        data.append(gap)
+    return base64.urlsafe_b64encode(bytes(data)).decode('ascii').rstrip('=')
+
+
+def decode_deck(code: str, catalog_size: Optional[int] = None) -> Tuple[int, ...]:
+    """Decode a deck code into canonical catalog indices.
+
+    With catalog_size, indices outside the catalog are rejected. Raises
+    ValueError for malformed codes.
+    """
+    try:
+        data = base64.urlsafe_b64decode(code.strip() + '=' * (-len(code.strip()) % 4))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid deck code: {code!r}") from e
+    if not data or data[0] != DECK_CODE_VERSION:
+        raise ValueError(f"Unsupported deck code version: {code!r}")
+    indices: List[int] = []
+    previous = 0
+    gap = 0
+    shift = 0
+    for byte in data[1:]:
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += gap
+        indices.append(previous)
+        gap = 0
+        shift = 0
+    if shift:
+        raise ValueError(f"Truncated deck code: {code!r}")
+    if catalog_size is not None and indices and indices[-1] >= catalog_size:
+        raise ValueError(f"Deck code refers to card {indices[-1]} outside the catalog")
+    return tuple(indices)
@@ -0,0 +1,181 @@
+"""
+Random legal deck generation over the card catalog.
+
+Decks are sampled as whole evolution lines over integer tables built once per
+catalog, so every sampled deck is legal by construction:
+
+- exactly DECK_SIZE cards, at most MAX_COPIES cards with the same name;
+- at least one Basic Pokemon;
+- every Pokemon's attacks only need the deck's energy types (or Colorless);
+- every Stage 1 / Stage 2 comes with the Pokemon it evolves from.
+
+A deck is a sorted tuple of catalog indices.
+"""
+import random
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..models.cards import PokemonDefinition
+from ..models.enums import PokemonType
+from .card_loader import POKEMON_TYPE_MAP
+
+DECK_SIZE = 20
+MAX_COPIES = 2
+
+# Bit of each energy type in the per-card energy masks
+_TYPE_BITS = {t: 1 << i for i, t in enumerate(PokemonType)}
+
+
+def energy_mask(types: Sequence[PokemonType]) -> int:
+    """Get the bitmask of a set of energy types."""
+    mask = 0
+    for t in types:
+        mask |= _TYPE_BITS[t]
+    return mask
+
+
+def _card_mask(card: PokemonDefinition) -> int:
+    """Energy types a card's attacks need, Colorless excluded."""
+    mask = 0
+    for attack in card.attacks:
+        for cost in attack.cost_types:
+            t = POKEMON_TYPE_MAP.get(cost)
+            if t is not None and t is not PokemonType.NORMAL:
+                mask |= _TYPE_BITS[t]
+    return mask
+
+
+class _Pool:
+    """The species and printings allowed for one set of energy types."""
+
+    __slots__ = ('species', 'printings')
+
+    def __init__(self, species: Tuple[int, ...], printings: Dict[int, Tuple[int, ...]]):
+        self.species = species
+        self.printings = printings
+
+
+class DeckGenerator:
+    """Samples legal decks from a catalog using precomputed constraint tables."""
+
+    def __init__(self, catalog, rng: Optional[random.Random] = None):
+        """Build the per-species tables of a catalog (a CardCatalog)."""
+        self.catalog = catalog
+        self.rng = rng if rng is not None else random.Random()
+        graph = catalog.evolution
+        species_of: Dict[str, int] = {}
+        printings: List[List[Tuple[int, int]]] = []  # per species: (catalog index, energy mask)
+        for card in catalog.pokemon:
+            sid = species_of.get(card.name)
+            if sid is None:
+                sid = species_of[card.name] = len(printings)
+                printings.append([])
+            printings[sid].append((catalog.index_of(card), _card_mask(card)))
+        self._printings = tuple(tuple(p) for p in printings)
+
+        # The whole line of every species, Basic first; lines that cannot be
+        # completed (e.g. evolving from a Fossil item) are left out
+        chains: List[Optional[Tuple[int, ...]]] = []
+        for name in species_of:
+            chain = graph.chain_of(name)
+            if all(link in species_of for link in chain) and graph.stage_of(chain[0]) == "Basic":
+                chains.append(tuple(species_of[link] for link in chain))
+            else:
+                chains.append(None)
+        self._chains = tuple(chains)
+        self._pools: Dict[int, _Pool] = {}
+
+        # Energy types a deck can be built around on its own: only types some
+        # attack cost asks for (never Colorless), with enough cards to fill a deck
+        used = 0
+        for species in self._printings:
+            for _, card_mask in species:
+                used |= card_mask
+        self.energy_types = tuple(t for t in PokemonType if used & _TYPE_BITS[t]
+                                  and self._can_fill(self._pool(energy_mask([t]))))
+
+    def _pool(self, mask: int) -> _Pool:
+        """Get (and cache) the species and printings allowed with an energy mask."""
+        pool = self._pools.get(mask)
+        if pool is None:
+            allowed = {}
+            for sid, printings in enumerate(self._printings):
+                indices = tuple(idx for idx, card_mask in printings if card_mask & ~mask == 0)
+                if indices:
+                    allowed[sid] = indices
+            species = tuple(sid for sid, chain in enumerate(self._chains)
+                            if chain is not None and all(link in allowed for link in chain))
+            pool = self._pools[mask] = _Pool(species, {sid: allowed[sid] for sid in species})
+        return pool
+
+    @staticmethod
+    def _can_fill(pool: _Pool) -> bool:
+        return len(pool.species) * MAX_COPIES >= DECK_SIZE
+
+    def sample(self, energy_types: Optional[Sequence[PokemonType]] = None,
+               rng: Optional[random.Random] = None) -> Tuple[int, ...]:
+        """Sample one legal deck as a sorted tuple of catalog indices.
+
+        energy_types defaults to one or two random types the catalog supports.
+        rng overrides the generator's own random stream for this deck. Raises
+        ValueError if the types allow too few Pokemon for a deck.
+        """
+        if rng is None:
+            rng = self.rng
+        if energy_types is None:
+            energy_types = rng.sample(self.energy_types, rng.choice((1, 2)))
+        pool = self._pool(energy_mask(energy_types))
+        if not self._can_fill(pool):
+            raise ValueError(f"Not enough Pokemon for a deck of {', '.join(t.name for t in energy_types)}")
+
+        counts: Dict[int, int] = {}
+        total = 0
+        chains = self._chains
+        for sid in rng.sample(pool.species, len(pool.species)):
+            missing = [link for link in chains[sid] if link not in counts]
+            if total + len(missing) > DECK_SIZE:
+                continue
+            for link in missing:
+                counts[link] = 1
+            total += len(missing)
+            # Take a second copy of half of the new cards while there is room
+            for link in missing:
+                if total < DECK_SIZE and rng.random() < 0.5:
+                    counts[link] = MAX_COPIES
+                    total += 1
+            if total == DECK_SIZE:
+                break
+        if total < DECK_SIZE:
+            singles = [sid for sid, count in counts.items() if count < MAX_COPIES]
+            for sid in rng.sample(singles, min(len(singles), DECK_SIZE - total)):
+                counts[sid] += 1
+                total += 1
+        if total < DECK_SIZE:
+            raise ValueError(f"Could not fill a deck of {', '.join(t.name for t in energy_types)}")
+
+        deck = []
+        for sid, count in counts.items():
+            printings = pool.printings[sid]
+            deck.extend(rng.choice(printings) for _ in range(count))
+        return tuple(sorted(deck))
+
+    def generate(self, count: int, energy_types: Optional[Sequence[PokemonType]] = None) -> Iterator[Tuple[int, ...]]:
+        """Sample count decks."""
+        for _ in range(count):
+            yield self.sample(energy_types)
+
+    def is_legal(self, deck: Sequence[int]) -> bool:
+        """Check a deck of catalog indices against the deck building rules (energy types aside)."""
+        if len(deck) != DECK_SIZE:
+            return False
+        graph = self.catalog.evolution
+        names: Dict[str, int] = {}
+        for idx in deck:
+            card = self.catalog[idx]
+            if not isinstance(card, PokemonDefinition):
+                return False
+            names[card.name] = names.get(card.name, 0) + 1
+        if any(count > MAX_COPIES for count in names.values()):
+            return False
+        if not any(graph.stage_of(name) == "Basic" for name in names):
+            return False
+        return all(graph.parent_of(name) is None or graph.parent_of(name) in names for name in names)
@@ -0,0 +1,505 @@
+"""
+Table-driven attack effects.
+
+Attack effect texts are matched against a table of patterns when the catalog
+is compiled. Each pattern maps to a reusable primitive (heal N, apply status,
+coin-flip bonus, discard energy, self-damage, bench snipe, ...) plus the
+parameters read from the text. Compiling a text yields an effect spec: a tuple
+of (primitive key, params) parts, one per sentence when the text is not
+matched as a whole. Specs only hold builtin types, so they are stored in the
+compiled catalog and turned back into shared AttackEffect objects with O(1)
+lookups at load time.
+
+Primitives come in two kinds:
+- damage modifiers run before damage is dealt: fn(self_player, opp_player, damage, *params) -> damage
+- after-damage effects: fn(self_player, opp_player, *params)
+"""
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple, TYPE_CHECKING
+
+from ..game.events import (CardSearched, CardsDrawn, CoinFlipped, DamageDealt, DamageModified, EffectFailed,
+                           EnergyAttached, EnergyDiscarded, Healed, StatusApplied)
+from ..models.cards import COST_TYPES
+from ..models.enums import PokemonType, StatusCondition
+
+if TYPE_CHECKING:
+    from ..game.player import Player
+    from ..models.cards import PokemonCard
+
+# Energy symbols used in effect texts
+ENERGY_SYMBOLS = {
+    'G': PokemonType.GRASS,
+    'R': PokemonType.FIRE,
+    'W': PokemonType.WATER,
+    'L': PokemonType.ELECTRIC,
+    'P': PokemonType.PSYCHIC,
+    'F': PokemonType.FIGHTING,
+    'D': PokemonType.DARKNESS,
+    'M': PokemonType.METAL,
+    'C': PokemonType.NORMAL,
+}
+
+STATUS_WORDS = {
+    'Poisoned': StatusCondition.POISON,
+    'Burned': StatusCondition.BURN,
+    'Asleep': StatusCondition.SLEEP,
+    'Paralyzed': StatusCondition.PARALYSIS,
+    'Confused': StatusCondition.CONFUSION,
+}
+
+
+class Primitive(NamedTuple):
+    """A registered effect primitive."""
+    fn: Callable
+    modifies_damage: bool
+
+
+class EffectPattern(NamedTuple):
+    """Maps effect text to a primitive and the parameters read from it."""
+    regex: Pattern
+    key: str
+    params: Callable[['re.Match', Sequence[str]], tuple]
+
+
+PRIMITIVES: Dict[str, Primitive] = {}
+PATTERNS: List[EffectPattern] = []
+
+EffectSpec = Tuple[Tuple[str, tuple], ...]
+
+
+def primitive(key: str, modifies_damage: bool = False):
+    """Register a primitive under key."""
+    def register(fn):
+        PRIMITIVES[key] = Primitive(fn, modifies_damage)
+        return fn
+    return register
+
+
+def pattern(regex: str, key: str, params: Callable[['re.Match', Sequence[str]], tuple] = lambda m, cost: ()):
+    """Register an effect text pattern. params gets the match and the attack cost."""
+    PATTERNS.append(EffectPattern(re.compile(regex + r'$'), key, params))
+
+
+def _num(word: str) -> int:
+    return 1 if word in ('a', 'an') else int(word)
+
+
+def _energy(symbol: Optional[str]) -> Optional[str]:
+    return ENERGY_SYMBOLS[symbol].name if symbol else None
+
+
+def _coin(player: 'Player') -> bool:
+    """Flip a coin for player's effect and report it."""
+    heads = player.rng.flip()
+    events = player.events
+    if events.enabled:
+        events.emit(CoinFlipped(player.name, 1, int(heads)))
+    return heads
+
+
+def _coins(player: 'Player', coins: int) -> int:
+    """Flip coins for player's effect and report the number of heads."""
+    heads = player.rng.heads(coins)
+    events = player.events
+    if events.enabled:
+        events.emit(CoinFlipped(player.name, coins, heads))
+    return heads
+
+
+def _damage(owner: 'Player', poke: 'PokemonCard', amount: int, source: str) -> None:
+    """Put damage on one of owner's Pokemon outside of the attack's main damage."""
+    poke.hp -= amount
+    events = owner.events
+    if events.enabled:
+        events.emit(DamageDealt(owner.name, poke.name, amount, poke.hp, poke.max_hp, source))
+
+
+def _heal(owner: 'Player', poke: 'PokemonCard', amount: int) -> None:
+    """Heal one of owner's Pokemon, up to its max HP."""
+    healed = min(amount, poke.max_hp - poke.hp)
+    poke.hp += healed
+    events = owner.events
+    if events.enabled:
+        events.emit(Healed(owner.name, poke.name, healed))
+
+
+def _total_energy(poke: 'PokemonCard') -> int:
+    return sum(poke.attached_energy.values())
+
+
+def _discard_energy(player: 'Player', poke: 'PokemonCard', energy_type: Optional[PokemonType], count: int,
+                    at_random: bool = False) -> int:
+    """Remove up to count energy of a type (any type if None) from a Pokemon; player's RNG picks random ones.
+
+    Candidates are taken in PokemonType order, like CompactEngine, not in attachment order.
+    """
+    attached = poke.attached_energy
+    removed = 0
+    while removed < count:
+        candidates = [t for t in PokemonType if attached.get(t, 0) > 0 and (energy_type is None or t == energy_type)]
+        if not candidates:
+            break
+        t = player.rng.choice(candidates) if at_random else candidates[0]
+        attached[t] -= 1
+        removed += 1
+    return removed
+
+
+def _pick_target(pokes: Sequence['PokemonCard'], damage: int) -> Optional['PokemonCard']:
+    """Choose a target automatically: one that would be knocked out, else the most damaged."""
+    pokes = [poke for poke in pokes if poke]
+    if not pokes:
+        return None
+    for poke in pokes:
+        if poke.hp <= damage:
+            return poke
+    return min(pokes, key=lambda poke: poke.hp)
+
+
+# --- Damage modifiers ---
+
+@primitive('coin_bonus', modifies_damage=True)
+def coin_bonus(self_player, opp_player, damage, bonus):
+    return damage + bonus if _coin(self_player) else damage
+
+
+@primitive('coin_bonus_or_recoil', modifies_damage=True)
+def coin_bonus_or_recoil(self_player, opp_player, damage, bonus, recoil):
+    if _coin(self_player):
+        return damage + bonus
+    _damage(self_player, self_player.active, recoil, 'self')
+    return damage
+
+
+@primitive('coin_or_nothing', modifies_damage=True)
+def coin_or_nothing(self_player, opp_player, damage):
+    return damage if _coin(self_player) else 0
+
+
+@primitive('damage_per_heads', modifies_damage=True)
+def damage_per_heads(self_player, opp_player, damage, coins, per_heads):
+    return per_heads * _coins(self_player, coins)
+
+
+@primitive('bonus_per_heads', modifies_damage=True)
+def bonus_per_heads(self_player, opp_player, damage, coins, per_heads):
+    return damage + per_heads * _coins(self_player, coins)
+
+
+@primitive('all_heads_bonus', modifies_damage=True)
+def all_heads_bonus(self_player, opp_player, damage, coins, bonus):
+    return damage + bonus if _coins(self_player, coins) == coins else damage
+
+
+@primitive('heads_until_tails', modifies_damage=True)
+def heads_until_tails(self_player, opp_player, damage, per_heads, replace):
+    heads = 0
+    flip = self_player.rng.flip
+    while flip():
+        heads += 1
+    events = self_player.events
+    if events.enabled:
+        events.emit(CoinFlipped(self_player.name, heads + 1, heads))
+    return per_heads * heads if replace else damage + per_heads * heads
+
+
+@primitive('damage_per_energy_flip', modifies_damage=True)
+def damage_per_energy_flip(self_player, opp_player, damage, per_heads):
+    return per_heads * _coins(self_player, _total_energy(self_player.active))
+
+
+@primitive('bonus_per_opponent_energy', modifies_damage=True)
+def bonus_per_opponent_energy(self_player, opp_player, damage, per_energy):
+    return damage + per_energy * _total_energy(opp_player.active)
+
+
+@primitive('bonus_if_damaged', modifies_damage=True)
+def bonus_if_damaged(self_player, opp_player, damage, bonus):
+    target = opp_player.active
+    return damage + bonus if target.hp < target.max_hp else damage
+
+
+@primitive('bonus_if_status', modifies_damage=True)
+def bonus_if_status(self_player, opp_player, damage, status, bonus):
+    return damage + bonus if opp_player.active.status == StatusCondition[status] else damage
+
+
+@primitive('bonus_if_extra_energy', modifies_damage=True)
+def bonus_if_extra_energy(self_player, opp_player, damage, energy_type, required, bonus):
+    attached = self_player.active.attached_energy.get(PokemonType[energy_type], 0)
+    return damage + bonus if attached >= required else damage
+
+
+@primitive('bonus_if_tool', modifies_damage=True)
+def bonus_if_tool(self_player, opp_player, damage, bonus, opponent):
+    poke = opp_player.active if opponent else self_player.active
+    return damage + bonus if poke.attached_tool else damage
+
+
+@primitive('damage_per_own_bench', modifies_damage=True)
+def damage_per_own_bench(self_player, opp_player, damage, per_poke, energy_type):
+    count = sum(1 for poke in self_player.bench
+                if energy_type is None or poke.pokemon_type == PokemonType[energy_type])
+    return per_poke * count
+
+
+@primitive('bonus_per_opponent_bench', modifies_damage=True)
+def bonus_per_opponent_bench(self_player, opp_player, damage, per_poke):
+    return damage + per_poke * len(opp_player.bench)
+
+
+@primitive('bonus_per_own_damage', modifies_damage=True)
+def bonus_per_own_damage(self_player, opp_player, damage):
+    poke = self_player.active
+    return damage + (poke.max_hp - poke.hp)
+
+
+# --- After-damage effects ---
+
+@primitive('heal_self')
+def heal_self(self_player, opp_player, amount):
+    if self_player.active:
+        _heal(self_player, self_player.active, amount)
+
+
+@primitive('apply_status')
+def apply_status(self_player, opp_player, status):
+    if opp_player.active:
+        opp_player.active.status = StatusCondition[status]
+        events = opp_player.events
+        if events.enabled:
+            events.emit(StatusApplied(opp_player.name, opp_player.active.name, opp_player.active.status))
+
+
+@primitive('coin_status')
+def coin_status(self_player, opp_player, status):
+    if _coin(self_player):
+        apply_status(self_player, opp_player, status)
+
+
+@primitive('self_damage')
+def self_damage(self_player, opp_player, amount):
+    if self_player.active:
+        _damage(self_player, self_player.active, amount, 'self')
+
+
+@primitive('discard_own_energy')
+def discard_own_energy(self_player, opp_player, energy_type, count, at_random):
+    if self_player.active:
+        t = PokemonType[energy_type] if energy_type else None
+        removed = _discard_energy(self_player, self_player.active, t, count, at_random)
+        events = self_player.events
+        if events.enabled:
+            events.emit(EnergyDiscarded(self_player.name, self_player.active.name, removed))
+
+
+@primitive('discard_opponent_energy')
+def discard_opponent_energy(self_player, opp_player, coin):
+    if opp_player.active and (not coin or _coin(self_player)):
+        if _discard_energy(self_player, opp_player.active, None, 1, at_random=True):
+            events = opp_player.events
+            if events.enabled:
+                events.emit(EnergyDiscarded(opp_player.name, opp_player.active.name, 1, at_random=True))
+
+
+@primitive('snipe_bench_each')
+def snipe_bench_each(self_player, opp_player, amount):
+    for poke in opp_player.bench:
+        _damage(opp_player, poke, amount, 'bench')
+
+
+@primitive('snipe_one')
+def snipe_one(self_player, opp_player, amount, bench_only):
+    pokes = opp_player.bench if bench_only else [opp_player.active] + opp_player.bench
+    target = _pick_target(pokes, amount)
+    if target:
+        _damage(opp_player, target, amount, 'effect')
+
+
+@primitive('search_deck')
+def search_deck(self_player, opp_player, energy_type, count):
+    t = PokemonType[energy_type]
+    events = self_player.events
+    for _ in range(count):
+        matches = [card for card in self_player.deck if getattr(card, 'pokemon_type', None) is t]
+        if not matches:
+            if events.enabled:
+                events.emit(CardSearched(self_player.name, None))
+            return
+        chosen = self_player.rng.choice(matches)
+        self_player.deck.remove(chosen)
+        self_player.hand.append(chosen)
+        if events.enabled:
+            events.emit(CardSearched(self_player.name, chosen.name))
+
+
+@primitive('energy_to_bench')
+def energy_to_bench(self_player, opp_player, energy_type, count, bench_type):
+    t = PokemonType[energy_type]
+    targets = [poke for poke in self_player.bench if bench_type is None or poke.pokemon_type == PokemonType[bench_type]]
+    events = self_player.events
+    if not targets:
+        if events.enabled:
+            events.emit(EffectFailed(self_player.name, "No Benched Pokémon to attach energy to."))
+        return
+    # Attach to the first matching benched Pokemon
+    poke = targets[0]
+    poke.attached_energy[t] = poke.attached_energy.get(t, 0) + count
+    if events.enabled:
+        events.emit(EnergyAttached(self_player.name, poke.name, t.name, count))
+
+
+@primitive('draw')
+def draw(self_player, opp_player, count):
+    drawn = self_player.draw_cards(count)
+    events = self_player.events
+    if events.enabled:
+        events.emit(CardsDrawn(self_player.name, len(drawn), by_effect=True))
+
+
+# --- Text patterns ---
+
+_N = r'(a|an|\d+)'
+_E = r'\[([GRWLPFDMC])\]'
+
+pattern(r"Heal (\d+) damage from this Pokémon\.", 'heal_self', lambda m, cost: (int(m[1]),))
+pattern(r"Your opponent's Active Pokémon is now (Poisoned|Burned|Asleep|Paralyzed|Confused)\.", 'apply_status',
+        lambda m, cost: (STATUS_WORDS[m[1]].name,))
+pattern(r"Flip a coin\. If heads, your opponent's Active Pokémon is now (Poisoned|Burned|Asleep|Paralyzed|Confused)\.",
+        'coin_status', lambda m, cost: (STATUS_WORDS[m[1]].name,))
+pattern(r"Flip a coin\. If heads, this attack does (\d+) more damage\.", 'coin_bonus', lambda m, cost: (int(m[1]),))
+pattern(r"Flip a coin\. If heads, this attack does (\d+) more damage\. If tails, this Pokémon also does (\d+) damage to itself\.",
+        'coin_bonus_or_recoil', lambda m, cost: (int(m[1]), int(m[2])))
+pattern(r"Flip a coin\. If tails, this attack does nothing\.", 'coin_or_nothing')
+pattern(r"Flip (\d+) coins\. This attack does (\d+) damage for each heads\.", 'damage_per_heads',
+        lambda m, cost: (int(m[1]), int(m[2])))
+pattern(r"Flip (\d+) coins\. This attack does (\d+) more damage for each heads\.", 'bonus_per_heads',
+        lambda m, cost: (int(m[1]), int(m[2])))
+pattern(r"Flip (\d+) coins\. If both of them are heads, this attack does (\d+) more damage\.", 'all_heads_bonus',
+        lambda m, cost: (int(m[1]), int(m[2])))
+pattern(r"Flip a coin until you get tails\. This attack does (\d+) (more )?damage for each heads\.", 'heads_until_tails',
+        lambda m, cost: (int(m[1]), not m[2]))
+pattern(r"Flip a coin for each Energy attached to this Pokémon\. This attack does (\d+) damage for each heads\.",
+        'damage_per_energy_flip', lambda m, cost: (int(m[1]),))
+pattern(r"This attack does (\d+) more damage for each Energy attached to your opponent's Active Pokémon\.",
+        'bonus_per_opponent_energy', lambda m, cost: (int(m[1]),))
+pattern(r"If your opponent's Active Pokémon has damage on it, this attack does (\d+) more damage\.", 'bonus_if_damaged',
+        lambda m, cost: (int(m[1]),))
+pattern(r"If your opponent's Active Pokémon is (Poisoned|Burned|Asleep|Paralyzed|Confused), this attack does (\d+) more damage\.",
+        'bonus_if_status', lambda m, cost: (STATUS_WORDS[m[1]].name, int(m[2])))
+# "Extra" energy is counted beyond what the attack cost already needs of that type
+pattern(r"If this Pokémon has at least (\d+) extra " + _E + r" Energy attached, this attack does (\d+) more damage\.",
+        'bonus_if_extra_energy',
+        lambda m, cost: (_energy(m[2]),
+                         int(m[1]) + sum(1 for c in cost if COST_TYPES.get(c) is ENERGY_SYMBOLS[m[2]]),
+                         int(m[3])))
+pattern(r"If this Pokémon has a Pokémon Tool attached, this attack does (\d+) more damage\.", 'bonus_if_tool',
+        lambda m, cost: (int(m[1]), False))
+pattern(r"If your opponent's Active Pokémon has a Pokémon Tool attached, this attack does (\d+) more damage\.",
+        'bonus_if_tool', lambda m, cost: (int(m[1]), True))
+pattern(r"This attack does (\d+) damage for each of your Benched (?:" + _E + r" )?Pokémon\.", 'damage_per_own_bench',
+        lambda m, cost: (int(m[1]), _energy(m[2])))
+pattern(r"This attack does (\d+) more damage for each of your opponent's Benched Pokémon\.", 'bonus_per_opponent_bench',
+        lambda m, cost: (int(m[1]),))
+pattern(r"This attack does more damage equal to the damage this Pokémon has on it\.", 'bonus_per_own_damage')
+pattern(r"This Pokémon also does (\d+) damage to itself\.", 'self_damage', lambda m, cost: (int(m[1]),))
+pattern(r"Discard " + _N + r" " + _E + r" Energy from this Pokémon\.", 'discard_own_energy',
+        lambda m, cost: (_energy(m[2]), _num(m[1]), False))
+pattern(r"Discard all " + _E + r" Energy from this Pokémon\.", 'discard_own_energy',
+        lambda m, cost: (_energy(m[1]), 99, False))
+pattern(r"Discard all Energy from this Pokémon\.", 'discard_own_energy', lambda m, cost: (None, 99, False))
+pattern(r"Discard a random Energy from this Pokémon\.", 'discard_own_energy', lambda m, cost: (None, 1, True))
+pattern(r"Discard a random Energy from your opponent's Active Pokémon\.", 'discard_opponent_energy',
+        lambda m, cost: (False,))
+pattern(r"Flip a coin\. If heads, discard a random Energy from your opponent's Active Pokémon\.",
+        'discard_opponent_energy', lambda m, cost: (True,))
+pattern(r"This attack also does (\d+) damage to each of your opponent's Benched Pokémon\.", 'snipe_bench_each',
+        lambda m, cost: (int(m[1]),))
+pattern(r"This attack (?:also )?does (\d+) damage to 1 of your opponent's Benched Pokémon\.", 'snipe_one',
+        lambda m, cost: (int(m[1]), True))
+pattern(r"This attack does (\d+) damage to 1 of your opponent's Pokémon\.", 'snipe_one',
+        lambda m, cost: (int(m[1]), False))
+pattern(r"Put (\d+) random " + _E + r" Pokémon from your deck into your hand\.", 'search_deck',
+        lambda m, cost: (_energy(m[2]), int(m[1])))
+pattern(r"Take " + _N + r" " + _E + r" Energy from your Energy Zone and attach it to 1 of your Benched (?:" + _E + r" )?Pokémon\.",
+        'energy_to_bench', lambda m, cost: (_energy(m[2]), _num(m[1]), _energy(m[3])))
+pattern(r"Draw (\d+) cards?\.", 'draw', lambda m, cost: (int(m[1]),))
+
+
+def _match(text: str, cost: Sequence[str]) -> Optional[Tuple[str, tuple]]:
+    for entry in PATTERNS:
+        m = entry.regex.match(text)
+        if m:
+            return entry.key, entry.params(m, cost)
+    return None
+
+
+@lru_cache(maxsize=None)
+def compile_effect(text: str, cost: Tuple[str, ...] = ()) -> Optional[EffectSpec]:
+    """Compile effect text into a spec, or None if no primitive handles it.
+
+    The whole text is tried first; otherwise every sentence must match on its own.
+    Results are memoized, so repeated texts are only matched once.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    part = _match(text, cost)
+    if part:
+        return (part,)
+    parts = []
+    for sentence in re.findall(r'[^.]+\.', text):
+        part = _match(sentence.strip(), cost)
+        if part is None:
+            return None
+        parts.append(part)
+    return tuple(parts) or None
+
+
+class AttackEffect:
+    """A shared attack effect built from an effect spec.
+
+    Calling it applies the after-damage parts, matching the plain
+    effect(self_player, opp_player) callables; modify_damage runs the damage
+    modifier parts before damage is dealt.
+    """
+
+    def __init__(self, spec: EffectSpec, text: str = ''):
+        """Resolve the primitives of a spec."""
+        self.spec = spec
+        self.__doc__ = text
+        self.modifiers = tuple((PRIMITIVES[key].fn, params) for key, params in spec if PRIMITIVES[key].modifies_damage)
+        self.effects = tuple((PRIMITIVES[key].fn, params) for key, params in spec if not PRIMITIVES[key].modifies_damage)
+        if not self.modifiers:
+            self.modify_damage = None
+
+    def modify_damage(self, self_player: 'Player', opp_player: 'Player', damage: int) -> int:
+        """Apply the damage modifiers of this effect."""
+        before = damage
+        for fn, params in self.modifiers:
+            damage = fn(self_player, opp_player, damage, *params)
+        events = self_player.events
+        if events.enabled and damage != before:
+            events.emit(DamageModified(self_player.name, self_player.active.name, before, damage))
+        return damage
+
+    def __call__(self, self_player: 'Player', opp_player: 'Player') -> None:
+        for fn, params in self.effects:
+            fn(self_player, opp_player, *params)
+
+    def __repr__(self) -> str:
+        return f"AttackEffect({self.spec!r})"
+
+
+_effects: Dict[EffectSpec, AttackEffect] = {}
+
+
+def build_effect(spec: Optional[EffectSpec], text: str = '') -> Optional[AttackEffect]:
+    """Get the shared AttackEffect of a spec (one instance per distinct spec)."""
+    if not spec:
+        return None
+    effect = _effects.get(spec)
+    if effect is None:
+        effect = _effects[spec] = AttackEffect(spec, text)
+    return effect
@@ -0,0 +1,101 @@
+"""
+Evolution graph of the card catalog.
+
+Evolution lines are a property of species names (every printing of "Ivysaur"
+evolves from "Bulbasaur"), so the graph is built once over names from the
+stage and evolves-from data of the cards and answers every question with a
+dictionary lookup. Both engines take their evolution answers from the
+catalog's graph: GameEngine through its players' hands and evolvable
+indexes, CompactEngine through its per-card tables.
+"""
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from ..models.cards import PokemonCard, PokemonDefinition
+
+STAGES = ("Basic", "Stage 1", "Stage 2")
+
+
+class EvolutionGraph:
+    """Stage, parent, children and full evolution chain of every Pokemon species."""
+
+    __slots__ = ('_stage', '_parent', '_children', '_chain', '_printings')
+
+    def __init__(self, cards: Iterable[PokemonDefinition]):
+        """Build the graph from card definitions (non-Pokemon cards are ignored)."""
+        stage: Dict[str, str] = {}
+        parent: Dict[str, Optional[str]] = {}
+        children: Dict[str, List[str]] = {}
+        printings: Dict[str, List[PokemonDefinition]] = {}
+        for card in cards:
+            if not isinstance(card, PokemonDefinition):
+                continue
+            printings.setdefault(card.name, []).append(card)
+            if card.name in parent:
+                continue
+            parent[card.name] = card.can_evolve_from
+            if card.stage:
+                stage[card.name] = card.stage
+            if card.can_evolve_from:
+                children.setdefault(card.can_evolve_from, []).append(card.name)
+
+        chain: Dict[str, Tuple[str, ...]] = {}
+        for name in parent:
+            line = [name]
+            ancestor = parent[name]
+            while ancestor and ancestor not in line:
+                line.append(ancestor)
+                ancestor = parent.get(ancestor)
+            chain[name] = tuple(reversed(line))
+            # Cards without stage data get it from their depth in the graph
+            if name not in stage:
+                stage[name] = STAGES[min(len(line) - 1, len(STAGES) - 1)]
+
+        self._stage = MappingProxyType(stage)
+        self._parent = MappingProxyType(parent)
+        self._children = MappingProxyType({name: tuple(names) for name, names in children.items()})
+        self._chain = MappingProxyType(chain)
+        self._printings = MappingProxyType({name: tuple(cards) for name, cards in printings.items()})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._parent
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def stage_of(self, name: str) -> str:
+        """Get the stage ("Basic", "Stage 1" or "Stage 2") of a species."""
+        return self._stage.get(name, "Basic")
+
+    def parent_of(self, name: str) -> Optional[str]:
+        """Get the species a Pokemon evolves from, if any."""
+        return self._parent.get(name)
+
+    def children_of(self, name: str) -> Tuple[str, ...]:
+        """Get the species that evolve from a Pokemon."""
+        return self._children.get(name, ())
+
+    def chain_of(self, name: str) -> Tuple[str, ...]:
+        """Get the evolution chain from the Basic up to and including a species."""
+        return self._chain.get(name, (name,))
+
+    def evolutions_of(self, name: str) -> Tuple[PokemonDefinition, ...]:
+        """Get every printing of every species that evolves from a Pokemon."""
+        return tuple(card for child in self.children_of(name) for card in self._printings.get(child, ()))
+
+    def can_evolve_into(self, evolution: str, target: str) -> bool:
+        """Check if the species target evolves directly into the species evolution."""
+        return self._parent.get(evolution) == target
+
+    def parent_of_card(self, card: Union[PokemonCard, PokemonDefinition]) -> Optional[str]:
+        """Get the species a card evolves from, from its own data if its species is not in the graph."""
+        parent = self._parent
+        return parent[card.name] if card.name in parent else card.can_evolve_from
+
+    def is_basic(self, card: Union[PokemonCard, PokemonDefinition]) -> bool:
+        """Check if a card is a Basic Pokemon (evolves from nothing)."""
+        return self.parent_of_card(card) is None
+
+
+# Graph of players and hands outside a game: every card answers from its own data
+EMPTY_GRAPH = EvolutionGraph(())
@@ -0,0 +1,50 @@
+"""
+Actions of the headless game engine API.
+
+An Action only holds small integers, so actions are hashable, cheap to
+compare and can be stored or sent between processes. Card and Pokemon
+arguments are positions in the acting player's zones:
+
+- card: index into the acting player's hand;
+- target: board position, 0 for the Active Pokemon and 1-3 for the Bench;
+- index: attack index of the Active Pokemon.
+"""
+from dataclasses import dataclass
+from enum import Enum, auto
+
+ACTIVE = 0  # Board position of the Active Pokemon; Bench slot i is position i + 1
+
+
+class ActionType(Enum):
+    """Kinds of actions a player can take."""
+    CHOOSE_ACTIVE = auto()   # Setup: put a Basic from hand in the Active Spot
+    SETUP_BENCH = auto()     # Setup: put a Basic from hand on the Bench
+    END_SETUP = auto()       # Setup: done placing Pokemon
+    ATTACH_ENERGY = auto()   # Attach Energy from the Energy Zone to target
+    EVOLVE = auto()          # Evolve target with card
+    PLAY_BASIC = auto()      # Put a Basic from hand on the Bench
+    USE_ABILITY = auto()     # Use the ability of target
+    PLAY_SUPPORTER = auto()  # Play a Supporter card
+    PLAY_ITEM = auto()       # Play an Item card
+    ATTACH_TOOL = auto()     # Attach a Tool card to target
+    RETREAT = auto()         # Switch the Active Pokemon with Bench target
+    ATTACK = auto()          # Attack with the Active Pokemon, ends the turn
+    END_TURN = auto()        # End the turn without attacking
+
+
+@dataclass(frozen=True)
+class Action:
+    """A single move of the acting player."""
+    type: ActionType
+    card: int = -1
+    target: int = -1
+    index: int = -1
+
+    def __repr__(self) -> str:
+        args = [f"{name}={value}" for name, value in (('card', self.card), ('target', self.target),
+                                                      ('index', self.index)) if value >= 0]
+        return f"Action({self.type.name}{', ' if args else ''}{', '.join(args)})"
+
+
+END_SETUP = Action(ActionType.END_SETUP)
+END_TURN = Action(ActionType.END_TURN)
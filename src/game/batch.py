@@ -0,0 +1,564 @@
+"""
+NumPy engine playing thousands of simple games in lockstep.
+
+For balance studies of attack decks the per-game Python overhead of
+GameEngine, or even CompactEngine, dominates. BatchEngine holds K games as
+arrays instead: per slot catalog index, HP, Grass Energy count and status,
+per player points, Energy tokens, deck order and draw position, and per game
+turn and result. Every step() plays one turn of every unfinished game with
+vectorized operations: drawing, benching, attaching, attacking (damage,
+Weakness +20, coin flips, status), Pokemon Checkup (Poison, Burn, Sleep,
+Paralysis), knockouts and points.
+
+The games are deliberately simple:
+
+- decks hold Basic Pokemon without abilities whose attacks only use the
+  effects in MODIFIER_CODES and EFFECT_CODES (see BatchTables.supported);
+- both players follow the same script, the 'attacker' policy of
+  src.sim.policies: fill the board from the hand in hand order, attach the
+  turn's Energy to the Active Pokemon and use its last payable attack.
+
+With the same deck order and coin flips a game plays exactly as on
+GameEngine with the 'attacker' policy; check_consistency() plays games on
+both in lockstep and compares them after every turn:
+
+    python -m src.game.batch --check 500
+    python -m src.game.batch DECK_A DECK_B --games 20000 [--seed S]
+
+Arrays are kept from the point of view of the player to move: side 0 is the
+player whose turn it is in every running game (they all are on the same
+turn), and sides are swapped after each step.
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Only this module needs NumPy
+    np = None
+
+from ..cards.catalog import CardCatalog, get_catalog
+from ..cards.deck_codes import decode_deck
+from ..models.enums import PokemonType, StatusCondition
+from .compact import (BURN, CONFUSION, EMPTY, GRASS, MAX_TURNS, NONE, NUM_TYPES, PARALYSIS, POISON, SETUP_DONE,
+                      SLEEP, SLOTS, STATUS_INDEX, CompactState, tables_for)
+from .rng import GameRandom, stream_seed
+
+HAND_SIZE = 5
+NO_COST = 0x7FFF  # Cost of attacks Grass Energy cannot pay
+FLIP_CHUNK = 64  # Coin flips drawn per game at a time
+
+# Attack modifiers (run before damage)
+MOD_NONE, MOD_COIN_BONUS, MOD_COIN_OR_NOTHING, MOD_PER_HEADS = range(4)
+MODIFIER_CODES = {'coin_bonus': MOD_COIN_BONUS, 'coin_or_nothing': MOD_COIN_OR_NOTHING,
+                  'damage_per_heads': MOD_PER_HEADS}
+# Attack effects (run after damage)
+EFFECT_NONE, EFFECT_STATUS, EFFECT_COIN_STATUS, EFFECT_HEAL, EFFECT_SELF_DAMAGE = range(5)
+EFFECT_CODES = {'apply_status': EFFECT_STATUS, 'coin_status': EFFECT_COIN_STATUS, 'heal_self': EFFECT_HEAL,
+                'self_damage': EFFECT_SELF_DAMAGE}
+
+
+class BatchTables:
+    """Per-card NumPy tables of a catalog for BatchEngine, indexed by catalog index."""
+
+    def __init__(self, catalog: CardCatalog):
+        """Resolve the cards BatchEngine supports and the data of their attacks."""
+        tables = tables_for(catalog)
+        size = len(catalog)
+        attacks = max((len(card.attacks) for card in catalog.pokemon), default=1)
+        effects = 1
+        self.catalog = catalog
+        self.hp = np.array(tables.hp, np.int16)
+        self.ptype = np.array(tables.ptype, np.int8)
+        self.weakness = np.array(tables.weakness, np.int8)
+        self.points = np.array(tables.points, np.int16)
+        self.supported = np.zeros(size, bool)
+        self.cost = np.full((size, attacks), NO_COST, np.int16)
+        self.damage = np.zeros((size, attacks), np.int16)
+        self.modifier = np.zeros((size, attacks), np.int8)
+        self.modifier_params = np.zeros((size, attacks, 2), np.int16)
+        self.effect = np.zeros((size, attacks, effects), np.int8)
+        self.effect_params = np.zeros((size, attacks, effects), np.int16)
+        is_basic = catalog.evolution.is_basic
+        for idx, card in enumerate(catalog):
+            if not hasattr(card, 'create_card') or not is_basic(card) or card.ability is not None:
+                continue
+            compiled = [self._compile_attack(attack) for attack in card.attacks]
+            if None in compiled:
+                continue
+            self.supported[idx] = True
+            for a, (cost, damage, modifier, effect) in enumerate(compiled):
+                self.cost[idx, a] = cost
+                self.damage[idx, a] = damage
+                self.modifier[idx, a], self.modifier_params[idx, a] = modifier
+                self.effect[idx, a, 0], self.effect_params[idx, a, 0] = effect
+        # Cards that can attack with Grass Energy alone
+        self.playable = self.supported & (self.cost < NO_COST).any(axis=1)
+        # Cards with attacks that flip coins or have effects
+        self.special = (self.modifier != MOD_NONE).any(axis=1) | (self.effect != EFFECT_NONE).any(axis=(1, 2))
+
+    @staticmethod
+    def _compile_attack(attack) -> Optional[tuple]:
+        """(cost, damage, (modifier, params), (effect, param)) of an attack, None if it is not supported."""
+        spec = attack.effect.spec if attack.effect is not None and hasattr(attack.effect, 'spec') else ()
+        if attack.effect is not None and not hasattr(attack.effect, 'spec'):
+            return None
+        modifier, effect = (MOD_NONE, (0, 0)), (EFFECT_NONE, 0)
+        for key, params in spec:
+            if key in MODIFIER_CODES and modifier[0] == MOD_NONE:
+                modifier = (MODIFIER_CODES[key], (tuple(params) + (0, 0))[:2])
+            elif key in EFFECT_CODES and effect[0] == EFFECT_NONE:
+                code = EFFECT_CODES[key]
+                param = STATUS_INDEX[StatusCondition[params[0]]] if code in (EFFECT_STATUS, EFFECT_COIN_STATUS) \
+                    else params[0]
+                effect = (code, param)
+            else:
+                return None
+        typed = attack.cost.typed
+        payable = all(t is PokemonType.GRASS for t, _ in typed)
+        return (attack.cost.total if payable else NO_COST), attack.damage, modifier, effect
+
+    def sample_deck(self, rng: random.Random, cards: Optional['np.ndarray'] = None) -> Tuple[int, ...]:
+        """A random 20-card deck of two copies of 10 playable cards with different names.
+
+        cards optionally narrows the choice down to a mask of catalog indices.
+        """
+        by_name: Dict[str, List[int]] = {}
+        for idx in np.flatnonzero(self.playable if cards is None else self.playable & cards):
+            by_name.setdefault(self.catalog[int(idx)].name, []).append(int(idx))
+        names = rng.sample(sorted(by_name), 10)
+        return tuple(sorted(rng.choice(by_name[name]) for name in names for _ in range(2)))
+
+    def check_deck(self, deck: Sequence[int]) -> None:
+        """Raise ValueError unless every card of a deck is supported."""
+        for idx in deck:
+            if not 0 <= idx < len(self.supported) or not self.supported[idx]:
+                name = self.catalog[idx].name if 0 <= idx < len(self.supported) else idx
+                raise ValueError(f"Batch games only support Basic Pokemon with simple attacks, not {name}")
+
+
+_tables: Dict[int, BatchTables] = {}
+
+
+def batch_tables_for(catalog: CardCatalog) -> BatchTables:
+    """Get the (cached) BatchTables of a catalog."""
+    tables = _tables.get(id(catalog))
+    if tables is None or tables.catalog is not catalog:
+        tables = _tables[id(catalog)] = BatchTables(catalog)
+    return tables
+
+
+class BatchEngine:
+    """Plays K simple games at once with the GameEngine rules, one turn of each game per step().
+
+    Start the games with setup() (one deck pair shuffled per game) or
+    load() (given opening states, e.g. from GameEngine games), then call
+    step() or run(). Results are in winner, turn and player_points().
+    """
+
+    def __init__(self, catalog: Optional[CardCatalog] = None):
+        """Create an engine for a catalog (the default one if None)."""
+        if np is None:
+            raise ImportError("BatchEngine needs NumPy (pip install numpy)")
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self.tables = batch_tables_for(self.catalog)
+        self.games = 0
+
+    # ----- Setup -----
+
+    def setup(self, deck_a: Sequence[int], deck_b: Sequence[int], games: int, seed: Optional[int] = None) -> None:
+        """Start games of deck A (player 0) against deck B, each with its own shuffles, first player and coins."""
+        rng = np.random.default_rng(seed)
+        for deck in (deck_a, deck_b):
+            self.tables.check_deck(deck)
+        size = max(len(deck_a), len(deck_b))
+        cards = np.full((games, 2, size), EMPTY, np.int16)
+        lengths = np.zeros((games, 2), np.int16)
+        for p, deck in enumerate((deck_a, deck_b)):
+            order = np.argsort(rng.random((games, len(deck))), axis=1)
+            cards[:, p, :len(deck)] = np.asarray(deck, np.int16)[order]
+            lengths[:, p] = len(deck)
+        # Every card is a Basic, so the opening hand never needs a mulligan
+        hands = np.minimum(lengths, HAND_SIZE)
+        first = rng.integers(0, 2, games).astype(np.int8)
+        self._start(cards, hands, lengths, first, None, rng)
+
+    def load(self, states: Sequence[CompactState], flips: Optional['np.ndarray'] = None) -> None:
+        """Start games from compact states right after their opening hands were drawn.
+
+        flips optionally gives each game's coin flips in order (a boolean
+        array with a row per game); games then raise ValueError if they
+        need more. By default coins are flipped from a fresh random stream.
+        """
+        games = len(states)
+        size = max((len(state.hand[p]) + len(state.deck[p]) for state in states for p in (0, 1)), default=0)
+        cards = np.full((games, 2, size), EMPTY, np.int16)
+        hands = np.zeros((games, 2), np.int16)
+        lengths = np.zeros((games, 2), np.int16)
+        for k, state in enumerate(states):
+            if not state.setup_phase or any(state.card[s] != EMPTY for s in range(2 * SLOTS)):
+                raise ValueError("Batch games start from states before any setup action")
+            for p in (0, 1):
+                # The hand comes first, then the deck from the top (the end of its array)
+                order = list(state.hand[p]) + list(reversed(state.deck[p]))
+                self.tables.check_deck(order)
+                cards[k, p, :len(order)] = order
+                hands[k, p] = len(state.hand[p])
+                lengths[k, p] = len(order)
+        first = np.array([state.first_player for state in states], np.int8)
+        self._start(cards, hands, lengths, first, flips, None if flips is not None else np.random.default_rng())
+
+    def _start(self, cards: 'np.ndarray', hands: 'np.ndarray', lengths: 'np.ndarray', first: 'np.ndarray',
+               flips: Optional['np.ndarray'], rng) -> None:
+        """Set up games from each player's cards in draw order (the opening hand first) and play the setup."""
+        games = len(first)
+        self.games = games
+        self.first = first
+        self.steps = 0  # Turns played by the longest game, which is the turn of every running game
+        self.turn = np.zeros(games, np.int16)
+        self.over = np.zeros(games, bool)
+        self.winner = np.full(games, EMPTY, np.int8)
+        self._flip_rng = rng
+        self.flips = np.asarray(flips, bool) if flips is not None else rng.random((games, FLIP_CHUNK)) < 0.5
+        self.flip_pos = np.zeros(games, np.int32)
+        # Per side: the player to move first is side 0
+        swap = first == 1
+        cards, hands, lengths = (np.where(swap[:, None, None], arr[:, ::-1], arr) if arr.ndim == 3
+                                 else np.where(swap[:, None], arr[:, ::-1], arr) for arr in (cards, hands, lengths))
+        self.card = np.full((games, 2, SLOTS), EMPTY, np.int16)
+        self.hp = np.zeros((games, 2, SLOTS), np.int16)
+        self.energy = np.zeros((games, 2, SLOTS), np.int16)  # Grass Energy attached
+        self.status = np.zeros((games, 2, SLOTS), np.int8)
+        self.points = np.zeros((games, 2), np.int16)
+        self.tokens = np.zeros((games, 2), np.int16)
+        # A player's hand is cards[hand_lo:hand_hi] and the deck cards[hand_hi:length]: cards
+        # only ever join the end of the hand and leave from its front, as all are Basics
+        self.cards = cards
+        self.hand_lo = np.zeros((games, 2), np.int16)
+        self.hand_hi = hands.astype(np.int16)
+        self.length = lengths.astype(np.int16)
+        everyone = np.ones(games, bool)
+        for _ in (0, 1):
+            self._play_basics(everyone)
+            self._swap_sides()
+
+    # ----- Coin flips -----
+
+    def _flip(self, mask: 'np.ndarray') -> 'np.ndarray':
+        """Flip a coin in every game of mask; True where it came up heads."""
+        heads = np.zeros(self.games, bool)
+        rows = np.flatnonzero(mask)
+        if len(rows):
+            pos = self.flip_pos[rows]
+            while pos.max() >= self.flips.shape[1]:
+                if self._flip_rng is None:
+                    raise ValueError("A batch game ran out of coin flips")
+                self.flips = np.concatenate([self.flips, self._flip_rng.random((self.games, FLIP_CHUNK)) < 0.5],
+                                            axis=1)
+            heads[rows] = self.flips[rows, pos]
+            self.flip_pos[rows] = pos + 1
+        return heads
+
+    def _heads(self, mask: 'np.ndarray', coins: 'np.ndarray') -> 'np.ndarray':
+        """Flip coins[k] coins in every game k of mask and count the heads."""
+        heads = np.zeros(self.games, np.int16)
+        most = int(coins[mask].max()) if mask.any() else 0
+        for c in range(most):
+            heads += self._flip(mask & (coins > c))
+        return heads
+
+    # ----- Turn structure -----
+
+    def _swap_sides(self) -> None:
+        """Make the other player side 0."""
+        for name in ('card', 'hp', 'energy', 'status', 'points', 'tokens', 'cards', 'hand_lo', 'hand_hi', 'length'):
+            setattr(self, name, getattr(self, name)[:, ::-1])
+
+    def _play_basics(self, mask: 'np.ndarray') -> None:
+        """Put Basics from the front of side 0's hand into its empty slots, Active Spot first."""
+        card, lo = self.card[:, 0], self.hand_lo[:, 0]
+        occupied = (card != EMPTY).sum(axis=1)
+        count = np.minimum(SLOTS - occupied, self.hand_hi[:, 0] - lo) * mask
+        for j in range(SLOTS):
+            rows = np.flatnonzero(count > j)
+            if not len(rows):
+                break
+            played = self.cards[rows, 0, lo[rows] + j]
+            slots = occupied[rows] + j
+            card[rows, slots] = played
+            self.hp[rows, 0, slots] = self.tables.hp[played]
+        lo += count
+
+    def _draw(self, mask: 'np.ndarray') -> None:
+        """Side 0 draws a card in every game of mask where its deck is not empty."""
+        hi = self.hand_hi[:, 0]
+        hi += mask & (hi < self.length[:, 0])
+
+    def step(self) -> int:
+        """Play one turn of every running game; returns how many games played it."""
+        running = ~self.over
+        playing = int(running.sum())
+        if not playing:
+            return 0
+        tables = self.tables
+        card, hp, energy, status = self.card, self.hp, self.energy, self.status
+        self._play_basics(running)
+        energy[:, 0, 0] += self.tokens[:, 0] * running
+        self.tokens[:, 0] *= ~running
+
+        # Attack with the last attack the Active Pokemon can pay for
+        active = np.maximum(card[:, 0, 0], 0)
+        can_attack = running & (status[:, 0, 0] != SLEEP) & (status[:, 0, 0] != PARALYSIS)
+        payable = (tables.cost[active] <= energy[:, 0, 0, None]) & can_attack[:, None]
+        attacking = payable.any(axis=1)
+        attack = np.where(attacking, payable.shape[1] - 1 - np.argmax(payable[:, ::-1], axis=1), 0)
+        confused = attacking & (status[:, 0, 0] == CONFUSION)
+        if confused.any():
+            fails = self._flip(confused)  # Heads: the attack fails and the attacker takes 30
+            hp[:, 0, 0] -= 30 * fails
+            attacking &= ~fails
+        if attacking.any():
+            self._attack(attacking, active, attack)
+        self._resolve_knockouts(running)
+
+        # Pokemon Checkup of the player to move, then pass the turn
+        ending = running & ~self.over
+        active_status = np.where(ending, status[:, 0, 0], NONE)
+        asleep = active_status == SLEEP
+        if asleep.any():
+            status[:, 0, 0] = np.where(self._flip(asleep), NONE, status[:, 0, 0])
+        burned = active_status == BURN
+        if burned.any():
+            hp[:, 0, 0] -= 20 * burned
+            status[:, 0, 0] = np.where(self._flip(burned), NONE, status[:, 0, 0])
+        hp[:, 0, 0] -= 10 * (active_status == POISON)
+        status[:, 0, 0] = np.where(active_status == PARALYSIS, NONE, status[:, 0, 0])
+        self._resolve_knockouts(ending)
+
+        passing = ending & ~self.over
+        self.turn += passing
+        self.steps += 1
+        if self.steps >= MAX_TURNS:
+            self.over |= passing
+            passing[:] = False
+        self._swap_sides()
+        self._draw(passing)
+        self.tokens[:, 0] += passing
+        return playing
+
+    def _attack(self, attacking: 'np.ndarray', active: 'np.ndarray', attack: 'np.ndarray') -> None:
+        """Resolve the chosen attacks of side 0's Active Pokemon in the games of attacking."""
+        tables = self.tables
+        hp, status = self.hp, self.status
+        damage = tables.damage[active, attack] * attacking
+        modifier = np.where(attacking, tables.modifier[active, attack], MOD_NONE)
+        first, second = tables.modifier_params[active, attack].T
+        bonus = modifier == MOD_COIN_BONUS
+        if bonus.any():
+            damage += first * self._flip(bonus)
+        nothing = modifier == MOD_COIN_OR_NOTHING
+        if nothing.any():
+            damage *= ~(nothing & ~self._flip(nothing))
+        per_heads = modifier == MOD_PER_HEADS
+        if per_heads.any():
+            damage = np.where(per_heads, second * self._heads(per_heads, first), damage)
+        defender = np.maximum(self.card[:, 1, 0], 0)
+        damage += 20 * ((damage > 0) & (tables.weakness[defender] == tables.ptype[active]))
+        hp[:, 1, 0] -= damage
+        for e in range(tables.effect.shape[2]):
+            effect = np.where(attacking, tables.effect[active, attack, e], EFFECT_NONE)
+            param = tables.effect_params[active, attack, e]
+            inflict = effect == EFFECT_STATUS
+            coin = effect == EFFECT_COIN_STATUS
+            if coin.any():
+                inflict |= self._flip(coin)
+            status[:, 1, 0] = np.where(inflict, param, status[:, 1, 0])
+            heal = effect == EFFECT_HEAL
+            hp[:, 0, 0] = np.where(heal, np.maximum(hp[:, 0, 0], np.minimum(tables.hp[active], hp[:, 0, 0] + param)),
+                                   hp[:, 0, 0])
+            hp[:, 0, 0] -= param * (effect == EFFECT_SELF_DAMAGE)
+
+    def _resolve_knockouts(self, mask: 'np.ndarray') -> None:
+        """Score knocked out Pokemon, promote replacements and check for the end of the games in mask."""
+        card, hp = self.card, self.hp
+        out = (card != EMPTY) & (hp <= 0) & mask[:, None, None]
+        rows = np.flatnonzero(out.any(axis=(1, 2)))
+        if not len(rows):
+            return
+        out = out[rows]
+        scored = (self.tables.points[np.maximum(card[rows], 0)] * out).sum(axis=2)
+        self.points[rows] += scored[:, ::-1]
+        # Survivors move left in order: the Bench packs and its first Pokemon is promoted if needed
+        alive = (card[rows] != EMPTY) & ~out
+        order = np.argsort(~alive, axis=2, kind='stable')
+        kept = np.take_along_axis(alive, order, axis=2)
+        for arr, empty in ((card, EMPTY), (hp, 0), (self.energy, 0), (self.status, NONE)):
+            arr[rows] = np.where(kept, np.take_along_axis(arr[rows], order, axis=2), empty)
+
+        scores = self.points[rows] >= 3
+        no_pokemon = card[rows, :, 0] == EMPTY
+        ended = scores.any(axis=1) | no_pokemon.any(axis=1)
+        wins = scores | (no_pokemon[:, ::-1] & ~no_pokemon)
+        side = np.where(wins[:, 0] & ~wins[:, 1], 0, np.where(wins[:, 1] & ~wins[:, 0], 1, EMPTY))
+        player = np.where(side == EMPTY, EMPTY, side ^ self._side0_player()[rows])
+        self.over[rows] |= ended
+        self.winner[rows] = np.where(ended, player, self.winner[rows])
+
+    def _side0_player(self) -> 'np.ndarray':
+        """Player index of side 0 in every game."""
+        return (self.first + (self.steps & 1)) & 1
+
+    # ----- Running and results -----
+
+    def run(self) -> int:
+        """Play every game to the end; returns the number of turns played."""
+        turns = 0
+        while True:
+            played = self.step()
+            if not played:
+                return turns
+            turns += played
+
+    def player_points(self) -> 'np.ndarray':
+        """Points of player 0 and player 1 in every game."""
+        return np.where(self._side0_player()[:, None] == 0, self.points, self.points[:, ::-1])
+
+    def game_state(self, k: int) -> CompactState:
+        """Game k as a CompactState (discard piles, turn played and ability flags are not tracked)."""
+        state = CompactState()
+        side0 = int(self._side0_player()[k])
+        for side in (0, 1):
+            p = side ^ side0
+            for s in range(SLOTS):
+                i = p * SLOTS + s
+                state.card[i] = int(self.card[k, side, s])
+                state.hp[i] = int(self.hp[k, side, s])
+                state.status[i] = int(self.status[k, side, s])
+                state.energy[i * NUM_TYPES + GRASS] = int(self.energy[k, side, s])
+            cards = self.cards[k, side]
+            lo, hi, length = int(self.hand_lo[k, side]), int(self.hand_hi[k, side]), int(self.length[k, side])
+            state.hand[p].extend(int(idx) for idx in cards[lo:hi])
+            state.deck[p].extend(int(idx) for idx in cards[hi:length][::-1])
+            state.points[p] = int(self.points[k, side])
+            state.tokens[p] = int(self.tokens[k, side])
+            state.player_flags[p] = SETUP_DONE
+        state.turn = int(self.turn[k])
+        state.first_player = int(self.first[k])
+        state.setup_phase = False
+        state.game_over = bool(self.over[k])
+        state.winner = int(self.winner[k])
+        return state
+
+
+# ----- Consistency with GameEngine -----
+
+CHECK_FLIPS = 1024  # Coin flips pre-drawn per checked game
+
+
+def check_consistency(games: int = 200, seed: int = 0, decks: Optional[Sequence[Sequence[int]]] = None,
+                      catalog: Optional[CardCatalog] = None) -> List[str]:
+    """Play games on GameEngine and BatchEngine in lockstep and list every difference (empty if none).
+
+    Game i plays on the GameEngine stream stream_seed(seed, i) with the
+    'attacker' policy; the batch copy gets the same opening state and coin
+    flips. Both are compared after the setup and after every turn. decks
+    defaults to random playable decks, drawn anew for every game; every
+    other game only uses cards with coin flips or effects.
+    """
+    from ..sim.policies import get_policy  # The simulation package builds on this one
+    from .engine import GameEngine
+    from .player import Player
+
+    catalog = catalog if catalog is not None else get_catalog()
+    tables = batch_tables_for(catalog)
+    policy = get_policy('attacker')
+    no_rng = GameRandom(0)  # The policy makes no random choices
+    engines, states = [], []
+    flips = np.zeros((games, CHECK_FLIPS), bool)
+    for i in range(games):
+        pool = tables.special if i % 2 else None
+        game_decks = decks or [tables.sample_deck(GameRandom(stream_seed(seed, -1 - 2 * i - p)), pool)
+                               for p in (0, 1)]
+        game = GameEngine(Player("A"), Player("B"), catalog, seed=stream_seed(seed, i))
+        game.setup_game(game_decks)
+        states.append(CompactState.from_game(game))
+        coins = game.rng.copy()
+        flips[i] = [coins.flip() for _ in range(CHECK_FLIPS)]
+        engines.append(game)
+    batch = BatchEngine(catalog)
+    batch.load(states, flips)
+
+    problems: List[str] = []
+    for game in engines:
+        while game.setup_phase:
+            game.apply(policy(game, game.legal_actions(), no_rng), validate=False)
+    _compare(batch, engines, "setup", problems)
+    while batch.step():
+        for game in engines:
+            turn = game.turn
+            while not game.is_terminal() and game.turn == turn:
+                game.apply(policy(game, game.legal_actions(), no_rng), validate=False)
+        _compare(batch, engines, f"turn {batch.steps}", problems)
+        if problems:
+            break
+    return problems
+
+
+def _compare(batch: BatchEngine, engines: Sequence, when: str, problems: List[str]) -> None:
+    """Record the differences between each GameEngine and its batch copy."""
+    for k, game in enumerate(engines):
+        expected, actual = CompactState.from_game(game), batch.game_state(k)
+        for name in ('card', 'hp', 'status', 'energy', 'points', 'tokens', 'hand', 'deck', 'turn', 'game_over',
+                     'winner'):
+            if getattr(expected, name) != getattr(actual, name):
+                problems.append(f"game {k}, after {when}: {name} is {getattr(actual, name)}, "
+                                f"expected {getattr(expected, name)}")
+
+
+def _parse_deck(text: str, tables: BatchTables, seed: int, index: int) -> Tuple[int, ...]:
+    if text == 'random':  # Negative stream indices never collide with the games' streams
+        return tables.sample_deck(GameRandom(stream_seed(seed, -1 - index)))
+    return decode_deck(text, len(tables.catalog))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Play many simple games at once with NumPy, or check the batch "
+                                                 "engine against GameEngine.")
+    parser.add_argument('deck_a', nargs='?', default='random', help="deck code of deck A, or 'random'")
+    parser.add_argument('deck_b', nargs='?', default='random', help="deck code of deck B, or 'random'")
+    parser.add_argument('--games', type=int, default=10000, help="number of games")
+    parser.add_argument('--seed', type=int, default=0, help="master seed")
+    parser.add_argument('--check', type=int, metavar='N',
+                        help="instead, play N games in lockstep with GameEngine and report differences")
+    args = parser.parse_args(argv)
+
+    if args.check is not None:
+        start = time.perf_counter()
+        problems = check_consistency(args.check, args.seed)
+        for problem in problems[:20]:
+            print(problem)
+        print(f"{args.check} games checked in {time.perf_counter() - start:.1f} s: "
+              f"{len(problems)} difference(s)")
+        return 1 if problems else 0
+
+    engine = BatchEngine()
+    try:
+        decks = [_parse_deck(text, engine.tables, args.seed, i) for i, text in enumerate((args.deck_a, args.deck_b))]
+        engine.setup(decks[0], decks[1], args.games, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    start = time.perf_counter()
+    turns = engine.run()
+    seconds = time.perf_counter() - start
+    winner = engine.winner
+    print(f"{args.games} games: A wins {(winner == 0).sum()}, B wins {(winner == 1).sum()}, "
+          f"draws {(winner == EMPTY).sum()}, average turns {engine.turn.mean():.1f}")
+    print(f"{turns} turns in {seconds:.2f} s, {turns / seconds * 60 / 1e6:.1f} million turns per minute")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
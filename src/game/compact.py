@@ -0,0 +1,1193 @@
+"""
+Compact struct-of-arrays game state and an engine that plays on it directly.
+
+GameEngine keeps a game as a graph of Player and PokemonCard objects. For
+search and bulk simulation, CompactState holds the same game in a handful of
+flat integer arrays instead:
+
+- 4 fixed board slots per player (slot 0 is the Active Spot, 1-3 the Bench,
+  packed from the left), with per-slot catalog index (-1 when empty), HP,
+  status, turn played and flags;
+- a fixed-size energy count vector per slot, indexed by PokemonType order;
+- deck, hand and discard pile as small arrays of catalog indices (the top of
+  the deck is the end of its array);
+- a few per-player and global counters.
+
+CompactEngine implements the rules of GameEngine against that state, with the
+same Action interface (legal_actions / apply / is_terminal). Attack effects
+and abilities run through native versions of the effect primitives, resolved
+once per catalog in CardTables. Decks are Pokemon only (the catalog has no
+trainer cards yet) and no events are emitted. The engine maintains a
+Zobrist hash of its state incrementally, for transposition tables.
+"""
+import random
+import struct
+import sys
+from array import array
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..cards.catalog import CardCatalog, get_catalog
+from ..cards.effects import PRIMITIVES
+from ..models.cards import PokemonCard
+from ..models.enums import PokemonType, StatusCondition
+from .actions import ACTIVE, END_SETUP, END_TURN, Action, ActionType
+from .rng import GameRandom
+
+TYPES = tuple(PokemonType)
+TYPE_INDEX = {t: i for i, t in enumerate(TYPES)}
+NUM_TYPES = len(TYPES)
+GRASS = TYPE_INDEX[PokemonType.GRASS]
+COLORLESS = TYPE_INDEX[PokemonType.NORMAL]
+
+STATUSES = tuple(StatusCondition)
+STATUS_INDEX = {s: i for i, s in enumerate(STATUSES)}
+NONE = STATUS_INDEX[StatusCondition.NONE]
+POISON = STATUS_INDEX[StatusCondition.POISON]
+BURN = STATUS_INDEX[StatusCondition.BURN]
+SLEEP = STATUS_INDEX[StatusCondition.SLEEP]
+PARALYSIS = STATUS_INDEX[StatusCondition.PARALYSIS]
+CONFUSION = STATUS_INDEX[StatusCondition.CONFUSION]
+
+SLOTS = 4  # Active + 3 Bench per player
+BENCH_SIZE = SLOTS - 1
+EMPTY = -1
+MAX_TURNS = 200  # Same draw rule as GameEngine
+ENGINE_VERSION = 2  # Bump when a rule or policy change can change game results (keys cached results)
+
+# Slot flags
+EVOLVED = 1
+ABILITY_USED = 2
+# Player flags
+SUPPORTER_USED = 1
+RETREATED = 2
+SETUP_DONE = 4
+
+# Binary snapshots (CompactState.to_bytes)
+SNAPSHOT_MAGIC = b'PTCS'
+SNAPSHOT_VERSION = 1
+# magic, version, turn, first player, setup phase, game over, winner, then the 6 zone lengths
+_SNAPSHOT_HEADER = struct.Struct('<4sBHBBBb6H')
+_SNAPSHOT_ARRAYS = ('card', 'hp', 'status', 'turn_played', 'flags', 'energy', 'points', 'tokens', 'player_flags')
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+# Undo journal entry kinds
+_SET, _FIELD, _PUSH, _TAKE = range(4)
+
+
+class CompactAttack(NamedTuple):
+    """An attack resolved for the compact engine."""
+    name: str
+    damage: int
+    typed_cost: Tuple[Tuple[int, int], ...]  # (type index, count) of the non-Colorless cost
+    total_cost: int
+    modifiers: tuple  # (fn, params) run before damage
+    effects: tuple  # (fn, params) run after damage
+
+
+class CompactAbility(NamedTuple):
+    """An activatable ability resolved for the compact engine."""
+    name: str
+    fn: Callable
+    params: tuple
+
+
+class CardTables:
+    """Static per-card tables of a catalog, indexed by catalog index."""
+
+    def __init__(self, catalog: CardCatalog):
+        """Resolve the gameplay data of every catalog card."""
+        self.catalog = catalog
+        size = len(catalog)
+        self.name: List[str] = [''] * size
+        self.hp: List[int] = [0] * size
+        self.ptype: List[int] = [COLORLESS] * size
+        self.weakness: List[int] = [EMPTY] * size
+        self.retreat: List[int] = [0] * size
+        self.points: List[int] = [1] * size
+        self.basic: List[bool] = [False] * size
+        self.species: List[int] = [EMPTY] * size
+        self.parent: List[int] = [EMPTY] * size  # Species evolved from, -1 for Basics
+        self.attacks: List[Tuple[CompactAttack, ...]] = [()] * size
+        self.ability: List[Optional[CompactAbility]] = [None] * size
+        self.zobrist = ZobristKeys(size)
+        species_ids: Dict[str, int] = {}
+        evolution = catalog.evolution
+        for idx, card in enumerate(catalog):
+            if not hasattr(card, 'create_card'):
+                continue
+            self.name[idx] = card.name
+            self.hp[idx] = card.hp
+            self.ptype[idx] = TYPE_INDEX[card.pokemon_type]
+            self.weakness[idx] = TYPE_INDEX[card.weakness] if card.weakness else EMPTY
+            self.retreat[idx] = card.retreat_cost
+            self.points[idx] = 2 if card.is_ex else 1
+            parent = evolution.parent_of_card(card)
+            self.basic[idx] = parent is None
+            self.species[idx] = species_ids.setdefault(card.name, len(species_ids))
+            if parent is not None:
+                self.parent[idx] = species_ids.setdefault(parent, len(species_ids))
+            self.attacks[idx] = tuple(self._compile_attack(attack) for attack in card.attacks)
+            ability = card.ability
+            if ability is not None and ability.activatable:
+                self.ability[idx] = CompactAbility(ability.name, ABILITY_HANDLERS[ability.effect.key],
+                                                   ability.effect.params)
+
+    @staticmethod
+    def _compile_attack(attack) -> CompactAttack:
+        spec = attack.effect.spec if attack.effect is not None and hasattr(attack.effect, 'spec') else ()
+        modifiers = tuple((EFFECTS[key], params) for key, params in spec if PRIMITIVES[key].modifies_damage)
+        effects = tuple((EFFECTS[key], params) for key, params in spec if not PRIMITIVES[key].modifies_damage)
+        typed = tuple((TYPE_INDEX[t], n) for t, n in attack.cost.typed)
+        return CompactAttack(attack.name, attack.damage, typed, attack.cost.total, modifiers, effects)
+
+
+_tables: Dict[int, CardTables] = {}
+
+
+def tables_for(catalog: CardCatalog) -> CardTables:
+    """Get the (cached) CardTables of a catalog."""
+    tables = _tables.get(id(catalog))
+    if tables is None or tables.catalog is not catalog:
+        tables = _tables[id(catalog)] = CardTables(catalog)
+    return tables
+
+
+M64 = (1 << 64) - 1
+ZOBRIST_SEED = 0x5EED_C0DE  # Fixed, so hashes agree across processes
+
+
+class ZobristKeys:
+    """Random 64-bit keys for hashing the compact states of one catalog.
+
+    A state's hash is the sum (mod 2**64) of one key per (field, index,
+    value): every slot field and energy count, the points, tokens, flags
+    and scalar fields, and one key per card in each player's deck, hand and
+    discard pile. Zones hash as multisets: the deck order is hidden
+    information. Sums rather than XOR let a zone hold several copies of a
+    card. Values outside a field's range wrap around its key table.
+    """
+
+    def __init__(self, catalog_size: int, seed: int = ZOBRIST_SEED):
+        """Draw the key tables."""
+        rng = random.Random(seed)
+        card_bits = (catalog_size + 1).bit_length()
+        specs = (
+            # name, length, value bits, value offset
+            ('card', 2 * SLOTS, card_bits, 1),
+            ('hp', 2 * SLOTS, 11, 1024),
+            ('status', 2 * SLOTS, 3, 0),
+            ('turn_played', 2 * SLOTS, 8, 1),
+            ('flags', 2 * SLOTS, 2, 0),
+            ('energy', 2 * SLOTS * NUM_TYPES, 8, 0),
+            ('points', 2, 4, 0),
+            ('tokens', 2, 8, 0),
+            ('player_flags', 2, 3, 0),
+            ('deck', 2, card_bits, 0),
+            ('hand', 2, card_bits, 0),
+            ('discard', 2, card_bits, 0),
+            ('turn', 1, 8, 0),
+            ('first_player', 1, 1, 0),
+            ('setup_phase', 1, 1, 0),
+            ('game_over', 1, 1, 0),
+            ('winner', 1, 2, 1),
+        )
+        # name -> (keys, value bits, value offset, value mask)
+        self.fields: Dict[str, Tuple[List[int], int, int, int]] = {
+            name: ([rng.getrandbits(64) for _ in range(length << bits)], bits, offset, (1 << bits) - 1)
+            for name, length, bits, offset in specs}
+
+    def key(self, name: str, i: int, value: int) -> int:
+        """Key of value at index i of a field (for zones, i is the player and value the card)."""
+        keys, bits, offset, mask = self.fields[name]
+        return keys[(i << bits) | ((value + offset) & mask)]
+
+    def state_hash(self, state: 'CompactState') -> int:
+        """Hash a whole state from scratch."""
+        key = self.key
+        h = 0
+        for name in ('card', 'hp', 'status', 'turn_played', 'flags', 'energy', 'points', 'tokens', 'player_flags'):
+            for i, value in enumerate(getattr(state, name)):
+                h += key(name, i, value)
+        for name in ('deck', 'hand', 'discard'):
+            for p, zone in enumerate(getattr(state, name)):
+                for idx in zone:
+                    h += key(name, p, idx)
+        for name in ('turn', 'first_player', 'setup_phase', 'game_over', 'winner'):
+            h += key(name, 0, int(getattr(state, name)))
+        return h & M64
+
+
+class CompactState:
+    """The whole mutable state of a game as flat integer arrays.
+
+    Slot arrays are indexed by player * SLOTS + slot; the energy vector of a
+    slot starts at (player * SLOTS + slot) * NUM_TYPES.
+    """
+
+    __slots__ = ('card', 'hp', 'status', 'turn_played', 'flags', 'energy',
+                 'deck', 'hand', 'discard', 'points', 'tokens', 'player_flags',
+                 'turn', 'first_player', 'setup_phase', 'game_over', 'winner', 'hash')
+
+    def __init__(self):
+        """Create an empty state (no cards anywhere, setup not started)."""
+        self.card = array('h', [EMPTY] * (2 * SLOTS))
+        self.hp = array('h', [0] * (2 * SLOTS))
+        self.status = array('b', [NONE] * (2 * SLOTS))
+        self.turn_played = array('h', [-1] * (2 * SLOTS))
+        self.flags = array('b', [0] * (2 * SLOTS))
+        self.energy = array('B', [0] * (2 * SLOTS * NUM_TYPES))
+        self.deck = [array('h'), array('h')]
+        self.hand = [array('h'), array('h')]
+        self.discard = [array('h'), array('h')]
+        self.points = array('b', [0, 0])
+        self.tokens = array('b', [0, 0])  # Energy waiting in the Energy Zone
+        self.player_flags = array('b', [0, 0])
+        self.turn = 0
+        self.first_player = 0
+        self.setup_phase = True
+        self.game_over = False
+        self.winner = EMPTY
+        self.hash = 0  # Zobrist hash, kept current by CompactEngine
+
+    def bench_count(self, player: int) -> int:
+        """Number of Pokemon on a player's Bench."""
+        card = self.card
+        base = player * SLOTS
+        return (card[base + 1] >= 0) + (card[base + 2] >= 0) + (card[base + 3] >= 0)
+
+    def total_energy(self, slot: int) -> int:
+        """Energy attached to a slot (flat slot index)."""
+        start = slot * NUM_TYPES
+        return sum(self.energy[start:start + NUM_TYPES])
+
+    def clone(self) -> 'CompactState':
+        """Copy the state: a few hundred bytes of arrays, no card objects."""
+        state = CompactState.__new__(CompactState)
+        state.card = self.card[:]
+        state.hp = self.hp[:]
+        state.status = self.status[:]
+        state.turn_played = self.turn_played[:]
+        state.flags = self.flags[:]
+        state.energy = self.energy[:]
+        state.deck = [self.deck[0][:], self.deck[1][:]]
+        state.hand = [self.hand[0][:], self.hand[1][:]]
+        state.discard = [self.discard[0][:], self.discard[1][:]]
+        state.points = self.points[:]
+        state.tokens = self.tokens[:]
+        state.player_flags = self.player_flags[:]
+        state.turn = self.turn
+        state.first_player = self.first_player
+        state.setup_phase = self.setup_phase
+        state.game_over = self.game_over
+        state.winner = self.winner
+        state.hash = self.hash
+        return state
+
+    def to_bytes(self) -> bytes:
+        """Serialize the state in the versioned snapshot format (about 250 bytes).
+
+        A fixed header with the scalar fields and zone lengths is followed by
+        the slot and player arrays and the zones, all little-endian; cards are
+        catalog indices, so a snapshot is only meaningful with the catalog it
+        was made with. The hash is not stored.
+        """
+        zones = (self.deck[0], self.deck[1], self.hand[0], self.hand[1], self.discard[0], self.discard[1])
+        arrays = [getattr(self, name) for name in _SNAPSHOT_ARRAYS] + list(zones)
+        if _BIG_ENDIAN:
+            arrays = [arr[:] for arr in arrays]
+            for arr in arrays:
+                arr.byteswap()
+        header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.turn, self.first_player,
+                                       self.setup_phase, self.game_over, self.winner, *map(len, zones))
+        return b''.join([header] + [arr.tobytes() for arr in arrays])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompactState':
+        """Read a state written by to_bytes(). Raises ValueError for malformed or unknown-version data.
+
+        The hash is left at 0; CompactEngine rehashes states it loads.
+        """
+        view = memoryview(data)
+        try:
+            magic, version, turn, first_player, setup_phase, game_over, winner, *lengths = \
+                _SNAPSHOT_HEADER.unpack_from(view)
+        except struct.error as e:
+            raise ValueError("Truncated game state snapshot") from e
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a game state snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported game state snapshot version: {version}")
+        template = _TEMPLATE
+        if len(view) != _SNAPSHOT_HEADER.size + _SNAPSHOT_FIXED_SIZE + 2 * sum(lengths):
+            raise ValueError("Game state snapshot has the wrong size")
+        arrays = []
+        offset = _SNAPSHOT_HEADER.size
+        for name in _SNAPSHOT_ARRAYS:
+            arr = array(getattr(template, name).typecode)
+            end = offset + len(getattr(template, name)) * arr.itemsize
+            arr.frombytes(view[offset:end])
+            arrays.append(arr)
+            offset = end
+        for length in lengths:
+            arr = array('h')
+            end = offset + 2 * length
+            arr.frombytes(view[offset:end])
+            arrays.append(arr)
+            offset = end
+        if _BIG_ENDIAN:
+            for arr in arrays:
+                arr.byteswap()
+        state = cls.__new__(cls)
+        (state.card, state.hp, state.status, state.turn_played, state.flags, state.energy, state.points,
+         state.tokens, state.player_flags, deck0, deck1, hand0, hand1, discard0, discard1) = arrays
+        state.deck = [deck0, deck1]
+        state.hand = [hand0, hand1]
+        state.discard = [discard0, discard1]
+        state.turn = turn
+        state.first_player = first_player
+        state.setup_phase = bool(setup_phase)
+        state.game_over = bool(game_over)
+        state.winner = winner
+        state.hash = 0
+        return state
+
+    def key(self) -> bytes:
+        """Byte string of the full state, equal for equal states."""
+        return b''.join([self.card.tobytes(), self.hp.tobytes(), self.status.tobytes(), self.turn_played.tobytes(),
+                         self.flags.tobytes(), self.energy.tobytes(), self.points.tobytes(), self.tokens.tobytes(),
+                         self.player_flags.tobytes(),
+                         bytes([self.turn & 0xFF, self.turn >> 8, self.first_player, self.setup_phase,
+                                self.game_over, self.winner & 0xFF])]
+                        + [bytes([len(zone)]) + zone.tobytes() for zones in (self.deck, self.hand, self.discard) for zone in zones])
+
+    def observation(self, player: int) -> bytes:
+        """Byte string of what player can see: like key(), without the deck contents and the opponent's hand."""
+        opponent = 1 - player
+        return b''.join([self.card.tobytes(), self.hp.tobytes(), self.status.tobytes(), self.turn_played.tobytes(),
+                         self.flags.tobytes(), self.energy.tobytes(), self.points.tobytes(), self.tokens.tobytes(),
+                         self.player_flags.tobytes(),
+                         bytes([self.turn & 0xFF, self.turn >> 8, self.first_player, self.setup_phase,
+                                self.game_over, self.winner & 0xFF, len(self.deck[0]), len(self.deck[1]),
+                                len(self.hand[opponent]), len(self.hand[player])]),
+                         self.hand[player].tobytes(), bytes([len(self.discard[0])]), self.discard[0].tobytes(),
+                         self.discard[1].tobytes()])
+
+    @classmethod
+    def from_game(cls, game) -> 'CompactState':
+        """Convert a GameEngine's state. Every card must be a Pokemon of the engine's catalog."""
+        catalog = game.catalog
+        state = cls()
+
+        def index(card) -> int:
+            if not isinstance(card, PokemonCard):
+                raise ValueError(f"Compact states only hold Pokemon, not {card.name}")
+            return catalog.index_of(card.definition)
+
+        for p, player in enumerate(game.players):
+            for s, poke in enumerate([player.active] + player.bench):
+                if poke is None:
+                    continue
+                i = p * SLOTS + s
+                state.card[i] = index(poke)
+                state.hp[i] = poke.hp
+                state.status[i] = STATUS_INDEX[poke.status]
+                state.turn_played[i] = poke.turn_played
+                state.flags[i] = (EVOLVED if poke.evolved_this_turn else 0) | (ABILITY_USED if poke.ability_used else 0)
+                for t, n in poke.attached_energy.items():
+                    state.energy[i * NUM_TYPES + TYPE_INDEX[t]] = n
+            state.deck[p] = array('h', [index(card) for card in player.deck])
+            state.hand[p] = array('h', [index(card) for card in player.hand])
+            state.discard[p] = array('h', [index(card) for card in player.discard_pile])
+            state.points[p] = player.points
+            state.tokens[p] = player.energy
+            state.player_flags[p] = ((SUPPORTER_USED if player.supporter_used else 0)
+                                     | (RETREATED if player.retreated_this_turn else 0)
+                                     | (SETUP_DONE if game.setup_complete[p] else 0))
+        state.turn = game.turn
+        state.first_player = game.first_player
+        state.setup_phase = game.setup_phase
+        state.game_over = game.game_over
+        state.winner = EMPTY if game.winner is None else game.winner
+        return state
+
+
+_TEMPLATE = CompactState()  # Array types and sizes for from_bytes
+_SNAPSHOT_FIXED_SIZE = sum(len(arr) * arr.itemsize for arr in (getattr(_TEMPLATE, name) for name in _SNAPSHOT_ARRAYS))
+
+
+class CompactEngine:
+    """Plays games on a CompactState with the GameEngine rules and Action interface.
+
+    Besides apply(), actions can be made with make() and taken back with
+    unmake(): while a move is being made every write to the state is logged
+    in an undo journal, so unmaking costs O(changes) instead of a copy of the
+    whole state. The RNG is not rewound.
+
+    The same write helpers keep state.hash, the Zobrist hash of the state
+    (see ZobristKeys), up to date in O(1) per write, for transposition
+    tables. To switch the engine to another state, use load_state(), which
+    hashes the new state from scratch.
+    """
+
+    def __init__(self, catalog: Optional[CardCatalog] = None, rng: Optional[GameRandom] = None,
+                 state: Optional[CompactState] = None):
+        """Create an engine, optionally on an existing state."""
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self.tables = tables_for(self.catalog)
+        self.rng = rng if rng is not None else GameRandom()
+        self.journal: Optional[list] = None  # Undo entries while making moves
+        self._marks: List[Tuple[int, int]] = []  # (journal length, hash) per made move
+        self.load_state(state if state is not None else CompactState())
+
+    def load_state(self, state: CompactState, rehash: bool = True) -> None:
+        """Play on a state from now on, hashing it unless its hash is known to be current."""
+        self.state = state
+        self.journal = None
+        self._marks = []
+        fields = self.tables.zobrist.fields
+        # id(array) -> (keys, value bits, value offset, value mask, player or None for slot arrays)
+        specs: Dict[int, tuple] = {}
+        for name in ('card', 'hp', 'status', 'turn_played', 'flags', 'energy', 'points', 'tokens', 'player_flags'):
+            specs[id(getattr(state, name))] = fields[name] + (None,)
+        for name in ('deck', 'hand', 'discard'):
+            for p, zone in enumerate(getattr(state, name)):
+                specs[id(zone)] = fields[name] + (p,)
+        self._hash_specs = specs
+        if rehash:
+            state.hash = self.tables.zobrist.state_hash(state)
+
+    def clone(self) -> 'CompactEngine':
+        """Copy the engine with a copy of its state, sharing the card tables and RNG."""
+        engine = CompactEngine.__new__(CompactEngine)
+        engine.catalog = self.catalog
+        engine.tables = self.tables
+        engine.rng = self.rng
+        engine.load_state(self.state.clone(), rehash=False)
+        return engine
+
+    # ----- Setup -----
+
+    def setup(self, decks: Sequence[Sequence[int]], first_player: Optional[int] = None) -> None:
+        """Shuffle both decks of catalog indices, draw opening hands and start the setup phase."""
+        state = CompactState()
+        rng = self.rng
+        if first_player is None:
+            first_player = 0 if rng.flip() else 1
+        state.first_player = first_player
+        basic = self.tables.basic
+        for p, deck in enumerate(decks):
+            cards = list(deck)
+            rng.shuffle(cards)
+            # Mulligan until the opening hand holds a Basic
+            while True:
+                hand, rest = cards[:5], cards[5:]
+                if any(basic[idx] for idx in hand) or not any(basic[idx] for idx in cards):
+                    break
+                rng.shuffle(cards)
+            state.hand[p] = array('h', hand)
+            state.deck[p] = array('h', reversed(rest))
+        self.load_state(state)
+
+    # ----- State writes -----
+    # All rule code changes the state through these, so make() can journal
+    # them and the hash follows every change.
+
+    def set(self, arr: array, i: int, value: int) -> None:
+        """Set arr[i], journaling the old value while making a move."""
+        old = arr[i]
+        if old == value:
+            return
+        journal = self.journal
+        if journal is not None:
+            journal.append((_SET, arr, i, old))
+        arr[i] = value
+        keys, bits, offset, mask, _ = self._hash_specs[id(arr)]
+        state = self.state
+        state.hash = (state.hash + keys[(i << bits) | ((value + offset) & mask)]
+                      - keys[(i << bits) | ((old + offset) & mask)]) & M64
+
+    def add(self, arr: array, i: int, delta: int) -> None:
+        """Add delta to arr[i], journaling the old value while making a move."""
+        if not delta:
+            return
+        old = arr[i]
+        value = old + delta
+        journal = self.journal
+        if journal is not None:
+            journal.append((_SET, arr, i, old))
+        arr[i] = value
+        keys, bits, offset, mask, _ = self._hash_specs[id(arr)]
+        state = self.state
+        state.hash = (state.hash + keys[(i << bits) | ((value + offset) & mask)]
+                      - keys[(i << bits) | ((old + offset) & mask)]) & M64
+
+    def set_field(self, name: str, value) -> None:
+        """Set a scalar field of the state (turn, game_over, ...)."""
+        state = self.state
+        old = getattr(state, name)
+        journal = self.journal
+        if journal is not None:
+            journal.append((_FIELD, name, old))
+        setattr(state, name, value)
+        keys, _, offset, mask = self.tables.zobrist.fields[name]
+        state.hash = (state.hash + keys[(value + offset) & mask] - keys[(old + offset) & mask]) & M64
+
+    def push(self, zone: array, idx: int) -> None:
+        """Append a card to a zone."""
+        journal = self.journal
+        if journal is not None:
+            journal.append((_PUSH, zone))
+        zone.append(idx)
+        keys, bits, offset, mask, p = self._hash_specs[id(zone)]
+        state = self.state
+        state.hash = (state.hash + keys[(p << bits) | ((idx + offset) & mask)]) & M64
+
+    def take(self, zone: array, i: int = -1) -> int:
+        """Remove and return the card at position i of a zone."""
+        if i < 0:
+            i += len(zone)
+        idx = zone.pop(i)
+        journal = self.journal
+        if journal is not None:
+            journal.append((_TAKE, zone, i, idx))
+        keys, bits, offset, mask, p = self._hash_specs[id(zone)]
+        state = self.state
+        state.hash = (state.hash - keys[(p << bits) | ((idx + offset) & mask)]) & M64
+        return idx
+
+    # ----- Make / unmake -----
+
+    def make(self, action: Action) -> None:
+        """Apply an action (without validation) so that unmake() can revert it."""
+        if self.journal is None:
+            self.journal = []
+        self._marks.append((len(self.journal), self.state.hash))
+        self.apply(action, validate=False)
+
+    def unmake(self) -> None:
+        """Revert the most recent make() that is not reverted yet."""
+        journal = self.journal
+        mark, state_hash = self._marks.pop()
+        state = self.state
+        while len(journal) > mark:
+            entry = journal.pop()
+            kind = entry[0]
+            if kind == _SET:
+                entry[1][entry[2]] = entry[3]
+            elif kind == _TAKE:
+                entry[1].insert(entry[2], entry[3])
+            elif kind == _PUSH:
+                entry[1].pop()
+            else:
+                setattr(state, entry[1], entry[2])
+        state.hash = state_hash
+        if not self._marks:
+            self.journal = None
+
+    # ----- Queries -----
+
+    @property
+    def acting_player(self) -> int:
+        """Index of the player whose action is expected next."""
+        state = self.state
+        if state.setup_phase:
+            return 0 if not state.player_flags[0] & SETUP_DONE else 1
+        return (state.turn + state.first_player) % 2
+
+    @property
+    def current_player(self) -> int:
+        """Index of the player whose turn it is."""
+        return (self.state.turn + self.state.first_player) % 2
+
+    @property
+    def winner(self) -> Optional[int]:
+        """Index of the winner, None while playing or on a draw."""
+        return None if self.state.winner == EMPTY else self.state.winner
+
+    def is_terminal(self) -> bool:
+        """Check if the game has ended."""
+        return self.state.game_over
+
+    def can_pay(self, slot: int, attack: CompactAttack) -> bool:
+        """Check if the energy of a slot pays an attack cost."""
+        energy = self.state.energy
+        start = slot * NUM_TYPES
+        for t, n in attack.typed_cost:
+            if energy[start + t] < n:
+                return False
+        return sum(energy[start:start + NUM_TYPES]) >= attack.total_cost
+
+    def legal_actions(self) -> List[Action]:
+        """List every action the acting player can take now, in GameEngine order."""
+        state = self.state
+        if state.game_over:
+            return []
+        p = self.acting_player
+        tables = self.tables
+        basic = tables.basic
+        hand = state.hand[p]
+        card = state.card
+        base = p * SLOTS
+        bench = state.bench_count(p)
+        basics = [i for i, idx in enumerate(hand) if basic[idx]]
+        if state.setup_phase:
+            if card[base] == EMPTY:
+                return [Action(ActionType.CHOOSE_ACTIVE, card=i) for i in basics]
+            actions = [Action(ActionType.SETUP_BENCH, card=i) for i in basics] if bench < BENCH_SIZE else []
+            actions.append(END_SETUP)
+            return actions
+
+        actions: List[Action] = []
+        positions = range(bench + 1) if card[base] != EMPTY else [s for s in range(1, bench + 1)]
+        if state.tokens[p] > 0:
+            actions.extend(Action(ActionType.ATTACH_ENERGY, target=s) for s in positions)
+        if state.turn >= 2:
+            species = tables.species
+            parent = tables.parent
+            ready = [s for s in positions
+                     if state.turn > state.turn_played[base + s] and not state.flags[base + s] & EVOLVED]
+            for i, idx in enumerate(hand):
+                if parent[idx] != EMPTY:
+                    actions.extend(Action(ActionType.EVOLVE, card=i, target=s)
+                                   for s in ready if species[card[base + s]] == parent[idx])
+        if bench < BENCH_SIZE:
+            actions.extend(Action(ActionType.PLAY_BASIC, card=i) for i in basics)
+        ability = tables.ability
+        actions.extend(Action(ActionType.USE_ABILITY, target=s) for s in positions
+                       if ability[card[base + s]] is not None and not state.flags[base + s] & ABILITY_USED)
+        active = card[base]
+        if active != EMPTY and state.status[base] not in (SLEEP, PARALYSIS):
+            if (bench and not state.player_flags[p] & RETREATED
+                    and state.total_energy(base) >= tables.retreat[active]):
+                actions.extend(Action(ActionType.RETREAT, target=s) for s in range(1, bench + 1))
+            actions.extend(Action(ActionType.ATTACK, index=i) for i, attack in enumerate(tables.attacks[active])
+                           if self.can_pay(base, attack))
+        actions.append(END_TURN)
+        return actions
+
+    def describe(self, action: Action) -> str:
+        """Describe an action of the acting player for display."""
+        state = self.state
+        p = self.acting_player
+        name = self.tables.name
+        card = name[state.hand[p][action.card]] if 0 <= action.card < len(state.hand[p]) else None
+        target = name[state.card[p * SLOTS + action.target]] if action.target >= 0 else None
+        if action.type is ActionType.ATTACK:
+            return f"Attack with {self.tables.attacks[state.card[p * SLOTS]][action.index].name}"
+        return f"{action.type.name.replace('_', ' ').capitalize()} {card or ''} {target or ''}".strip()
+
+    # ----- Actions -----
+
+    def apply(self, action: Action, validate: bool = True) -> None:
+        """Apply an action of the acting player (see GameEngine.apply)."""
+        if validate and action not in self.legal_actions():
+            raise ValueError(f"Illegal action: {action!r}")
+        state = self.state
+        p = self.acting_player
+        base = p * SLOTS
+        kind = action.type
+
+        if kind is ActionType.CHOOSE_ACTIVE:
+            self._place(base, self.take(state.hand[p], action.card), -1)
+        elif kind is ActionType.SETUP_BENCH:
+            self._place(base + 1 + state.bench_count(p), self.take(state.hand[p], action.card), -1)
+        elif kind is ActionType.END_SETUP:
+            self.set(state.player_flags, p, state.player_flags[p] | SETUP_DONE)
+            if state.player_flags[1 - p] & SETUP_DONE:
+                self.set_field('setup_phase', False)
+                self.begin_turn()
+        elif kind is ActionType.ATTACH_ENERGY:
+            self.add(state.energy, (base + action.target) * NUM_TYPES + GRASS, 1)
+            self.add(state.tokens, p, -1)
+        elif kind is ActionType.EVOLVE:
+            self._evolve(base + action.target, self.take(state.hand[p], action.card), p)
+        elif kind is ActionType.PLAY_BASIC:
+            self._place(base + 1 + state.bench_count(p), self.take(state.hand[p], action.card), state.turn)
+        elif kind is ActionType.USE_ABILITY:
+            slot = base + action.target
+            self.set(state.flags, slot, state.flags[slot] | ABILITY_USED)
+            ability = self.tables.ability[state.card[slot]]
+            ability.fn(self, p, slot, *ability.params)
+            self.resolve_knockouts()
+        elif kind is ActionType.RETREAT:
+            self._retreat(p, base + action.target)
+        elif kind is ActionType.ATTACK:
+            self._attack(p, action.index)
+            self.resolve_knockouts()
+            if not state.game_over:
+                self.end_turn()
+        elif kind is ActionType.END_TURN:
+            self.end_turn()
+        else:
+            raise ValueError(f"Unsupported action in a compact game: {action!r}")
+
+    def _place(self, slot: int, idx: int, turn: int) -> None:
+        state = self.state
+        self.set(state.card, slot, idx)
+        self.set(state.hp, slot, self.tables.hp[idx] if idx != EMPTY else 0)
+        self.set(state.status, slot, NONE)
+        self.set(state.turn_played, slot, turn)
+        self.set(state.flags, slot, 0)
+        energy = state.energy
+        for e in range(slot * NUM_TYPES, (slot + 1) * NUM_TYPES):
+            if energy[e]:
+                self.set(energy, e, 0)
+
+    def _clear(self, slot: int) -> None:
+        self._place(slot, EMPTY, -1)
+
+    def _evolve(self, slot: int, idx: int, p: int) -> None:
+        # Like GameEngine: the evolution keeps energy and status and comes in at its full HP
+        state = self.state
+        self.push(state.discard[p], state.card[slot])
+        self.set(state.card, slot, idx)
+        self.set(state.hp, slot, self.tables.hp[idx])
+        self.set(state.turn_played, slot, state.turn)
+        self.set(state.flags, slot, EVOLVED)
+
+    def _move(self, src: int, dst: int) -> None:
+        """Move everything in slot src to slot dst (src is left as is)."""
+        state = self.state
+        for arr in (state.card, state.hp, state.status, state.turn_played, state.flags):
+            self.set(arr, dst, arr[src])
+        energy = state.energy
+        offset = (src - dst) * NUM_TYPES
+        for e in range(dst * NUM_TYPES, (dst + 1) * NUM_TYPES):
+            if energy[e] != energy[e + offset]:
+                self.set(energy, e, energy[e + offset])
+
+    def _swap(self, a: int, b: int) -> None:
+        state = self.state
+        for arr in (state.card, state.hp, state.status, state.turn_played, state.flags):
+            va, vb = arr[a], arr[b]
+            self.set(arr, a, vb)
+            self.set(arr, b, va)
+        energy = state.energy
+        offset = (b - a) * NUM_TYPES
+        for e in range(a * NUM_TYPES, (a + 1) * NUM_TYPES):
+            va, vb = energy[e], energy[e + offset]
+            if va != vb:
+                self.set(energy, e, vb)
+                self.set(energy, e + offset, va)
+
+    def _retreat(self, p: int, slot: int) -> None:
+        state = self.state
+        base = p * SLOTS
+        energy = state.energy
+        start = base * NUM_TYPES
+        # Retreat costs are Colorless, paid in PokemonType order like Player.pay_cost
+        for _ in range(self.tables.retreat[state.card[base]]):
+            for t in range(NUM_TYPES):
+                if energy[start + t]:
+                    self.add(energy, start + t, -1)
+                    break
+        self._swap(base, slot)
+        self.set(state.player_flags, p, state.player_flags[p] | RETREATED)
+
+    def _attack(self, p: int, index: int) -> None:
+        state = self.state
+        tables = self.tables
+        base = p * SLOTS
+        opp_base = (1 - p) * SLOTS
+        attack = tables.attacks[state.card[base]][index]
+        if state.status[base] == CONFUSION and self.rng.flip():
+            self.add(state.hp, base, -30)
+            return
+        damage = attack.damage
+        for fn, params in attack.modifiers:
+            damage = fn(self, p, damage, *params)
+        if damage > 0 and tables.weakness[state.card[opp_base]] == tables.ptype[state.card[base]]:
+            damage += 20
+        if damage > 0:
+            self.add(state.hp, opp_base, -damage)
+        for fn, params in attack.effects:
+            fn(self, p, *params)
+
+    # ----- Turn structure -----
+
+    def draw(self, p: int, count: int = 1) -> int:
+        """Draw cards from the top of a player's deck; returns how many were drawn."""
+        deck = self.state.deck[p]
+        hand = self.state.hand[p]
+        drawn = min(count, len(deck))
+        for _ in range(drawn):
+            self.push(hand, self.take(deck))
+        return drawn
+
+    def begin_turn(self) -> None:
+        """Draw and gain energy, except on the very first turn of the game."""
+        state = self.state
+        if state.turn > 0:
+            p = self.current_player
+            self.draw(p)
+            self.add(state.tokens, p, 1)
+
+    def end_turn(self) -> None:
+        """Run Pokemon Checkup, reset the turn flags and pass the turn."""
+        state = self.state
+        p = self.current_player
+        base = p * SLOTS
+        status = state.status[base]
+        if state.card[base] != EMPTY and status != NONE:
+            rng = self.rng
+            if status == SLEEP:
+                if rng.flip():
+                    self.set(state.status, base, NONE)
+            elif status == BURN:
+                self.add(state.hp, base, -20)
+                if rng.flip():
+                    self.set(state.status, base, NONE)
+            elif status == POISON:
+                self.add(state.hp, base, -10)
+            elif status == PARALYSIS:
+                self.set(state.status, base, NONE)
+        self.resolve_knockouts()
+        if state.game_over:
+            return
+        if state.player_flags[p] & (SUPPORTER_USED | RETREATED):
+            self.set(state.player_flags, p, state.player_flags[p] & ~(SUPPORTER_USED | RETREATED))
+        for s in range(base, base + SLOTS):
+            if state.flags[s]:
+                self.set(state.flags, s, 0)
+        self.set_field('turn', state.turn + 1)
+        if state.turn >= MAX_TURNS:
+            self.set_field('game_over', True)
+            return
+        self.begin_turn()
+
+    def remove_knocked_out(self, p: int) -> int:
+        """Discard a player's knocked out Pokemon, keeping the Bench packed; returns the points scored."""
+        state = self.state
+        base = p * SLOTS
+        points = 0
+        # The Active Spot is left empty; promotion happens in resolve_knockouts
+        for s in range(base, base + SLOTS):
+            if state.card[s] != EMPTY and state.hp[s] <= 0:
+                points += self.tables.points[state.card[s]]
+                self.push(state.discard[p], state.card[s])
+                self._clear(s)
+        if points:
+            # Pack the Bench back to the left
+            free = base + 1
+            for s in range(base + 1, base + SLOTS):
+                if state.card[s] != EMPTY:
+                    if s != free:
+                        self._move(s, free)
+                        self._clear(s)
+                    free += 1
+        return points
+
+    def resolve_knockouts(self) -> None:
+        """Score knocked out Pokemon, promote replacements and check for the end of the game."""
+        state = self.state
+        p = self.current_player
+        scored = self.remove_knocked_out(1 - p)
+        if scored:
+            self.add(state.points, p, scored)
+        scored = self.remove_knocked_out(p)
+        if scored:
+            self.add(state.points, 1 - p, scored)
+        for q in (0, 1):
+            base = q * SLOTS
+            if state.card[base] == EMPTY and state.card[base + 1] != EMPTY:
+                # Auto-promote the first Bench Pokemon
+                for s in range(base, base + SLOTS - 1):
+                    self._move(s + 1, s)
+                self._clear(base + SLOTS - 1)
+        scores = [state.points[0] >= 3, state.points[1] >= 3]
+        no_pokemon = [state.card[0] == EMPTY, state.card[SLOTS] == EMPTY]
+        if any(scores) or any(no_pokemon):
+            self.set_field('game_over', True)
+            wins = [scores[i] or (no_pokemon[1 - i] and not no_pokemon[i]) for i in range(2)]
+            if wins[0] != wins[1]:
+                self.set_field('winner', 0 if wins[0] else 1)
+
+
+# ----- Native effect primitives: fn(engine, attacker, [damage,] *params) -----
+
+EFFECTS: Dict[str, Callable] = {}
+ABILITY_HANDLERS: Dict[str, Callable] = {}
+
+
+def effect(key: str):
+    """Register the compact version of an effect primitive."""
+    def register(fn):
+        EFFECTS[key] = fn
+        return fn
+    return register
+
+
+def ability_handler(key: str):
+    """Register the compact version of an ability handler: fn(engine, player, slot, *params)."""
+    def register(fn):
+        ABILITY_HANDLERS[key] = fn
+        return fn
+    return register
+
+
+def _flip(g: CompactEngine) -> bool:
+    return g.rng.flip()
+
+
+def _heads(g: CompactEngine, coins: int) -> int:
+    return g.rng.heads(coins)
+
+
+def _board(g: CompactEngine, p: int) -> List[int]:
+    """Occupied flat slots of a player, Active first."""
+    base = p * SLOTS
+    card = g.state.card
+    return [s for s in range(base, base + SLOTS) if card[s] != EMPTY]
+
+
+def _discard_energy(g: CompactEngine, slot: int, energy_type: Optional[int], count: int, at_random: bool) -> int:
+    energy = g.state.energy
+    start = slot * NUM_TYPES
+    removed = 0
+    while removed < count:
+        candidates = [t for t in range(NUM_TYPES)
+                      if energy[start + t] > 0 and (energy_type is None or t == energy_type)]
+        if not candidates:
+            break
+        t = g.rng.choice(candidates) if at_random else candidates[0]
+        g.add(energy, start + t, -1)
+        removed += 1
+    return removed
+
+
+def _heal(g: CompactEngine, slot: int, amount: int) -> None:
+    healed = min(amount, g.tables.hp[g.state.card[slot]] - g.state.hp[slot])
+    if healed > 0:
+        g.add(g.state.hp, slot, healed)
+
+
+def _pick_target(g: CompactEngine, slots: Sequence[int], damage: int) -> Optional[int]:
+    hp = g.state.hp
+    if not slots:
+        return None
+    for s in slots:
+        if hp[s] <= damage:
+            return s
+    return min(slots, key=lambda s: hp[s])
+
+
+@effect('coin_bonus')
+def coin_bonus(g, p, damage, bonus):
+    return damage + bonus if _flip(g) else damage
+
+
+@effect('coin_bonus_or_recoil')
+def coin_bonus_or_recoil(g, p, damage, bonus, recoil):
+    if _flip(g):
+        return damage + bonus
+    g.add(g.state.hp, p * SLOTS, -recoil)
+    return damage
+
+
+@effect('coin_or_nothing')
+def coin_or_nothing(g, p, damage):
+    return damage if _flip(g) else 0
+
+
+@effect('damage_per_heads')
+def damage_per_heads(g, p, damage, coins, per_heads):
+    return per_heads * _heads(g, coins)
+
+
+@effect('bonus_per_heads')
+def bonus_per_heads(g, p, damage, coins, per_heads):
+    return damage + per_heads * _heads(g, coins)
+
+
+@effect('all_heads_bonus')
+def all_heads_bonus(g, p, damage, coins, bonus):
+    return damage + bonus if _heads(g, coins) == coins else damage
+
+
+@effect('heads_until_tails')
+def heads_until_tails(g, p, damage, per_heads, replace):
+    heads = 0
+    while _flip(g):
+        heads += 1
+    return per_heads * heads if replace else damage + per_heads * heads
+
+
+@effect('damage_per_energy_flip')
+def damage_per_energy_flip(g, p, damage, per_heads):
+    return per_heads * _heads(g, g.state.total_energy(p * SLOTS))
+
+
+@effect('bonus_per_opponent_energy')
+def bonus_per_opponent_energy(g, p, damage, per_energy):
+    return damage + per_energy * g.state.total_energy((1 - p) * SLOTS)
+
+
+@effect('bonus_if_damaged')
+def bonus_if_damaged(g, p, damage, bonus):
+    slot = (1 - p) * SLOTS
+    return damage + bonus if g.state.hp[slot] < g.tables.hp[g.state.card[slot]] else damage
+
+
+@effect('bonus_if_status')
+def bonus_if_status(g, p, damage, status, bonus):
+    return damage + bonus if g.state.status[(1 - p) * SLOTS] == STATUS_INDEX[StatusCondition[status]] else damage
+
+
+@effect('bonus_if_extra_energy')
+def bonus_if_extra_energy(g, p, damage, energy_type, required, bonus):
+    attached = g.state.energy[p * SLOTS * NUM_TYPES + TYPE_INDEX[PokemonType[energy_type]]]
+    return damage + bonus if attached >= required else damage
+
+
+@effect('bonus_if_tool')
+def bonus_if_tool(g, p, damage, bonus, opponent):
+    return damage  # Compact games have no Tool cards
+
+
+@effect('damage_per_own_bench')
+def damage_per_own_bench(g, p, damage, per_poke, energy_type):
+    t = TYPE_INDEX[PokemonType[energy_type]] if energy_type else None
+    ptype = g.tables.ptype
+    card = g.state.card
+    return per_poke * sum(1 for s in _board(g, p) if s % SLOTS and (t is None or ptype[card[s]] == t))
+
+
+@effect('bonus_per_opponent_bench')
+def bonus_per_opponent_bench(g, p, damage, per_poke):
+    return damage + per_poke * g.state.bench_count(1 - p)
+
+
+@effect('bonus_per_own_damage')
+def bonus_per_own_damage(g, p, damage):
+    slot = p * SLOTS
+    return damage + (g.tables.hp[g.state.card[slot]] - g.state.hp[slot])
+
+
+@effect('heal_self')
+def heal_self(g, p, amount):
+    slot = p * SLOTS
+    if g.state.card[slot] != EMPTY:
+        _heal(g, slot, amount)
+
+
+@effect('apply_status')
+def apply_status(g, p, status):
+    slot = (1 - p) * SLOTS
+    if g.state.card[slot] != EMPTY:
+        g.set(g.state.status, slot, STATUS_INDEX[StatusCondition[status]])
+
+
+@effect('coin_status')
+def coin_status(g, p, status):
+    if _flip(g):
+        apply_status(g, p, status)
+
+
+@effect('self_damage')
+def self_damage(g, p, amount):
+    slot = p * SLOTS
+    if g.state.card[slot] != EMPTY:
+        g.add(g.state.hp, slot, -amount)
+
+
+@effect('discard_own_energy')
+def discard_own_energy(g, p, energy_type, count, at_random):
+    slot = p * SLOTS
+    if g.state.card[slot] != EMPTY:
+        t = TYPE_INDEX[PokemonType[energy_type]] if energy_type else None
+        _discard_energy(g, slot, t, count, at_random)
+
+
+@effect('discard_opponent_energy')
+def discard_opponent_energy(g, p, coin):
+    slot = (1 - p) * SLOTS
+    if g.state.card[slot] != EMPTY and (not coin or _flip(g)):
+        _discard_energy(g, slot, None, 1, True)
+
+
+@effect('snipe_bench_each')
+def snipe_bench_each(g, p, amount):
+    for s in _board(g, 1 - p):
+        if s % SLOTS:
+            g.add(g.state.hp, s, -amount)
+
+
+@effect('snipe_one')
+def snipe_one(g, p, amount, bench_only):
+    slots = _board(g, 1 - p)
+    if bench_only:
+        slots = [s for s in slots if s % SLOTS]
+    target = _pick_target(g, slots, amount)
+    if target is not None:
+        g.add(g.state.hp, target, -amount)
+
+
+@effect('search_deck')
+def search_deck(g, p, energy_type, count):
+    t = TYPE_INDEX[PokemonType[energy_type]]
+    deck = g.state.deck[p]
+    ptype = g.tables.ptype
+    for _ in range(count):
+        # Match from the bottom, like GameEngine's Deck iteration
+        matches = [i for i in range(len(deck)) if ptype[deck[i]] == t]
+        if not matches:
+            return
+        g.push(g.state.hand[p], g.take(deck, g.rng.choice(matches)))
+
+
+@effect('energy_to_bench')
+def energy_to_bench(g, p, energy_type, count, bench_type):
+    t = TYPE_INDEX[PokemonType[energy_type]]
+    bt = TYPE_INDEX[PokemonType[bench_type]] if bench_type else None
+    for s in _board(g, p):
+        if s % SLOTS and (bt is None or g.tables.ptype[g.state.card[s]] == bt):
+            g.add(g.state.energy, s * NUM_TYPES + t, count)
+            return
+
+
+@effect('draw')
+def draw(g, p, count):
+    g.draw(p, count)
+
+
+@ability_handler('heal_all')
+def heal_all(g, p, slot, amount):
+    for s in _board(g, p):
+        _heal(g, s, amount)
+
+
+@ability_handler('snipe_one')
+def ability_snipe_one(g, p, slot, amount):
+    snipe_one(g, p, amount, False)
+
+
+@ability_handler('active_status')
+def active_status(g, p, slot, status):
+    if slot == p * SLOTS:
+        apply_status(g, p, status)
+
+
+@ability_handler('coin_status')
+def ability_coin_status(g, p, slot, status):
+    coin_status(g, p, status)
+
+
+@ability_handler('energy_to_self')
+def energy_to_self(g, p, slot):
+    g.add(g.state.energy, slot * NUM_TYPES + g.tables.ptype[g.state.card[slot]], 1)
+
+
+@ability_handler('energy_to_active')
+def energy_to_active(g, p, slot):
+    if g.state.card[p * SLOTS] != EMPTY:
+        energy_to_self(g, p, p * SLOTS)
+
+
+@ability_handler('draw')
+def ability_draw(g, p, slot, count):
+    g.draw(p, count)
+
+
+@ability_handler('announce')
+def announce(g, p, slot):
+    pass
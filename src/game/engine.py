@@ -1,68 +1,151 @@
 """
 Game engine for Pokemon TCG Pocket.
 """
-import random
-import copy
-from typing import List, Optional, Sequence
-from src.cards.card_loader import load_cards_from_json
-import os
+from array import array
+from typing import List, Optional, Sequence, Union
+from src.cards.catalog import CardCatalog, get_catalog
+from src.cards.deck_codes import decode_deck, encode_deck, pack_deck
 
-from src.models.cards import Card, PokemonCard, Attack, SupporterCard, ItemCard, ToolCard
+from src.models.cards import Card, PokemonCard, PokemonDefinition, Attack, SupporterCard, ItemCard, ToolCard
 from src.models.enums import PokemonType, StatusCondition
+from src.game.actions import ACTIVE, END_SETUP, END_TURN, Action, ActionType
+from src.game.events import DamageDealt, EventBus, GameEnded, StatusKept, StatusRemoved, TurnStarted
 from src.game.player import Player
+from src.game.rng import GameRandom
+from src.game.zones import Deck, Hand
+
+# Half-turns after which a stalled game ends in a draw
+MAX_TURNS = 200
 
 class GameEngine:
     """Main game engine that handles game flow and rules."""
     
-    def __init__(self, player1: Player, player2: Player):
-        """Initialize the game engine."""
+    def __init__(self, player1: Player, player2: Player, catalog: Optional[CardCatalog] = None,
+                 seed: Optional[int] = None, coin_batch: int = 0):
+        """Initialize the game engine.
+
+        All randomness of the game (shuffles, coin flips, random choices) comes
+        from one GameRandom stream created from seed (a fresh one if None); the
+        same seed and actions replay a game exactly. coin_batch > 0 pre-draws
+        coin flips in batches of that size.
+        """
         self.players = [player1, player2]
+        # Everything that happens in the game is reported on this bus
+        self.events = EventBus()
+        self.rng = GameRandom(seed, coin_batch)
+        # All engines share the process-wide catalog unless told otherwise
+        self.catalog = catalog if catalog is not None else get_catalog()
+        evolution = self.catalog.evolution
+        for player in self.players:
+            player.events = self.events
+            player.rng = self.rng
+            player.evolution = evolution
+            player.hand = Hand(player.hand, evolution)
         self.turn = 0
         self.setup_phase = True
         self.setup_complete = [False, False]  # Track if each player has chosen their active Pokemon
         # Decide who goes first with a coin flip
-        self.first_player = random.choice([0, 1])
-
-    def setup_game(self) -> None:
-        """Set up the game state for both players using a real deck from cards.json."""
-        # Load cards from JSON
-        card_json_path = os.path.join(os.path.dirname(__file__), '..', 'cards', 'cards.json')
-        all_cards = load_cards_from_json(card_json_path)
-        # For now, just use the first 20 legal Pokemon cards as the deck
-        deck = [card for card in all_cards if hasattr(card, 'attacks')][:20]
-        for player in self.players:
-            # Ensure each card in the deck is a unique object
-            player.deck = [copy.deepcopy(card) for card in deck]
-            random.shuffle(player.deck)
-            for _ in range(5):
-                player.draw_card()
+        self.first_player = 0 if self.rng.flip() else 1
+        self.decks: List[array] = []  # Each player's deck as catalog indices, set by setup_game
+        self.game_over = False
+        self.winner: Optional[int] = None  # Index of the winning player; None while playing or on a draw
+
+    def clone(self) -> 'GameEngine':
+        """Copy the game for lookahead without deepcopy: only the mutable fields are copied.
+
+        Card definitions and the catalog are shared; the copy has its own
+        EventBus without subscribers and a copy of the random stream.
+        """
+        engine = GameEngine.__new__(GameEngine)
+        engine.__dict__.update(self.__dict__)
+        engine.players = [player.clone() for player in self.players]
+        engine.events = EventBus()
+        engine.rng = self.rng.copy()
+        for player in engine.players:
+            player.events = engine.events
+            player.rng = engine.rng
+        engine.setup_complete = list(self.setup_complete)
+        engine.decks = list(self.decks)
+        return engine
+
+    def zobrist_hash(self) -> int:
+        """64-bit Zobrist hash of the game state, equal to the hash of its CompactState.
+
+        This recomputes the hash from scratch; CompactEngine keeps it
+        incrementally.
+        """
+        from src.game.compact import CompactState, tables_for
+        return tables_for(self.catalog).zobrist.state_hash(CompactState.from_game(self))
+
+    def to_bytes(self) -> bytes:
+        """Snapshot the game in a compact, versioned binary format (see src.game.snapshot)."""
+        from src.game.snapshot import game_to_bytes
+        return game_to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, catalog: Optional[CardCatalog] = None) -> 'GameEngine':
+        """Restore a game from to_bytes(); it continues exactly, random stream included."""
+        from src.game.snapshot import game_from_bytes
+        return game_from_bytes(data, catalog)
+
+    def deck_code(self, player_idx: int) -> str:
+        """Get the deck code of a player's deck."""
+        return encode_deck(self.decks[player_idx])
+
+    def setup_game(self, decks: Optional[Sequence[Union[str, Sequence[int]]]] = None) -> None:
+        """Set up the game state for both players.
+
+        decks holds one deck per player, as catalog indices or a deck code; by
+        default each player gets a random legal Grass deck (energy is Grass
+        only for now).
+        """
+        if decks is None:
+            generator = self.catalog.deck_generator
+            decks = [generator.sample([PokemonType.GRASS], rng=self.rng) for _ in self.players]
+        self.decks = [pack_deck(decode_deck(deck, len(self.catalog)) if isinstance(deck, str) else deck)
+                      for deck in decks]
+        for player, deck in zip(self.players, self.decks):
+            # Each deck slot gets its own in-play card sharing the static definition
+            player.deck = Deck(self.catalog[idx].create_card() for idx in deck)
+            player.deck.shuffle(self.rng)
+            self.draw_opening_hand(player)
             # Force Grass energy only
             player.energy_type = PokemonType.GRASS
             player.next_energy_type = PokemonType.GRASS
 
+    def draw_opening_hand(self, player: Player) -> None:
+        """Draw 5 cards, reshuffling until the hand holds at least one Basic Pokemon."""
+        is_basic = player.evolution.is_basic
+        if not any(isinstance(card, PokemonCard) and is_basic(card) for card in player.deck):
+            player.draw_cards(5)
+            return
+        while True:
+            player.draw_cards(5)
+            if self.get_valid_active_choices(player):
+                return
+            player.deck.extend(player.hand)
+            player.hand.clear()
+            player.deck.shuffle(self.rng)
+
     def generate_deck(self) -> List[Card]:
         """Generate a legal 20-card deck."""
         deck: List[Card] = []
-          # Basic Pokemon
-        pikachu = PokemonCard("Pikachu", "BAS-025", 60, PokemonType.ELECTRIC)
-        pikachu.attacks = [
-            Attack("Thunder Shock", 20, 1),
-            Attack("Thunderbolt", 50, 2)
-        ]
-        pikachu.weakness = PokemonType.FIGHTING
+        # Basic Pokemon
+        pikachu = PokemonDefinition("Pikachu", "BAS-025", 60, PokemonType.ELECTRIC,
+                                    weakness=PokemonType.FIGHTING,
+                                    attacks=(Attack("Thunder Shock", 20, 1),
+                                             Attack("Thunderbolt", 50, 2)))
         
-        raichu_ex = PokemonCard("Raichu-EX", "BAS-026", 180, PokemonType.ELECTRIC, is_ex=True)
-        raichu_ex.attacks = [
-            Attack("Thunder Wave", 30, 1, ["Electric"],  # Add cost_types explicitly
-                  lambda self, opp: (setattr(opp.active, 'status', StatusCondition.PARALYSIS), None)[-1]),
-            Attack("Lightning Strike", 120, 3, ["Electric", "Electric", "Electric"])
-        ]
-        raichu_ex.weakness = PokemonType.FIGHTING
-        raichu_ex.can_evolve_from = "Pikachu"
+        raichu_ex = PokemonDefinition("Raichu-EX", "BAS-026", 180, PokemonType.ELECTRIC, is_ex=True,
+                                      weakness=PokemonType.FIGHTING,
+                                      can_evolve_from="Pikachu",
+                                      attacks=(Attack("Thunder Wave", 30, 1, ["Electric"],  # Add cost_types explicitly
+                                                      lambda self, opp: (setattr(opp.active, 'status', StatusCondition.PARALYSIS), None)[-1]),
+                                               Attack("Lightning Strike", 120, 3, ["Electric", "Electric", "Electric"])))
         
         # Create deck
-        deck.extend([pikachu] * 4)  # 4 basic Pokemon
-        deck.extend([raichu_ex] * 2)  # 2 evolution Pokemon-EX
+        deck.extend(pikachu.create_card() for _ in range(4))  # 4 basic Pokemon
+        deck.extend(raichu_ex.create_card() for _ in range(2))  # 2 evolution Pokemon-EX
         
         # Trainer cards
         potion = ItemCard("Potion", 
@@ -76,281 +159,276 @@ class GameEngine:
                                                    getattr(pokemon, 'attack_damage', 0) + 10), None)[-1])
         deck.extend([potion, switch, power_belt])
         
-        # Supporter cards
-        supporter_cards = [
-            SupporterCard("Professor's Research", 
-                         lambda player: (player.discard_pile.extend(player.hand), 
-                                      player.hand.clear(),
-                                      player.draw_cards(7), None)[-1]),
-            SupporterCard("Lillie", 
-                         lambda player: (player.draw_cards(3), None)[-1])
-        ]
-        deck.extend(supporter_cards * 2)  # 2 copies each
+        # Supporter cards; every copy is its own card instance
+        def supporter_cards() -> List[SupporterCard]:
+            return [
+                SupporterCard("Professor's Research",
+                             lambda player: (player.discard_pile.extend(player.hand),
+                                          player.hand.clear(),
+                                          player.draw_cards(7), None)[-1]),
+                SupporterCard("Lillie",
+                             lambda player: (player.draw_cards(3), None)[-1])
+            ]
+        deck.extend(supporter_cards() + supporter_cards())  # 2 copies each
         
         # Fill remaining slots with random trainers
         while len(deck) < 20:
-            deck.append(random.choice(supporter_cards))
+            deck.append(self.rng.choice(supporter_cards()))
         
         return deck[:20]  # Ensure exactly 20 cards
 
-    def display_hand(self, player: Player):
-        print(f"\n{player.name}'s hand:")
-        for idx, card in enumerate(player.hand):
-            print(f"  [{idx}] {card.name} ({type(card).__name__})")
-
-    def display_board(self, player: Player):
-        print(f"\n{player.name}'s board:")
-        def energy_str(poke):
-            if not poke or not hasattr(poke, 'attached_energy') or not poke.attached_energy:
-                return ""
-            return " | Energies: " + ", ".join(f"{t.name}:{n}" for t, n in poke.attached_energy.items() if n > 0)
-        if player.active:
-            print(f"  Active: {player.active.name} (HP: {player.active.hp}){energy_str(player.active)}")
-        else:
-            print(f"  Active: None")
-        print("  Bench:")
-        for idx, poke in enumerate(player.bench):
-            print(f"    [{idx}] {poke.name} (HP: {poke.hp}){energy_str(poke)}")
-
-    def display_full_board(self):
-        """Display both players' full board state, including hand, active, bench, energies, and tools."""
-        for player in self.players:
-            print(f"\n=== {player.name}'s Board ===")
-            # Hand (show card names only)
-            print(f"Hand ({len(player.hand)}): " + ', '.join(card.name for card in player.hand))
-            # Active Pokémon
-            def poke_details(poke):
-                if not poke:
-                    return "None"
-                energies = [(t.name, n) for t, n in getattr(poke, 'attached_energy', {}).items() if n > 0]
-                if energies:
-                    energy_str = " | Energies: " + ', '.join(f"{t}:{n}" for t, n in energies)
-                else:
-                    energy_str = " | Energies: None"
-                tool_str = f" | Tool: {poke.attached_tool.name}" if poke.attached_tool else ""
-                status_str = f" | Status: {poke.status.name}" if poke.status and poke.status.name != 'NONE' else ""
-                return f"{poke.name} (HP: {poke.hp}/{poke.max_hp}){energy_str}{tool_str}{status_str}"
-            print(f"Active: {poke_details(player.active)}")
-            # Bench
-            if player.bench:
-                print("Bench:")
-                for idx, poke in enumerate(player.bench):
-                    print(f"  [{idx}] {poke_details(poke)}")
-            else:
-                print("Bench: (empty)")
-            # (Optional) Discard pile
-            # print(f"Discard pile ({len(player.discard_pile)}): " + ', '.join(card.name for card in player.discard_pile))
-            print("---------------------------")
-
-    def prompt_choice(self, prompt: str, options: list) -> Optional[int]:
-        if not options:
-            return None
-        while True:
-            try:
-                choice = input(f"{prompt} (0-{len(options)-1}, or Enter to skip): ")
-                if choice == '':
-                    return None
-                idx = int(choice)
-                if 0 <= idx < len(options):
-                    return idx
-            except Exception:
-                pass
-            print("Invalid input. Try again.")
-
-    def play_turn(self) -> None:
-        """Execute a single turn of the game with all main steps."""
-        current_player = self.players[self.turn % 2]
-        opponent = self.players[(self.turn + 1) % 2]
-        print(f"\nTurn {self.turn + 1}: {current_player.name}'s turn")
-
-        # Show both players' full board state before the turn
-        self.display_full_board()
-
-        # 1. Draw card (skip for first player's first turn)
-        if self.turn != self.first_player:
-            current_player.draw_card()
-
-        # 2. Gain 1 Grass Energy (skip for first player's first turn only)
-        # Only skip if this is the very first turn and it's the first player
-        if not (self.turn == self.first_player == 0):
-            current_player.energy += 1
-            current_player.energy_type = PokemonType.GRASS
-            current_player.next_energy_type = PokemonType.GRASS
-            print(f"Gained 1 GRASS energy. Next turn: GRASS")
-
-        # Show hand and board
-        self.display_hand(current_player)
-        self.display_board(current_player)
-
-        # Energy attachment step
-        if current_player.energy > 0 and current_player.energy_type is not None:
-            pokes = [poke for poke in [current_player.active] + current_player.bench if poke]
-            print(f"\nYou have {current_player.energy} energy token(s) to attach.")
-            while current_player.energy > 0:
-                p_idx = self.prompt_choice("Choose a Pokémon to attach energy to", pokes)
-                if p_idx is None:
-                    break
-                current_player.attach_energy(pokes[p_idx], current_player.energy_type)
-
-        # 3. Activate Evolutions (prompt for each possible evolution)
-        # Prevent evolution on both players' first turns
-        if self.turn >= 2:
-            evo_options = [(i, card) for i, card in enumerate(current_player.hand) if isinstance(card, PokemonCard) and card.can_evolve_from]
-            for idx, evo_card in evo_options:
-                targets = [poke for poke in [current_player.active] + current_player.bench if poke and poke.name == evo_card.can_evolve_from and poke.can_evolve(self.turn)]
-                if targets:
-                    print(f"Evolution available: {evo_card.name} can evolve {evo_card.can_evolve_from}.")
-                    t_idx = self.prompt_choice(f"Choose which to evolve into {evo_card.name}", targets)
-                    if t_idx is not None:
-                        current_player.evolve_pokemon(evo_card, targets[t_idx], self.turn)
-                        print(f"{current_player.name} evolved {targets[t_idx].name} into {evo_card.name}!")
-        else:
-            print("Evolution is not allowed on either player's first turn.")
-
-        # 4. Play Basic Pokémon to Bench (multi-select, comma-separated indices)
-        while len(current_player.bench) < 3:
-            basics = [card for card in current_player.hand if isinstance(card, PokemonCard) and not card.can_evolve_from]
-            if not basics:
-                break
-            self.display_hand(current_player)
-            print(f"You may add up to {3 - len(current_player.bench)} Pokémon to your Bench this turn.")
-            choices = input(f"Select Pokémon to add to Bench (comma-separated indices, Enter to finish): ")
-            if choices == '':
-                break
-            try:
-                indices = [int(x.strip()) for x in choices.split(',') if x.strip().isdigit()]
-                for idx in sorted(set(indices), reverse=True):
-                    if 0 <= idx < len(basics) and len(current_player.bench) < 3:
-                        card = basics[idx]
-                        if current_player.play_pokemon_to_bench(card, self.turn):
-                            print(f"{current_player.name} played {card.name} to the bench.")
-            except Exception:
-                print("Invalid choice. Try again.")
-
-        # 5. Use Pokémon Abilities (not implemented, placeholder)
-        # TODO: Implement ability activation
-
-        # 6. Play Trainers (prompt for each type)
-        # Supporter
-        supporters = [(i, card) for i, card in enumerate(current_player.hand) if isinstance(card, SupporterCard) and not current_player.supporter_used]
-        if supporters:
-            self.display_hand(current_player)
-            s_idx = self.prompt_choice("Choose a Supporter to play", [card for _, card in supporters])
-            if s_idx is not None:
-                card = supporters[s_idx][1]
-                current_player.play_supporter(card)
-                print(f"{current_player.name} played supporter {card.name}.")
-        # Items
-        while True:
-            items = [(i, card) for i, card in enumerate(current_player.hand) if isinstance(card, ItemCard)]
-            if not items:
-                break
-            self.display_hand(current_player)
-            i_idx = self.prompt_choice("Choose an Item to play", [card for _, card in items])
-            if i_idx is None:
-                break
-            card = items[i_idx][1]
-            current_player.play_item(card)
-            print(f"{current_player.name} played item {card.name}.")
-        # Tools
-        while True:
-            tools = [(i, card) for i, card in enumerate(current_player.hand) if isinstance(card, ToolCard)]
-            if not tools:
-                break
-            self.display_hand(current_player)
-            t_idx = self.prompt_choice("Choose a Tool to attach", [card for _, card in tools])
-            if t_idx is None:
-                break
-            card = tools[t_idx][1]
-            pokes = [poke for poke in [current_player.active] + current_player.bench if poke and not poke.attached_tool]
-            if not pokes:
-                print("No Pokémon available to attach a tool.")
-                break
-            p_idx = self.prompt_choice("Choose a Pokémon to attach the tool to", pokes)
-            if p_idx is not None:
-                current_player.attach_tool(card, pokes[p_idx])
-                print(f"{current_player.name} attached tool {card.name} to {pokes[p_idx].name}.")
-
-        # 7. Retreat (prompt to retreat, only if enough energy attached)
-        if current_player.active and current_player.bench and not current_player.retreated_this_turn:
-            cost = getattr(current_player.active, 'retreat_cost', 1)
-            can_retreat = current_player.can_retreat(current_player.active, cost, ['Colorless']*cost)
-            if can_retreat:
-                print(f"Active: {current_player.active.name}, Bench: {[poke.name for poke in current_player.bench]}")
-                r = input(f"Do you want to retreat your active Pokémon? (Cost: {cost} energy, y/N): ").strip().lower()
-                if r == 'y':
-                    p_idx = self.prompt_choice("Choose a Pokémon from the bench to switch with", current_player.bench)
-                    if p_idx is not None:
-                        current_player.retreat(current_player.bench[p_idx])
-
-        # 8. Attack (prompt for attack, only if enough energy attached)
-        if current_player.active and current_player.active.attacks:
-            available_attacks = [i for i, atk in enumerate(current_player.active.attacks) if current_player.can_attack_with(current_player.active, i)]
-            if available_attacks:
-                print(f"Available attacks for {current_player.active.name}:")
-                for i in available_attacks:
-                    atk = current_player.active.attacks[i]
-                    print(f"  [{i}] {atk.name} (Damage: {atk.damage}, Cost: {atk.cost_types})")
-                a_idx = self.prompt_choice("Choose an attack to use", [current_player.active.attacks[i] for i in available_attacks])
-                if a_idx is not None:
-                    real_idx = available_attacks[a_idx]
-                    # Only check for energy, do not remove it unless attack effect says so
-                    # current_player.pay_cost(current_player.active, current_player.active.attacks[real_idx].cost_types)  # REMOVE THIS LINE
-                    current_player.attack(real_idx, opponent)
-                    print(f"{current_player.name}'s {current_player.active.name} used {current_player.active.attacks[real_idx].name}!")
-            else:
-                print("No attacks available (not enough energy attached).")
-
-        # 9. Status/after-attack triggers
-        self.handle_status_effects(current_player)
-        opponent.replace_knocked_out()
-
-        # 10. End turn
-        current_player.supporter_used = False
-        current_player.retreated_this_turn = False
-        for pokemon in ([current_player.active] + current_player.bench):
+    # ----- Headless API -----
+
+    @property
+    def acting_player_index(self) -> int:
+        """Index of the player whose action is expected next."""
+        if self.setup_phase:
+            return self.setup_complete.index(False)
+        return (self.turn + self.first_player) % 2
+
+    @property
+    def acting_player(self) -> Player:
+        """The player whose action is expected next (during setup, the first one not done yet)."""
+        return self.players[self.acting_player_index]
+
+    def pokemon_at(self, player: Player, position: int) -> Optional[PokemonCard]:
+        """Get the Pokemon at a board position (0 = Active, 1-3 = Bench)."""
+        if position == ACTIVE:
+            return player.active
+        if 0 < position <= len(player.bench):
+            return player.bench[position - 1]
+        return None
+
+    def legal_actions(self) -> List[Action]:
+        """List every action the acting player can take now, in a stable order.
+
+        Cards come from the hand's category indexes and targets from the
+        player's board indexes, so this costs O(number of actions).
+        """
+        if self.game_over:
+            return []
+        player = self.acting_player
+        hand = player.hand
+        positions = hand.positions()
+        basics = [positions[uid] for uid in hand.basics]
+        if self.setup_phase:
+            if player.active is None:
+                return [Action(ActionType.CHOOSE_ACTIVE, card=i) for i in basics]
+            actions = [Action(ActionType.SETUP_BENCH, card=i) for i in basics] if len(player.bench) < 3 else []
+            actions.append(END_SETUP)
+            return actions
+
+        actions: List[Action] = []
+        board = [player.active] + player.bench
+        if player.energy > 0 and player.energy_type is not None:
+            actions.extend(Action(ActionType.ATTACH_ENERGY, target=pos) for pos in player.occupied)
+        # No evolving on either player's first turn
+        if self.turn >= 2 and hand.evolutions:
+            turn = self.turn
+            evolvable = player.evolvable
+            parent_of_card = player.evolution.parent_of_card
+            for uid, card in hand.evolutions.items():
+                for pos in evolvable.get(parent_of_card(card), ()):
+                    if board[pos].turn_played < turn:
+                        actions.append(Action(ActionType.EVOLVE, card=positions[uid], target=pos))
+        if len(player.bench) < 3:
+            actions.extend(Action(ActionType.PLAY_BASIC, card=i) for i in basics)
+        actions.extend(Action(ActionType.USE_ABILITY, target=pos)
+                       for pos in player.with_ability if board[pos].can_use_ability())
+        if not player.supporter_used:
+            actions.extend(Action(ActionType.PLAY_SUPPORTER, card=positions[uid]) for uid in hand.supporters)
+        actions.extend(Action(ActionType.PLAY_ITEM, card=positions[uid]) for uid in hand.items)
+        for uid in hand.tools:
+            actions.extend(Action(ActionType.ATTACH_TOOL, card=positions[uid], target=pos) for pos in player.tool_free)
+        active = player.active
+        if active and active.status not in (StatusCondition.SLEEP, StatusCondition.PARALYSIS):
+            if player.bench and not player.retreated_this_turn and player.can_retreat(active):
+                actions.extend(Action(ActionType.RETREAT, target=pos) for pos in range(1, len(player.bench) + 1))
+            actions.extend(Action(ActionType.ATTACK, index=i) for i in active.payable_attacks())
+        actions.append(END_TURN)
+        return actions
+
+    def apply(self, action: Action, validate: bool = True) -> None:
+        """Apply an action of the acting player.
+
+        With validate, actions not in legal_actions() raise ValueError; callers
+        that only pick from legal_actions() can skip the check.
+        """
+        if validate and action not in self.legal_actions():
+            raise ValueError(f"Illegal action: {action!r}")
+        player_idx = self.acting_player_index
+        player = self.players[player_idx]
+        opponent = self.players[1 - player_idx]
+        kind = action.type
+
+        if kind is ActionType.CHOOSE_ACTIVE:
+            player.active = player.hand.pop(action.card)
+            player.index_board()
+        elif kind is ActionType.SETUP_BENCH:
+            player.bench.append(player.hand.pop(action.card))
+            player.index_board()
+        elif kind is ActionType.END_SETUP:
+            self.setup_complete[player_idx] = True
+            if all(self.setup_complete):
+                self.setup_phase = False
+                self.begin_turn()
+        elif kind is ActionType.ATTACH_ENERGY:
+            player.attach_energy(self.pokemon_at(player, action.target), player.energy_type)
+        elif kind is ActionType.EVOLVE:
+            player.evolve_pokemon(player.hand[action.card], self.pokemon_at(player, action.target), self.turn)
+        elif kind is ActionType.PLAY_BASIC:
+            player.play_pokemon_to_bench(player.hand[action.card], self.turn)
+        elif kind is ActionType.USE_ABILITY:
+            player.use_ability(self.pokemon_at(player, action.target), opponent)
+            self.resolve_knockouts()
+        elif kind is ActionType.PLAY_SUPPORTER:
+            player.play_supporter(player.hand[action.card])
+        elif kind is ActionType.PLAY_ITEM:
+            player.play_item(player.hand[action.card])
+        elif kind is ActionType.ATTACH_TOOL:
+            player.attach_tool(player.hand[action.card], self.pokemon_at(player, action.target))
+        elif kind is ActionType.RETREAT:
+            player.retreat(self.pokemon_at(player, action.target))
+        elif kind is ActionType.ATTACK:
+            player.attack(action.index, opponent)
+            self.resolve_knockouts()
+            if not self.game_over:
+                self.end_turn()
+        elif kind is ActionType.END_TURN:
+            self.end_turn()
+
+    def is_terminal(self) -> bool:
+        """Check if the game has ended."""
+        return self.game_over
+
+    def describe(self, action: Action) -> str:
+        """Describe an action of the acting player for display."""
+        player = self.acting_player
+        kind = action.type
+        card = player.hand[action.card].name if 0 <= action.card < len(player.hand) else None
+        target = self.pokemon_at(player, action.target) if action.target >= 0 else None
+        if kind is ActionType.CHOOSE_ACTIVE:
+            return f"Put {card} in the Active Spot"
+        if kind in (ActionType.SETUP_BENCH, ActionType.PLAY_BASIC):
+            return f"Put {card} on the Bench"
+        if kind is ActionType.END_SETUP:
+            return "Done placing Pokémon"
+        if kind is ActionType.ATTACH_ENERGY:
+            return f"Attach {player.energy_type.name} energy to {target.name}"
+        if kind is ActionType.EVOLVE:
+            return f"Evolve {target.name} into {card}"
+        if kind is ActionType.USE_ABILITY:
+            return f"Use {target.name}'s ability {target.ability.name}"
+        if kind is ActionType.PLAY_SUPPORTER:
+            return f"Play Supporter {card}"
+        if kind is ActionType.PLAY_ITEM:
+            return f"Play Item {card}"
+        if kind is ActionType.ATTACH_TOOL:
+            return f"Attach Tool {card} to {target.name}"
+        if kind is ActionType.RETREAT:
+            return f"Retreat {player.active.name} (cost {player.active.retreat_cost}) for {target.name}"
+        if kind is ActionType.ATTACK:
+            attack = player.active.attacks[action.index]
+            return f"Attack with {attack.name} (Damage: {attack.damage}, Cost: {attack.cost_types})"
+        return "End turn"
+
+    # ----- Turn structure -----
+
+    def begin_turn(self) -> None:
+        """Start the current player's turn: draw a card and gain energy.
+
+        The first player skips both on the very first turn of the game.
+        """
+        player = self.current_player
+        if self.events.enabled:
+            self.events.emit(TurnStarted(player.name, self.turn))
+        if self.turn > 0:
+            player.draw_card()
+            player.energy += 1
+            player.energy_type = PokemonType.GRASS
+            player.next_energy_type = PokemonType.GRASS
+
+    def end_turn(self) -> None:
+        """Run Pokemon Checkup, reset the turn flags and pass the turn."""
+        player = self.current_player
+        self.handle_status_effects(player)
+        self.resolve_knockouts()
+        if self.game_over:
+            return
+        player.supporter_used = False
+        player.retreated_this_turn = False
+        for pokemon in ([player.active] + player.bench):
             if pokemon:
                 pokemon.evolved_this_turn = False
-        current_player.choose_active()  # Auto-promote if needed
+                pokemon.ability_used = False
+        player.index_board()
         self.turn += 1
+        if self.turn >= MAX_TURNS:
+            self.game_over = True  # Stalled game, ends in a draw
+            if self.events.enabled:
+                self.events.emit(GameEnded(None))
+            return
+        self.begin_turn()
 
-        # Show both players' full board state at the end of the turn
-        self.display_full_board()
+    def resolve_knockouts(self) -> None:
+        """Score knocked out Pokemon, promote replacements and check for the end of the game."""
+        player = self.current_player
+        opponent = self.players[1 - self.players.index(player)]
+        player.points += opponent.remove_knocked_out()
+        opponent.points += player.remove_knocked_out()
+        for p in self.players:
+            p.choose_active()  # Auto-promote the first Bench Pokemon
+        scores = [p.points >= 3 for p in self.players]
+        no_pokemon = [p.active is None for p in self.players]
+        if any(scores) or any(no_pokemon):
+            self.game_over = True
+            wins = [scores[i] or (no_pokemon[1 - i] and not no_pokemon[i]) for i in range(2)]
+            if wins[0] != wins[1]:
+                self.winner = 0 if wins[0] else 1
+            if self.events.enabled:
+                self.events.emit(GameEnded(self.get_winner()))
 
     def handle_status_effects(self, player: Player) -> None:
-        """Handle status conditions at the start of turn."""
-        if player.active:
-            if player.active.status == StatusCondition.SLEEP:
-                if random.choice([True, False]):  # Coin flip
-                    player.active.status = StatusCondition.NONE
-                    print(f"{player.active.name} woke up!")
-                else:
-                    print(f"{player.active.name} is still asleep")
-            
-            elif player.active.status == StatusCondition.BURN:
-                player.active.hp -= 20
-                if random.choice([True, False]):  # Coin flip
-                    player.active.status = StatusCondition.NONE
-                    print(f"{player.active.name} is no longer burned")
-            
-            elif player.active.status == StatusCondition.POISON:
-                player.active.hp -= 10
-                print(f"{player.active.name} took 10 damage from poison")
-            
-            elif player.active.status == StatusCondition.PARALYSIS:
-                player.active.status = StatusCondition.NONE
-                print(f"{player.active.name} is no longer paralyzed")
+        """Handle status conditions during Pokemon Checkup."""
+        poke = player.active
+        if not poke:
+            return
+        events = self.events
+        status = poke.status
+        if status == StatusCondition.SLEEP:
+            if self.rng.flip():
+                poke.status = StatusCondition.NONE
+                if events.enabled:
+                    events.emit(StatusRemoved(player.name, poke.name, status))
+            elif events.enabled:
+                events.emit(StatusKept(player.name, poke.name, status))
+
+        elif status == StatusCondition.BURN:
+            poke.hp -= 20
+            if events.enabled:
+                events.emit(DamageDealt(player.name, poke.name, 20, poke.hp, poke.max_hp, 'burn'))
+            if self.rng.flip():
+                poke.status = StatusCondition.NONE
+                if events.enabled:
+                    events.emit(StatusRemoved(player.name, poke.name, status))
+
+        elif status == StatusCondition.POISON:
+            poke.hp -= 10
+            if events.enabled:
+                events.emit(DamageDealt(player.name, poke.name, 10, poke.hp, poke.max_hp, 'poison'))
+
+        elif status == StatusCondition.PARALYSIS:
+            poke.status = StatusCondition.NONE
+            if events.enabled:
+                events.emit(StatusRemoved(player.name, poke.name, status))
 
     def is_game_over(self) -> bool:
         """Check if the game is over."""
-        return any(p.points >= 3 for p in self.players)
+        return self.game_over
 
     def get_winner(self) -> Optional[str]:
         """Get the name of the winning player, if any."""
-        for p in self.players:
-            if p.points >= 3:
-                return p.name
-        return None
+        return self.players[self.winner].name if self.winner is not None else None
 
     @property
     def player1(self) -> Player:
@@ -374,31 +452,7 @@ class GameEngine:
 
     def get_valid_active_choices(self, player: Player) -> List[PokemonCard]:
         """Get list of valid Pokemon that can be played as active."""
-        return [card for card in player.hand 
-                if isinstance(card, PokemonCard) and not card.can_evolve_from]
-
-    def choose_active_pokemon(self, player: Player, card_index: int) -> bool:
-        """Choose a Pokemon from hand as active. Returns True if successful."""
-        if not self.setup_phase:
-            return False
-            
-        valid_choices = self.get_valid_active_choices(player)
-        if not (0 <= card_index < len(valid_choices)):
-            return False
-            
-        chosen_card = valid_choices[card_index]
-        player.hand.remove(chosen_card)
-        player.active = chosen_card
-        
-        # Mark this player's setup as complete
-        player_idx = self.players.index(player)
-        self.setup_complete[player_idx] = True
-        
-        # Check if setup phase is complete
-        if all(self.setup_complete):
-            self.setup_phase = False
-            
-        return True
+        return list(player.hand.basics.values())
 
     @property
     def needs_setup(self) -> bool:
@@ -0,0 +1,319 @@
+"""
+Structured game events.
+
+The rules code reports what happens (damage, knockouts, status changes, ...)
+as typed events on the EventBus of the game instead of printing. Events are
+only created when something is subscribed, so emitting sites follow the
+pattern:
+
+    events = player.events
+    if events.enabled:
+        events.emit(DamageDealt(...))
+
+and a game without subscribers pays a single attribute check per site.
+ConsoleLogger prints the classic text output of the game.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Type
+
+from ..models.enums import StatusCondition
+
+# Status words as printed on the cards
+STATUS_TEXT = {
+    StatusCondition.POISON: 'Poisoned',
+    StatusCondition.BURN: 'Burned',
+    StatusCondition.SLEEP: 'Asleep',
+    StatusCondition.PARALYSIS: 'Paralyzed',
+    StatusCondition.CONFUSION: 'Confused',
+}
+
+
+@dataclass(frozen=True)
+class Event:
+    """Base class of all game events. player is the name of the player concerned."""
+    player: str
+
+    def text(self) -> Optional[str]:
+        """Console text of the event, or None if it is not shown."""
+        return None
+
+
+@dataclass(frozen=True)
+class TurnStarted(Event):
+    turn: int
+
+
+@dataclass(frozen=True)
+class CardsDrawn(Event):
+    count: int
+    by_effect: bool = False
+
+    def text(self) -> Optional[str]:
+        return f"Drew {self.count} card(s)." if self.by_effect else None
+
+
+@dataclass(frozen=True)
+class PokemonBenched(Event):
+    pokemon: str
+
+    def text(self) -> Optional[str]:
+        return f"{self.player} played {self.pokemon} to the bench."
+
+
+@dataclass(frozen=True)
+class PokemonPromoted(Event):
+    pokemon: str
+
+    def text(self) -> Optional[str]:
+        return f"{self.player} promoted {self.pokemon} to the Active Spot."
+
+
+@dataclass(frozen=True)
+class EnergyAttached(Event):
+    pokemon: str
+    energy_type: str
+    count: int = 1
+
+    def text(self) -> Optional[str]:
+        count = '' if self.count == 1 else f"{self.count} "
+        return f"Attached {count}{self.energy_type} energy to {self.pokemon}."
+
+
+@dataclass(frozen=True)
+class EnergyDiscarded(Event):
+    pokemon: str
+    count: int
+    at_random: bool = False
+
+    def text(self) -> Optional[str]:
+        if self.at_random:
+            return f"Discarded a random energy from {self.pokemon}."
+        return f"Discarded {self.count} energy from {self.pokemon}."
+
+
+@dataclass(frozen=True)
+class Evolved(Event):
+    pokemon: str
+    evolution: str
+
+    def text(self) -> Optional[str]:
+        return f"{self.player} evolved {self.pokemon} into {self.evolution}!"
+
+
+@dataclass(frozen=True)
+class Retreated(Event):
+    pokemon: str
+    new_active: str
+
+    def text(self) -> Optional[str]:
+        return f"{self.player} retreated to {self.new_active}."
+
+
+@dataclass(frozen=True)
+class AbilityUsed(Event):
+    pokemon: str
+    ability: str
+
+    def text(self) -> Optional[str]:
+        return f"{self.player}'s {self.pokemon} uses {self.ability}!"
+
+
+@dataclass(frozen=True)
+class TrainerPlayed(Event):
+    card: str
+    kind: str  # "Supporter", "Item" or "Tool"
+    target: Optional[str] = None
+
+    def text(self) -> Optional[str]:
+        if self.kind == "Tool":
+            return f"{self.player} attached tool {self.card} to {self.target}."
+        return f"{self.player} uses {self.kind}: {self.card}"
+
+
+@dataclass(frozen=True)
+class AttackUsed(Event):
+    pokemon: str
+    attack: str
+
+    def text(self) -> Optional[str]:
+        return f"{self.player}'s {self.pokemon} uses {self.attack}!"
+
+
+@dataclass(frozen=True)
+class CoinFlipped(Event):
+    flips: int
+    heads: int
+
+    def text(self) -> Optional[str]:
+        if self.flips == 1:
+            return "Coin flip heads!" if self.heads else "Coin flip tails."
+        return f"{self.heads} heads!"
+
+
+@dataclass(frozen=True)
+class DamageModified(Event):
+    pokemon: str
+    before: int
+    after: int
+
+    def text(self) -> Optional[str]:
+        if self.after > self.before:
+            return f"+{self.after - self.before} damage!"
+        if self.after == 0 and self.before > 0:
+            return "The attack does nothing."
+        return None
+
+
+@dataclass(frozen=True)
+class DamageDealt(Event):
+    """Damage to a Pokemon of player; source is what caused it."""
+    pokemon: str
+    amount: int
+    hp: int
+    max_hp: int
+    source: str = 'attack'  # attack, effect, bench, self, confusion, poison, burn
+
+    def text(self) -> Optional[str]:
+        if self.source == 'attack':
+            return f"{self.pokemon} takes {self.amount} damage! (HP now {self.hp}/{self.max_hp})"
+        if self.source == 'bench':
+            return f"{self.pokemon} takes {self.amount} damage on the bench!"
+        if self.source == 'self':
+            return f"{self.pokemon} does {self.amount} damage to itself."
+        if self.source == 'confusion':
+            return f"{self.pokemon} hurt itself in confusion!"
+        if self.source in ('poison', 'burn'):
+            return f"{self.pokemon} took {self.amount} damage from {self.source}"
+        return f"{self.pokemon} takes {self.amount} damage!"
+
+
+@dataclass(frozen=True)
+class Healed(Event):
+    pokemon: str
+    amount: int
+
+    def text(self) -> Optional[str]:
+        return f"{self.pokemon} healed {self.amount} HP!"
+
+
+@dataclass(frozen=True)
+class StatusApplied(Event):
+    pokemon: str
+    status: StatusCondition
+
+    def text(self) -> Optional[str]:
+        return f"{self.pokemon} is now {STATUS_TEXT[self.status]}!"
+
+
+@dataclass(frozen=True)
+class StatusRemoved(Event):
+    pokemon: str
+    status: StatusCondition
+
+    def text(self) -> Optional[str]:
+        if self.status == StatusCondition.SLEEP:
+            return f"{self.pokemon} woke up!"
+        return f"{self.pokemon} is no longer {STATUS_TEXT[self.status].lower()}"
+
+
+@dataclass(frozen=True)
+class StatusKept(Event):
+    pokemon: str
+    status: StatusCondition
+
+    def text(self) -> Optional[str]:
+        return f"{self.pokemon} is still {STATUS_TEXT[self.status].lower()}"
+
+
+@dataclass(frozen=True)
+class CardSearched(Event):
+    card: Optional[str]  # None if nothing matched
+
+    def text(self) -> Optional[str]:
+        if self.card is None:
+            return "No matching Pokémon found in deck."
+        return f"Put {self.card} into your hand from your deck."
+
+
+@dataclass(frozen=True)
+class KnockedOut(Event):
+    pokemon: str
+    points: int
+
+    def text(self) -> Optional[str]:
+        return f"{self.pokemon} is knocked out!"
+
+
+@dataclass(frozen=True)
+class EffectFailed(Event):
+    reason: str
+
+    def text(self) -> Optional[str]:
+        return self.reason
+
+
+@dataclass(frozen=True)
+class GameEnded(Event):
+    """player is the winner's name, or None on a draw."""
+    player: Optional[str]
+
+
+Subscriber = Callable[[Event], None]
+
+
+class EventBus:
+    """Dispatches events to subscribers, optionally filtered by event type."""
+
+    __slots__ = ('enabled', '_all', '_by_type')
+
+    def __init__(self):
+        """Create a bus without subscribers."""
+        self.enabled = False  # True while anything is subscribed
+        self._all: List[Subscriber] = []
+        self._by_type: Dict[Type[Event], List[Subscriber]] = {}
+
+    def subscribe(self, subscriber: Subscriber, *event_types: Type[Event]) -> Subscriber:
+        """Call subscriber with every event, or only with events of the given types."""
+        if event_types:
+            for event_type in event_types:
+                self._by_type.setdefault(event_type, []).append(subscriber)
+        else:
+            self._all.append(subscriber)
+        self.enabled = True
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Stop sending events to a subscriber."""
+        self._all = [s for s in self._all if s is not subscriber]
+        self._by_type = {t: kept for t, subs in self._by_type.items()
+                         for kept in [[s for s in subs if s is not subscriber]] if kept}
+        self.enabled = bool(self._all or self._by_type)
+
+    def emit(self, event: Event) -> None:
+        """Send an event to its subscribers."""
+        for subscriber in self._all:
+            subscriber(event)
+        for subscriber in self._by_type.get(type(event), ()):
+            subscriber(event)
+
+
+class ConsoleLogger:
+    """Subscriber printing events as the game's classic console messages."""
+
+    def __init__(self, write: Callable[[str], None] = print):
+        self.write = write
+
+    def __call__(self, event: Event) -> None:
+        line = event.text()
+        if line is not None:
+            self.write(line)
+
+
+class EventRecorder:
+    """Subscriber keeping every event in a list, e.g. for replays or tools."""
+
+    def __init__(self):
+        self.events: List[Event] = []
+
+    def __call__(self, event: Event) -> None:
+        self.events.append(event)
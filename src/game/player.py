@@ -1,11 +1,16 @@
 """
 Player model for Pokemon TCG Pocket.
 """
-import random
-from typing import List, Optional, cast
+from typing import Dict, List, Optional, Sequence, Union, cast
 
-from ..models.cards import Card, PokemonCard, SupporterCard, ItemCard, ToolCard
+from ..cards.evolution import EMPTY_GRAPH
+from ..models.cards import (Card, EnergyCost, EnergyPool, PokemonCard, SupporterCard, ItemCard, ToolCard, colorless_cost,
+                            compile_cost)
 from ..models.enums import StatusCondition, PokemonType
+from .events import (AbilityUsed, AttackUsed, DamageDealt, EnergyAttached, EventBus, Evolved, KnockedOut,
+                     PokemonBenched, PokemonPromoted, Retreated, TrainerPlayed)
+from .rng import GameRandom
+from .zones import Deck, Hand, Zone
 
 class Player:
     """Represents a player in the game."""
@@ -13,25 +18,72 @@ class Player:
     def __init__(self, name: str):
         """Initialize a player."""
         self.name = name
-        self.deck: List[Card] = []
-        self.hand: List[Card] = []
+        self.deck = Deck()  # Top card last
+        self.hand = Hand()
         self.bench: List[PokemonCard] = []
         self.active: Optional[PokemonCard] = None
+        # Board indexes for move generation, by board position (0 = Active); see index_board()
+        self.occupied: List[int] = []
+        self.tool_free: List[int] = []
+        self.with_ability: List[int] = []
+        self.evolvable: Dict[str, List[int]] = {}  # Species -> Pokemon that have not evolved this turn
         self.energy: int = 0
         self.energy_type: Optional[PokemonType] = None
         self.next_energy_type: Optional[PokemonType] = None
         self.points: int = 0
         self.supporter_used: bool = False
         self.retreated_this_turn: bool = False
-        self.discard_pile: List[Card] = []
-        
+        self.discard_pile = Zone()
+        self.events = EventBus()  # Replaced by the game's bus when the player joins a GameEngine
+        self.rng = GameRandom()  # Likewise replaced by the game's random stream
+        self.evolution = EMPTY_GRAPH  # Likewise replaced by the evolution graph of the game's catalog
+
+    def clone(self) -> 'Player':
+        """Copy the player's zones and counters.
+
+        Pokemon are copied field by field; trainer cards hold no game state and
+        are shared. The copy gets its own EventBus without subscribers.
+        """
+        def copy(card: Card) -> Card:
+            return card.copy() if isinstance(card, PokemonCard) else card
+
+        player = Player.__new__(Player)
+        player.__dict__.update(self.__dict__)
+        player.deck = Deck(copy(card) for card in self.deck)
+        player.hand = Hand((copy(card) for card in self.hand), self.evolution)
+        player.bench = [poke.copy() for poke in self.bench]
+        player.active = self.active.copy() if self.active is not None else None
+        player.discard_pile = Zone(copy(card) for card in self.discard_pile)
+        player.events = EventBus()
+        player.index_board()
+        return player
+
+    def index_board(self) -> None:
+        """Rebuild the board indexes; called after every change to the board.
+
+        The board holds at most 4 Pokemon, so this is constant time.
+        """
+        self.occupied = occupied = []
+        self.tool_free = tool_free = []
+        self.with_ability = with_ability = []
+        self.evolvable = evolvable = {}
+        for pos, poke in enumerate([self.active] + self.bench):
+            if poke is None:
+                continue
+            occupied.append(pos)
+            if poke.attached_tool is None:
+                tool_free.append(pos)
+            if poke.ability is not None:
+                with_ability.append(pos)
+            if not poke.evolved_this_turn:
+                evolvable.setdefault(poke.name, []).append(pos)
+
     def draw_card(self) -> Optional[Card]:
         """Draw a card from the deck."""
-        if self.deck:
-            drawn = self.deck.pop(0)
+        drawn = self.deck.draw()
+        if drawn is not None:
             self.hand.append(drawn)
-            return drawn
-        return None
+        return drawn
 
     def draw_cards(self, count: int) -> List[Card]:
         """Draw multiple cards from the deck."""
@@ -48,22 +100,25 @@ class Player:
             card.turn_played = turn
             self.bench.append(card)
             self.hand.remove(card)
+            self.index_board()
+            if self.events.enabled:
+                self.events.emit(PokemonBenched(self.name, card.name))
             return True
         return False
 
     def evolve_pokemon(self, evolution: PokemonCard, target: PokemonCard, turn: int) -> bool:
         """Evolve a Pokemon with an evolution card."""
-        if (evolution.can_evolve_from == target.name and 
-            target.can_evolve(turn) and not target.evolved_this_turn):
+        if (self.evolution.parent_of_card(evolution) == target.name
+                and target.can_evolve(turn) and not target.evolved_this_turn):
             # Keep the tool and attached energy
             evolution.attached_tool = target.attached_tool
-            evolution.attached_energy = dict(getattr(target, 'attached_energy', {}))
+            evolution.attached_energy = EnergyPool(target.attached_energy)
             evolution.status = target.status
             evolution.turn_played = turn
             evolution.evolved_this_turn = True
             
             # Replace the target with evolution
-            if target == self.active:
+            if target is self.active:
                 self.active = evolution
             else:
                 idx = self.bench.index(target)
@@ -71,6 +126,9 @@ class Player:
                 
             self.hand.remove(evolution)
             self.discard_pile.append(target)
+            self.index_board()
+            if self.events.enabled:
+                self.events.emit(Evolved(self.name, target.name, evolution.name))
             return True
         return False
 
@@ -78,100 +136,97 @@ class Player:
         """Choose a Pokemon from the bench to be active."""
         if not self.active and self.bench:
             self.active = self.bench.pop(0)
+            self.index_board()
+            if self.events.enabled:
+                self.events.emit(PokemonPromoted(self.name, self.active.name))
 
     def attach_energy(self, pokemon: PokemonCard, energy_type: PokemonType) -> bool:
         """Attach energy to a Pokemon."""
         if self.energy > 0:
-            if not hasattr(pokemon, 'attached_energy'):
-                pokemon.attached_energy = {}
             pokemon.attached_energy[energy_type] = pokemon.attached_energy.get(energy_type, 0) + 1
             self.energy -= 1
-            print(f"Attached {energy_type.name} energy to {pokemon.name}.")
+            if self.events.enabled:
+                self.events.emit(EnergyAttached(self.name, pokemon.name, energy_type.name))
             return True
         return False
 
-    def can_pay_cost(self, pokemon: PokemonCard, cost_types: list) -> bool:
-        """Check if the cost for an attack or retreat can be paid."""
-        if not hasattr(pokemon, 'attached_energy'):
-            return False
-        attached = dict(pokemon.attached_energy)
-        for c in cost_types:
-            if c == 'Colorless':
-                # Use any available energy
-                if sum(attached.values()) == 0:
-                    return False
-                # Remove one energy of any type
-                for t in list(attached.keys()):
-                    if attached[t] > 0:
-                        attached[t] -= 1
-                        break
-            else:
-                t = PokemonType[c.upper()] if c.upper() in PokemonType.__members__ else None
-                if not t or attached.get(t, 0) == 0:
-                    return False
-                attached[t] -= 1
-        return True
+    def can_pay_cost(self, pokemon: PokemonCard, cost: Union[EnergyCost, Sequence[str]]) -> bool:
+        """Check if the cost for an attack or retreat can be paid.
 
-    def pay_cost(self, pokemon: PokemonCard, cost_types: list) -> bool:
-        """Pay the cost for an attack or retreat."""
-        if not hasattr(pokemon, 'attached_energy'):
-            return False
+        cost is a compiled EnergyCost, or energy names like ["Grass", "Colorless"].
+        """
+        if not isinstance(cost, EnergyCost):
+            cost = compile_cost(cost)
+        return cost.payable(pokemon.attached_energy)
+
+    def pay_cost(self, pokemon: PokemonCard, cost: Union[EnergyCost, Sequence[str]]) -> bool:
+        """Pay the cost for an attack or retreat: typed energy first, Colorless from what is left.
+
+        Colorless is paid in PokemonType order, never in the order energy was
+        attached, so the energy left over only depends on the board (and
+        matches CompactEngine and restored snapshots).
+        """
+        if not isinstance(cost, EnergyCost):
+            cost = compile_cost(cost)
         attached = pokemon.attached_energy
-        for c in cost_types:
-            if c == 'Colorless':
-                for t in list(attached.keys()):
-                    if attached[t] > 0:
-                        attached[t] -= 1
-                        break
-            else:
-                t = PokemonType[c.upper()] if c.upper() in PokemonType.__members__ else None
-                if not t or attached.get(t, 0) == 0:
-                    return False
-                attached[t] -= 1
+        if not cost.payable(attached):
+            return False
+        for t, n in cost.typed:
+            attached[t] -= n
+        remaining = cost.colorless
+        for t in PokemonType:
+            if not remaining:
+                break
+            n = attached.get(t, 0)
+            if n > 0:
+                paid = min(n, remaining)
+                attached[t] = n - paid
+                remaining -= paid
         return True
 
     def can_attack_with(self, pokemon: PokemonCard, attack_idx: int) -> bool:
         """Check if a Pokemon can attack."""
-        if not pokemon or not hasattr(pokemon, 'attached_energy'):
+        if not pokemon:
             return False
-        if attack_idx >= len(pokemon.attacks):
-            return False
-        return self.can_pay_cost(pokemon, pokemon.attacks[attack_idx].cost_types)
+        return attack_idx in pokemon.payable_attacks()
 
-    def can_retreat(self, pokemon: PokemonCard, retreat_cost: int, retreat_types: list) -> bool:
-        """Check if a Pokemon can retreat."""
-        # For now, treat retreat cost as colorless
-        if not hasattr(pokemon, 'attached_energy'):
-            return False
-        total_energy = sum(pokemon.attached_energy.values())
-        return total_energy >= retreat_cost
+    def can_retreat(self, pokemon: PokemonCard, retreat_cost: Optional[int] = None, retreat_types: list = ()) -> bool:
+        """Check if a Pokemon can retreat (retreat costs are Colorless)."""
+        cost = pokemon.definition.retreat if retreat_cost is None else colorless_cost(retreat_cost)
+        return cost.payable(pokemon.attached_energy)
 
     def retreat(self, pokemon_to_active: PokemonCard) -> bool:
         """Retreat the active Pokemon to the bench."""
-        if (not self.retreated_this_turn and self.active and self.can_retreat(self.active, getattr(self.active, 'retreat_cost', 1), ['Colorless'])
-            and pokemon_to_active in self.bench):
-            # Pay retreat cost (remove energy)
-            attached = self.active.attached_energy
-            cost = getattr(self.active, 'retreat_cost', 1)
-            for _ in range(cost):
-                for t in list(attached.keys()):
-                    if attached[t] > 0:
-                        attached[t] -= 1
-                        break
+        if (not self.retreated_this_turn and self.active and self.can_retreat(self.active)
+                and pokemon_to_active in self.bench):
+            self.pay_cost(self.active, self.active.definition.retreat)
             idx = self.bench.index(pokemon_to_active)
             self.bench[idx] = self.active
             self.active = pokemon_to_active
             self.retreated_this_turn = True
-            print(f"{self.name} retreated to {self.active.name}.")
+            self.index_board()
+            if self.events.enabled:
+                self.events.emit(Retreated(self.name, self.bench[idx].name, self.active.name))
+            return True
+        return False
+
+    def use_ability(self, pokemon: PokemonCard, opponent: 'Player') -> bool:
+        """Activate the ability of one of this player's Pokemon in play."""
+        if (pokemon is self.active or any(pokemon is poke for poke in self.bench)) and pokemon.can_use_ability():
+            if self.events.enabled:
+                self.events.emit(AbilityUsed(self.name, pokemon.name, pokemon.ability.name))
+            pokemon.ability_used = True
+            pokemon.ability.effect(self, opponent, pokemon)
             return True
         return False
 
     def play_supporter(self, card: SupporterCard) -> bool:
         """Play a Supporter card."""
         if not self.supporter_used and card in self.hand:
-            print(f"{self.name} uses Supporter: {card.name}")
-            card.effect(self)  # Apply effect
+            if self.events.enabled:
+                self.events.emit(TrainerPlayed(self.name, card.name, "Supporter"))
             self.hand.remove(card)
+            card.effect(self)  # Apply effect
             self.discard_pile.append(card)
             self.supporter_used = True
             return True
@@ -180,9 +235,10 @@ class Player:
     def play_item(self, card: ItemCard, target: Optional[PokemonCard] = None) -> bool:
         """Play an Item card."""
         if card in self.hand:
-            print(f"{self.name} uses Item: {card.name}")
-            card.effect(self, target)  # Apply effect
+            if self.events.enabled:
+                self.events.emit(TrainerPlayed(self.name, card.name, "Item", target.name if target else None))
             self.hand.remove(card)
+            card.effect(self, target)  # Apply effect
             self.discard_pile.append(card)
             return True
         return False
@@ -194,6 +250,9 @@ class Player:
                 self.discard_pile.append(pokemon.attached_tool)
             pokemon.attached_tool = tool
             self.hand.remove(tool)
+            self.index_board()
+            if self.events.enabled:
+                self.events.emit(TrainerPlayed(self.name, tool.name, "Tool", pokemon.name))
             return True
         return False
 
@@ -205,6 +264,7 @@ class Player:
             self.active = None
             if self.bench:
                 self.active = self.bench.pop(0)
+            self.index_board()
 
     def update_status_conditions(self) -> None:
         """Update status conditions for all Pokemon."""
@@ -216,12 +276,12 @@ class Player:
                 pokemon.hp -= 10
             elif pokemon.status == StatusCondition.BURN:
                 pokemon.hp -= 20
-                if random.choice([True, False]):  # Coin flip
+                if self.rng.flip():
                     pokemon.status = StatusCondition.NONE
             elif pokemon.status == StatusCondition.PARALYSIS:
                 pokemon.status = StatusCondition.NONE
             elif pokemon.status == StatusCondition.SLEEP:
-                if random.choice([True, False]):  # Coin flip
+                if self.rng.flip():
                     pokemon.status = StatusCondition.NONE
 
     def can_attack(self) -> bool:
@@ -239,41 +299,62 @@ class Player:
             return False
         
         attack = self.active.attacks[attack_index]
-        print(f"{self.name}'s {self.active.name} uses {attack.name}!")
-
-        # Calculate base damage
-        damage = attack.damage
-        # Check for coin flip bonus damage (set by effect)
-        bonus = getattr(self.active, '_bonus_damage', 0)
-        if bonus:
-            damage += bonus
-            if hasattr(self.active, '_bonus_damage'):
-                delattr(self.active, '_bonus_damage')  # Remove after use
-        if opponent.active.weakness == self.active.pokemon_type:
-            damage += 20
+        events = self.events
+        if events.enabled:
+            events.emit(AttackUsed(self.name, self.active.name, attack.name))
 
         # TODO: Check for active item/tool/supporter effects that prevent or reduce damage
         # (Add hooks here in the future)
 
         # Handle confusion
         if self.active.status == StatusCondition.CONFUSION:
-            if random.random() < 0.5:  # 50% chance
-                print(f"{self.active.name} hurt itself in confusion!")
+            if self.rng.flip():
                 self.active.hp -= 30
+                if events.enabled:
+                    events.emit(DamageDealt(self.name, self.active.name, 30, self.active.hp, self.active.max_hp,
+                                            'confusion'))
                 return True
 
+        # Calculate damage: base, then effect modifiers (coin flips, conditional bonuses)
+        damage = attack.damage
+        modify_damage = getattr(attack.effect, 'modify_damage', None)
+        if modify_damage is not None:
+            damage = modify_damage(self, opponent, damage)
+        if damage > 0 and opponent.active.weakness == self.active.pokemon_type:
+            damage += 20
+
         # Deal damage (unless prevented/reduced by effects)
-        opponent.active.hp -= damage
-        print(f"{opponent.active.name} takes {damage} damage! (HP now {opponent.active.hp}/{opponent.active.max_hp})")
+        if damage > 0:
+            target = opponent.active
+            target.hp -= damage
+            if events.enabled:
+                events.emit(DamageDealt(opponent.name, target.name, damage, target.hp, target.max_hp))
 
         # Apply attack effects if any
         if attack.effect:
             attack.effect(self, opponent)
 
-        # Check for knockout
-        if opponent.active.is_knocked_out():
-            print(f"{opponent.active.name} is knocked out!")
-            self.points += 2 if opponent.active.is_ex else 1
-            opponent.active = None
+        # Check for knockouts; effects can also hit benched Pokemon or the attacker itself
+        self.points += opponent.remove_knocked_out()
+        opponent.points += self.remove_knocked_out()
 
         return True
+
+    def remove_knocked_out(self) -> int:
+        """Discard all knocked out Pokemon in play and return the points they give the opponent."""
+        points = 0
+        if self.active and self.active.is_knocked_out():
+            points += 2 if self.active.is_ex else 1
+            if self.events.enabled:
+                self.events.emit(KnockedOut(self.name, self.active.name, 2 if self.active.is_ex else 1))
+            self.discard_pile.append(self.active)
+            self.active = None
+        for poke in [poke for poke in self.bench if poke.is_knocked_out()]:
+            points += 2 if poke.is_ex else 1
+            if self.events.enabled:
+                self.events.emit(KnockedOut(self.name, poke.name, 2 if poke.is_ex else 1))
+            self.bench.remove(poke)
+            self.discard_pile.append(poke)
+        if points:
+            self.index_board()
+        return points
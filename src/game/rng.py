@@ -0,0 +1,86 @@
+"""
+Per-game random number streams.
+
+Every GameEngine owns a GameRandom seeded from a single integer; the engine
+hands it to its players, and all rule and effect code (shuffles, coin flips,
+random choices) draws from it. A game is replayed exactly by creating an
+engine with the same seed and applying the same actions, and independent
+games never share state, so workers can run them in parallel.
+
+Coin flips can be drawn in batches: with coin_batch=N one getrandbits(N)
+call is unpacked into the next N flips (a list pop per flip instead of a
+random() call). The pending flips are part of getstate(), so saved states
+replay exactly either way.
+"""
+import hashlib
+import random
+from typing import List, Optional
+
+_ONE = ord('1')
+
+
+def new_seed() -> int:
+    """Pick a fresh 64-bit game seed (from the global random module, so random.seed() still pins it)."""
+    return random.getrandbits(64)
+
+
+def stream_seed(seed: int, index: int) -> int:
+    """Derive the seed of independent stream number index from a master seed.
+
+    Streams of consecutive indices are unrelated, so e.g. game i of a batch
+    or worker i of a pool can use stream_seed(master, i).
+    """
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class GameRandom(random.Random):
+    """The random stream of one game, with coin flips that can be pre-drawn in batches."""
+
+    def __init__(self, seed: Optional[int] = None, coin_batch: int = 0):
+        """Create a stream from a seed (a fresh one if None); coin_batch > 0 pre-draws that many flips at once."""
+        self.coin_batch = coin_batch
+        self._pending: List[bool] = []  # Pre-drawn flips, next one last
+        self.initial_seed = new_seed() if seed is None else seed
+        super().__init__(self.initial_seed)
+
+    def seed(self, a=None, version: int = 2) -> None:
+        """Reseed the stream, dropping any pre-drawn flips."""
+        super().seed(a, version)
+        self._pending = []
+
+    def getstate(self) -> tuple:
+        """Full state, including pre-drawn flips."""
+        return super().getstate(), tuple(self._pending)
+
+    def setstate(self, state: tuple) -> None:
+        """Restore a state from getstate()."""
+        base, pending = state
+        super().setstate(base)
+        self._pending = list(pending)
+
+    def flip(self) -> bool:
+        """Flip a coin; True is heads."""
+        if not self.coin_batch:
+            return self.random() < 0.5
+        pending = self._pending
+        if not pending:
+            bits = format(self.getrandbits(self.coin_batch), 'b').zfill(self.coin_batch)
+            pending.extend(map(_ONE.__eq__, bits.encode()))
+        return pending.pop()
+
+    def heads(self, coins: int) -> int:
+        """Flip several coins and count the heads."""
+        flip = self.flip
+        return sum(flip() for _ in range(coins))
+
+    def copy(self) -> 'GameRandom':
+        """An independent copy at the same position of the stream."""
+        rng = GameRandom(self.initial_seed, self.coin_batch)
+        rng.setstate(self.getstate())
+        return rng
+
+    def spawn(self, index: int, coin_batch: Optional[int] = None) -> 'GameRandom':
+        """Create independent stream number index derived from this stream's seed."""
+        return GameRandom(stream_seed(self.initial_seed, index),
+                          self.coin_batch if coin_batch is None else coin_batch)
@@ -0,0 +1,180 @@
+"""
+Binary snapshots of running games.
+
+A snapshot holds everything needed to continue a GameEngine game exactly:
+the board, zones and counters as a CompactState snapshot, plus what the
+compact state leaves out (player names, deck lists, each player's Energy
+types and the position of the game's random stream). Cards are stored as
+catalog indices, never as pickled objects, so a snapshot is a few kilobytes
+(mostly the random stream's state), reads back in well under a millisecond
+and can move between processes that load the same catalog.
+
+Layout (little-endian), behind a magic and a version byte:
+
+- catalog size and fingerprint (see CardCatalog.fingerprint), coin batch
+  size and the stream's initial seed;
+- per player: name, Energy Zone types and deck (catalog indices);
+- the random stream: Mersenne Twister words, cached gauss value and any
+  pre-drawn coin flips;
+- the CompactState snapshot.
+"""
+import random
+import struct
+import sys
+from array import array
+from typing import List, Optional, Tuple
+
+from ..cards.catalog import CardCatalog, get_catalog
+from ..models.cards import EnergyPool, PokemonCard
+from .compact import (ABILITY_USED, EMPTY, EVOLVED, NUM_TYPES, RETREATED, SETUP_DONE, SLOTS, STATUSES,
+                      SUPPORTER_USED, TYPE_INDEX, TYPES, CompactState)
+from .player import Player
+from .rng import GameRandom
+from .zones import Deck, Hand, Zone
+
+GAME_SNAPSHOT_MAGIC = b'PTGE'
+GAME_SNAPSHOT_VERSION = 2
+NO_TYPE = 0xFF  # Energy type not set
+
+_HEADER = struct.Struct('<4sBH8sHB')  # magic, version, catalog size, catalog fingerprint, coin batch, seed length
+_GAUSS = struct.Struct('<?d')
+_U16 = struct.Struct('<H')
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def _le_bytes(typecode: str, values) -> bytes:
+    arr = array(typecode, values)
+    if _BIG_ENDIAN:
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class _Reader:
+    """Sequential reads from a snapshot, raising ValueError past its end."""
+
+    def __init__(self, data: bytes):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def take(self, size: int) -> memoryview:
+        end = self.offset + size
+        if end > len(self.view):
+            raise ValueError("Truncated game snapshot")
+        chunk = self.view[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        return fmt.unpack(self.take(fmt.size))
+
+    def array(self, typecode: str, count: int) -> array:
+        arr = array(typecode)
+        arr.frombytes(self.take(count * arr.itemsize))
+        if _BIG_ENDIAN:
+            arr.byteswap()
+        return arr
+
+
+def game_to_bytes(game) -> bytes:
+    """Serialize a GameEngine. Raises ValueError if it holds cards a snapshot cannot store (trainers, tools)."""
+    for player in game.players:
+        for poke in [player.active] + player.bench:
+            if poke is not None and poke.attached_tool is not None:
+                raise ValueError("Game snapshots cannot store attached Tools")
+    state = CompactState.from_game(game)
+    rng = game.rng
+    seed = rng.initial_seed
+    seed_bytes = seed.to_bytes((seed.bit_length() + 8) // 8, 'little', signed=True)
+    parts: List[bytes] = [_HEADER.pack(GAME_SNAPSHOT_MAGIC, GAME_SNAPSHOT_VERSION, len(game.catalog),
+                                       game.catalog.fingerprint, rng.coin_batch, len(seed_bytes)), seed_bytes]
+    for player, deck in zip(game.players, game.decks or ((), ())):
+        name = player.name.encode('utf-8')
+        parts += [_U16.pack(len(name)), name,
+                  bytes(NO_TYPE if t is None else TYPE_INDEX[t] for t in (player.energy_type, player.next_energy_type)),
+                  _U16.pack(len(deck)), _le_bytes('H', deck)]
+    (_, words, gauss), pending = rng.getstate()
+    parts += [_le_bytes('I', words), _GAUSS.pack(gauss is not None, gauss or 0.0),
+              _U16.pack(len(pending)), bytes(pending), state.to_bytes()]
+    return b''.join(parts)
+
+
+def game_from_bytes(data: bytes, catalog: Optional[CardCatalog] = None):
+    """Rebuild a GameEngine from game_to_bytes() output. Raises ValueError for malformed data.
+
+    The game gets a fresh EventBus; card instances are new (with new uids).
+    Attached energy is restored in PokemonType order, which no rule depends
+    on: costs and discards always go through energy in that order.
+    """
+    from .engine import GameEngine  # The engine module imports this one lazily
+
+    catalog = catalog if catalog is not None else get_catalog()
+    reader = _Reader(data)
+    magic, version, catalog_size, fingerprint, coin_batch, seed_length = reader.unpack(_HEADER)
+    if magic != GAME_SNAPSHOT_MAGIC:
+        raise ValueError("Not a game snapshot")
+    if version != GAME_SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported game snapshot version: {version}")
+    if catalog_size != len(catalog):
+        raise ValueError(f"Game snapshot was made with a catalog of {catalog_size} cards, not {len(catalog)}")
+    if fingerprint != catalog.fingerprint:
+        raise ValueError("Game snapshot was made with a different card catalog")
+    seed = int.from_bytes(reader.take(seed_length), 'little', signed=True)
+    players: List[Tuple[str, tuple, array]] = []
+    for _ in range(2):
+        name = bytes(reader.take(reader.unpack(_U16)[0])).decode('utf-8')
+        energy_types = tuple(None if t == NO_TYPE else TYPES[t] for t in reader.take(2))
+        deck = reader.array('H', reader.unpack(_U16)[0])
+        players.append((name, energy_types, deck))
+    words = reader.array('I', 625)
+    has_gauss, gauss = reader.unpack(_GAUSS)
+    pending = tuple(map(bool, reader.take(reader.unpack(_U16)[0])))
+    state = CompactState.from_bytes(reader.take(len(reader.view) - reader.offset))
+    if any(idx >= catalog_size for zones in (state.deck, state.hand, state.discard) for zone in zones
+           for idx in zone) or max(state.card) >= catalog_size:
+        raise ValueError("Game snapshot refers to cards outside the catalog")
+
+    game = GameEngine(Player(players[0][0]), Player(players[1][0]), catalog, seed=seed, coin_batch=coin_batch)
+    rng: GameRandom = game.rng
+    rng.setstate(((random.Random.VERSION, tuple(words), gauss if has_gauss else None), pending))
+    definitions = catalog.cards
+
+    def card(idx: int) -> PokemonCard:
+        return definitions[idx].create_card()
+
+    for p, (player, (_, (energy_type, next_energy_type), deck)) in enumerate(zip(game.players, players)):
+        pokes: List[Optional[PokemonCard]] = []
+        for i in range(p * SLOTS, (p + 1) * SLOTS):
+            idx = state.card[i]
+            if idx == EMPTY:
+                pokes.append(None)
+                continue
+            poke = card(idx)
+            poke.hp = state.hp[i]
+            poke.status = STATUSES[state.status[i]]
+            poke.turn_played = state.turn_played[i]
+            poke.evolved_this_turn = bool(state.flags[i] & EVOLVED)
+            poke.ability_used = bool(state.flags[i] & ABILITY_USED)
+            energy = state.energy[i * NUM_TYPES:(i + 1) * NUM_TYPES]
+            poke.attached_energy = EnergyPool((TYPES[t], n) for t, n in enumerate(energy) if n)
+            pokes.append(poke)
+        player.active = pokes[0]
+        player.bench = [poke for poke in pokes[1:] if poke is not None]
+        player.deck = Deck(card(idx) for idx in state.deck[p])
+        player.hand = Hand((card(idx) for idx in state.hand[p]), player.evolution)
+        player.discard_pile = Zone(card(idx) for idx in state.discard[p])
+        player.index_board()
+        player.points = state.points[p]
+        player.energy = state.tokens[p]
+        player.supporter_used = bool(state.player_flags[p] & SUPPORTER_USED)
+        player.retreated_this_turn = bool(state.player_flags[p] & RETREATED)
+        player.energy_type = energy_type
+        player.next_energy_type = next_energy_type
+        game.setup_complete[p] = bool(state.player_flags[p] & SETUP_DONE)
+        if deck:  # No decks before setup_game
+            game.decks.append(deck)
+    game.turn = state.turn
+    game.first_player = state.first_player
+    game.setup_phase = state.setup_phase
+    game.game_over = state.game_over
+    game.winner = None if state.winner == EMPTY else state.winner
+    return game
@@ -0,0 +1,201 @@
+"""
+Card zones (deck, hand, discard pile).
+
+Every card instance has a stable integer uid. A Zone keeps its cards in an
+insertion-ordered dict keyed by uid, so adding, membership tests and removal
+of a given card are O(1) and go by identity: two copies of the same card are
+never confused. The order is kept for display and for the positional card
+arguments of actions. A Hand also indexes its cards by category, so move
+generation never has to filter the whole hand.
+"""
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+from ..cards.evolution import EMPTY_GRAPH, EvolutionGraph
+from ..models.cards import Card, ItemCard, PokemonCard, SupporterCard, ToolCard
+
+
+class Zone:
+    """An ordered set of card instances with O(1) add, membership and removal."""
+
+    __slots__ = ('_cards',)
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        """Create a zone holding cards, in order."""
+        self._cards: Dict[int, Card] = {card.uid: card for card in cards}
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards.values())
+
+    def __reversed__(self) -> Iterator[Card]:
+        return reversed(self._cards.values())
+
+    def __contains__(self, card: Card) -> bool:
+        return self._cards.get(getattr(card, 'uid', None)) is card
+
+    def __getitem__(self, position: int) -> Card:
+        """Get the card at a position (small zones: O(position))."""
+        size = len(self._cards)
+        if position < 0:
+            position += size
+        if not 0 <= position < size:
+            raise IndexError("zone position out of range")
+        if position == size - 1:
+            return next(reversed(self._cards.values()))
+        return next(islice(self._cards.values(), position, None))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}([{', '.join(card.name for card in self)}])"
+
+    def get(self, uid: int) -> Optional[Card]:
+        """Get a card of the zone by uid."""
+        return self._cards.get(uid)
+
+    def append(self, card: Card) -> None:
+        """Add a card at the end."""
+        self._cards[card.uid] = card
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        """Add cards at the end, in order."""
+        for card in cards:
+            self._cards[card.uid] = card
+
+    def remove(self, card: Card) -> None:
+        """Remove a card instance; ValueError if it is not in the zone."""
+        if card not in self:
+            raise ValueError(f"{card.name} is not in the zone")
+        del self._cards[card.uid]
+
+    def pop(self, position: int = -1) -> Card:
+        """Remove and return the card at a position (the last one in O(1))."""
+        if position == -1 or position == len(self._cards) - 1:
+            if not self._cards:
+                raise IndexError("pop from an empty zone")
+            return self._cards.popitem()[1]
+        card = self[position]
+        del self._cards[card.uid]
+        return card
+
+    def index(self, card: Card) -> int:
+        """Position of a card instance."""
+        for position, other in enumerate(self._cards.values()):
+            if other is card:
+                return position
+        raise ValueError(f"{card.name} is not in the zone")
+
+    def clear(self) -> None:
+        """Remove every card."""
+        self._cards.clear()
+
+    def reorder(self, cards: Sequence[Card]) -> None:
+        """Replace the order of the zone with a permutation of its cards."""
+        self._cards = {card.uid: card for card in cards}
+
+
+class Deck(Zone):
+    """A deck. It iterates from the bottom: the top card is the last one, so draw() is O(1)."""
+
+    __slots__ = ()
+
+    def draw(self) -> Optional[Card]:
+        """Take the top card, or None if the deck is empty."""
+        return self._cards.popitem()[1] if self._cards else None
+
+    def top(self) -> Optional[Card]:
+        """Look at the top card."""
+        return next(reversed(self._cards.values())) if self._cards else None
+
+    def shuffle(self, rng) -> None:
+        """Shuffle the deck with a random stream."""
+        cards = list(self._cards.values())
+        rng.shuffle(cards)
+        self.reorder(cards)
+
+
+class Hand(Zone):
+    """A hand, indexed by card category.
+
+    basics, evolutions, supporters, items and tools each map uid -> card in
+    hand order and are updated in O(1) on every addition and removal.
+    Pokemon are told apart by the evolution graph of the game's catalog.
+    """
+
+    __slots__ = ('basics', 'evolutions', 'supporters', 'items', 'tools', 'evolution', '_positions')
+
+    def __init__(self, cards: Iterable[Card] = (), evolution: EvolutionGraph = EMPTY_GRAPH):
+        """Create a hand holding cards, in order."""
+        super().__init__(cards)
+        self.evolution = evolution
+        self.basics: Dict[int, PokemonCard] = {}
+        self.evolutions: Dict[int, PokemonCard] = {}
+        self.supporters: Dict[int, SupporterCard] = {}
+        self.items: Dict[int, ItemCard] = {}
+        self.tools: Dict[int, ToolCard] = {}
+        self._positions: Optional[Dict[int, int]] = None
+        for card in self._cards.values():
+            self._index(card)
+
+    def _category(self, card: Card) -> Optional[dict]:
+        if isinstance(card, PokemonCard):
+            return self.basics if self.evolution.is_basic(card) else self.evolutions
+        if isinstance(card, SupporterCard):
+            return self.supporters
+        if isinstance(card, ItemCard):
+            return self.items
+        if isinstance(card, ToolCard):
+            return self.tools
+        return None
+
+    def _index(self, card: Card) -> None:
+        category = self._category(card)
+        if category is not None:
+            category[card.uid] = card
+        self._positions = None
+
+    def _unindex(self, card: Card) -> None:
+        category = self._category(card)
+        if category is not None:
+            del category[card.uid]
+        self._positions = None
+
+    def positions(self) -> Dict[int, int]:
+        """Position of every card, by uid (rebuilt on first use after a change)."""
+        if self._positions is None:
+            self._positions = {uid: i for i, uid in enumerate(self._cards)}
+        return self._positions
+
+    def append(self, card: Card) -> None:
+        """Add a card at the end."""
+        self._cards[card.uid] = card
+        self._index(card)
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        """Add cards at the end, in order."""
+        for card in cards:
+            self.append(card)
+
+    def remove(self, card: Card) -> None:
+        """Remove a card instance; ValueError if it is not in the hand."""
+        super().remove(card)
+        self._unindex(card)
+
+    def pop(self, position: int = -1) -> Card:
+        """Remove and return the card at a position (the last one in O(1))."""
+        card = super().pop(position)
+        self._unindex(card)
+        return card
+
+    def clear(self) -> None:
+        """Remove every card."""
+        super().clear()
+        for category in (self.basics, self.evolutions, self.supporters, self.items, self.tools):
+            category.clear()
+        self._positions = None
+
+    def reorder(self, cards: Sequence[Card]) -> None:
+        """Replace the order of the hand with a permutation of its cards."""
+        self.clear()
+        self.extend(cards)
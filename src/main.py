@@ -1,100 +1,107 @@
 """
 Main entry point for Pokemon TCG Pocket game.
+
+A thin terminal driver over the headless GameEngine API: it shows the board
+and the legal actions of the acting player and applies the chosen one.
 """
+from src.ai.mcts import MCTSAgent
+from src.game.actions import ActionType
 from src.game.engine import GameEngine
+from src.game.events import ConsoleLogger
 from src.game.player import Player
-import random
 
-def choose_starting_pokemon(player):
-    print(f"\n{player.name}, choose your starting Active Pokémon:")
-    basics = [card for card in player.hand if hasattr(card, 'can_evolve_from') and not card.can_evolve_from]
-    for idx, card in enumerate(basics):
-        print(f"\nOption [{idx}]:")
-        print(card.get_full_info())
+
+def pokemon_details(poke):
+    if not poke:
+        return "None"
+    energies = [(t.name, n) for t, n in poke.attached_energy.items() if n > 0]
+    if energies:
+        energy_str = " | Energies: " + ', '.join(f"{t}:{n}" for t, n in energies)
+    else:
+        energy_str = " | Energies: None"
+    tool_str = f" | Tool: {poke.attached_tool.name}" if poke.attached_tool else ""
+    status_str = f" | Status: {poke.status.name}" if poke.status and poke.status.name != 'NONE' else ""
+    return f"{poke.name} (HP: {poke.hp}/{poke.max_hp}){energy_str}{tool_str}{status_str}"
+
+
+def display_full_board(game):
+    """Display both players' full board state, including hand, active, bench, energies, and tools."""
+    for player in game.players:
+        print(f"\n=== {player.name}'s Board ({player.points} points) ===")
+        print(f"Hand ({len(player.hand)}): " + ', '.join(card.name for card in player.hand))
+        print(f"Active: {pokemon_details(player.active)}")
+        if player.bench:
+            print("Bench:")
+            for idx, poke in enumerate(player.bench):
+                print(f"  [{idx}] {pokemon_details(poke)}")
+        else:
+            print("Bench: (empty)")
+        print("---------------------------")
+
+
+def choose_action(game):
+    """Prompt the acting player for one of the legal actions. Enter ends the turn / setup."""
+    actions = game.legal_actions()
+    print(f"\n{game.acting_player.name}, choose an action:")
+    for idx, action in enumerate(actions):
+        print(f"  [{idx}] {game.describe(action)}")
+    default = actions[-1] if actions[-1].type in (ActionType.END_TURN, ActionType.END_SETUP) else None
     while True:
-        choice = input(f"\nSelect Active Pokémon (0-{len(basics)-1}): ")
+        choice = input(f"Action (0-{len(actions)-1}{', Enter to finish' if default else ''}): ").strip()
+        if choice == '' and default:
+            return default
         try:
             idx = int(choice)
-            if 0 <= idx < len(basics):
-                chosen = basics[idx]
-                player.active = chosen
-                player.hand.remove(chosen)
-                print(f"\n{player.name} chose {chosen.name} as Active Pokémon!")
-                print("\nActive Pokémon details:")
-                print(chosen.get_full_info())
-                break
-        except Exception:
+            if 0 <= idx < len(actions):
+                return actions[idx]
+        except ValueError:
             pass
         print("Invalid choice. Try again.")
-    
-    print(f"\n{player.name}, choose up to 3 Pokémon for your Bench (press Enter to finish):")
-    while len(player.bench) < 3:
-        basics = [card for card in player.hand if hasattr(card, 'can_evolve_from') and not card.can_evolve_from]
-        if not basics:
-            break
-        print("\nAvailable Pokémon for bench:")
-        for idx, card in enumerate(basics):
-            print(f"\nOption [{idx}]:")
-            print(card.get_full_info())
-        choices = input(f"\nSelect Pokémon to add to Bench (comma-separated indices, Enter to finish): ")
-        if choices == '':
-            break
-        try:
-            indices = [int(x.strip()) for x in choices.split(',') if x.strip().isdigit()]
-            for idx in sorted(set(indices), reverse=True):
-                if 0 <= idx < len(basics) and len(player.bench) < 3:
-                    chosen = basics[idx]
-                    player.bench.append(chosen)
-                    player.hand.remove(chosen)
-                    print(f"\nAdded to Bench:")
-                    print(chosen.get_full_info())
-        except Exception:
-            print("Invalid choice. Try again.")
 
-def ensure_basic_in_hand(player):
-    # Mulligan until at least one basic Pokémon is in hand
-    while True:
-        basics = [card for card in player.hand if hasattr(card, 'can_evolve_from') and not card.can_evolve_from]
-        if basics:
-            break
-        print(f"{player.name} has no Basic Pokémon in hand! Mulligan...")
-        player.deck.extend(player.hand)
-        player.hand.clear()
-        random.shuffle(player.deck)
-        for _ in range(5):
-            player.draw_card()
 
 def main():
     """Run the main game loop."""
     print("Welcome to Pokemon TCG Pocket!")
     print("==============================")
-    
+
     # Set up players
     player1_name = input("Enter name for Player 1: ") or "Player 1"
-    player2_name = input("Enter name for Player 2: ") or "Player 2"
-    
+    computer = input("Play against the computer? [y/N]: ").strip().lower() == 'y'
+    player2_name = "Computer" if computer else input("Enter name for Player 2: ") or "Player 2"
+    agent = MCTSAgent() if computer else None  # Plays Player 2
+
     player1 = Player(player1_name)
     player2 = Player(player2_name)
-    
+
     # Initialize game
     game = GameEngine(player1, player2)
+    game.events.subscribe(ConsoleLogger())
     game.setup_game()
-    # Ensure both players have at least one basic Pokémon in hand
-    ensure_basic_in_hand(player1)
-    ensure_basic_in_hand(player2)
-    # Let each player choose their starting Pokémon
-    choose_starting_pokemon(player1)
-    choose_starting_pokemon(player2)
-    
+    print(f"\n{game.current_player.name} goes first.")
+
     # Main game loop
-    while not game.is_game_over():
-        game.play_turn()
-        input("Press Enter to continue...")  # Pause between turns
-        
+    shown_turn = None
+    while not game.is_terminal():
+        if game.setup_phase:
+            print(f"\n{game.acting_player.name}'s hand: " + ', '.join(card.name for card in game.acting_player.hand))
+        elif shown_turn != game.turn:
+            shown_turn = game.turn
+            print(f"\nTurn {game.turn + 1}: {game.current_player.name}'s turn")
+            display_full_board(game)
+        if agent is not None and game.acting_player_index == 1:
+            action = agent.choose(game)
+            print(f"{game.acting_player.name}: {game.describe(action)}")
+        else:
+            action = choose_action(game)
+        game.apply(action, validate=False)
+
     # Game over
+    display_full_board(game)
     winner = game.get_winner()
     if winner:
         print(f"\nCongratulations! {winner} wins the game!")
-    
+    else:
+        print("\nThe game ended in a draw.")
+
 if __name__ == "__main__":
     main()
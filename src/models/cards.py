@@ -2,13 +2,84 @@
 Base card models for Pokemon TCG Pocket.
 """
 from dataclasses import dataclass, field
-from typing import Optional, Callable, List, TYPE_CHECKING
+from functools import lru_cache
+from itertools import count
+from typing import Dict, NamedTuple, Optional, Callable, List, Sequence, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..game.player import Player
 
 from .enums import CardType, StatusCondition, PokemonType
 
+# Energy names used in costs; "Lightning" is how the cards spell Electric
+COST_TYPES = {
+    'Grass': PokemonType.GRASS,
+    'Fire': PokemonType.FIRE,
+    'Water': PokemonType.WATER,
+    'Lightning': PokemonType.ELECTRIC,
+    'Psychic': PokemonType.PSYCHIC,
+    'Fighting': PokemonType.FIGHTING,
+    'Darkness': PokemonType.DARKNESS,
+    'Metal': PokemonType.METAL,
+}
+COLORLESS = 'Colorless'
+
+
+class EnergyCost(NamedTuple):
+    """An energy cost compiled to per-type requirements plus a Colorless count."""
+    typed: Tuple[Tuple[PokemonType, int], ...]  # (type, count) for each non-Colorless type
+    colorless: int
+    total: int
+
+    def payable(self, attached: Dict[PokemonType, int]) -> bool:
+        """Check if attached energy pays the cost: typed requirements first, Colorless from the rest."""
+        for t, n in self.typed:
+            if attached.get(t, 0) < n:
+                return False
+        return self.total == 0 or sum(attached.values()) >= self.total
+
+
+@lru_cache(maxsize=None)
+def _compile_cost(cost_types: Tuple[str, ...]) -> EnergyCost:
+    typed: Dict[PokemonType, int] = {}
+    colorless = 0
+    for name in cost_types:
+        if name == COLORLESS:
+            colorless += 1
+            continue
+        t = COST_TYPES.get(name)
+        if t is None:
+            if name.upper() not in PokemonType.__members__:
+                raise ValueError(f"Unknown energy type in cost: {name!r}")
+            t = PokemonType[name.upper()]
+        typed[t] = typed.get(t, 0) + 1
+    return EnergyCost(tuple(typed.items()), colorless, len(cost_types))
+
+
+def compile_cost(cost_types: Sequence[str]) -> EnergyCost:
+    """Compile energy names (e.g. ["Grass", "Colorless"]) to a shared EnergyCost."""
+    return _compile_cost(tuple(cost_types))
+
+
+def colorless_cost(count: int) -> EnergyCost:
+    """An all-Colorless cost, like a retreat cost."""
+    return _compile_cost((COLORLESS,) * count)
+
+
+class EnergyPool(dict):
+    """Energy attached to a Pokemon, {PokemonType: count}, counting its changes in version."""
+
+    __slots__ = ('version',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+    def __setitem__(self, key: PokemonType, value: int) -> None:
+        dict.__setitem__(self, key, value)
+        self.version += 1
+
+
 @dataclass
 class Attack:
     """Represents a Pokemon's attack."""
@@ -17,65 +88,185 @@ class Attack:
     energy_cost: int
     cost_types: List[str] = field(default_factory=list)  # e.g. ["Grass", "Colorless"]
     effect: Optional[Callable [['Player', 'Player'], None]] = None
+    cost: EnergyCost = field(init=False, repr=False, compare=False)  # Compiled from cost_types
+
+    def __post_init__(self):
+        self.cost = compile_cost(self.cost_types)
 
 @dataclass
 class Ability:
     """Represents a Pokemon's ability."""
     name: str
-    effect: Callable [['Player'], None]
+    effect: Callable [..., None]  # effect(player, opponent=None, pokemon=None)
+    activatable: bool = False  # Used by choice during the turn; otherwise passive
 
-@dataclass
+    @property
+    def passive(self) -> bool:
+        """Check if the ability applies on its own rather than being activated."""
+        return not self.activatable
+
+# Source of card instance uids, unique within the process
+_card_uids = count()
+
+
+def next_card_uid() -> int:
+    """Get a new card instance uid."""
+    return next(_card_uids)
+
+
+@dataclass(eq=False)
 class Card:
-    """Base class for all cards."""
+    """Base class for all cards.
+
+    Every instance gets a stable integer uid; cards compare by identity, so two
+    copies of the same card are distinct.
+    """
     name: str
     card_type: CardType
 
-@dataclass
-class PokemonCard(Card):
-    """Represents a Pokemon card."""
+    def __post_init__(self):
+        self.uid = next_card_uid()
+
+@dataclass(frozen=True, eq=False)
+class PokemonDefinition:
+    """Static data of a Pokemon card, shared by every copy of it in every game."""
+    name: str
     card_id: str
     hp: int
-    max_hp: int
     pokemon_type: PokemonType
     is_ex: bool = False
-    status: StatusCondition = StatusCondition.NONE
     weakness: Optional[PokemonType] = None
-    attached_tool: Optional['ToolCard'] = None
-    attacks: List[Attack] = field(default_factory=list)
+    attacks: Tuple[Attack, ...] = ()
     ability: Optional[Ability] = None
-    turn_played: int = -1
-    evolved_this_turn: bool = False
     can_evolve_from: Optional[str] = None
-    attached_energy: dict = field(default_factory=dict)  # {PokemonType: int}
     retreat_cost: int = 1
+    stage: Optional[str] = None  # "Basic", "Stage 1" or "Stage 2" when known from the card data
+    retreat: EnergyCost = field(init=False, repr=False, compare=False)  # Compiled from retreat_cost
+
+    def __post_init__(self):
+        object.__setattr__(self, 'retreat', colorless_cost(self.retreat_cost))
 
-    def __init__(self, name: str, card_id: str, hp: int, pokemon_type: PokemonType, is_ex: bool = False):
-        """Initialize a Pokemon card."""
-        super().__init__(name, CardType.POKEMON_EX if is_ex else CardType.POKEMON)
-        self.card_id = card_id
-        self.hp = hp
-        self.max_hp = hp
-        self.pokemon_type = pokemon_type
-        self.is_ex = is_ex
+    @property
+    def card_type(self) -> CardType:
+        """Get the card type of this Pokemon."""
+        return CardType.POKEMON_EX if self.is_ex else CardType.POKEMON
+
+    def get_stage(self) -> str:
+        """Get the evolutionary stage of the Pokemon.
+
+        Catalog cards always have stage data: the catalog fills it in from its
+        EvolutionGraph. Other cards without it are assumed one step above what
+        they evolve from.
+        """
+        if self.stage:
+            return self.stage
+        return "Stage 1" if self.can_evolve_from else "Basic"
+
+    def create_card(self) -> 'PokemonCard':
+        """Create a fresh in-play copy of this Pokemon."""
+        return PokemonCard(self)
+
+
+class PokemonCard(Card):
+    """A Pokemon card in a game: its mutable state plus a shared PokemonDefinition.
+
+    Static data (name, attacks, weakness, ...) is read through the definition, so
+    creating a card only allocates the per-game fields.
+    """
+
+    def __init__(self, definition: PokemonDefinition):
+        """Initialize a Pokemon card from its definition."""
+        self.uid = next_card_uid()
+        self.definition = definition
+        self.hp = definition.hp
         self.status = StatusCondition.NONE
-        self.weakness = None
-        self.attached_tool = None
-        self.attacks = []
-        self.ability = None
+        self.attached_tool: Optional['ToolCard'] = None
         self.turn_played = -1
         self.evolved_this_turn = False
-        self.can_evolve_from = None
-        self.attached_energy = {}
-        self.retreat_cost = 1
-        
+        self.ability_used = False
+        self.attached_energy = EnergyPool()
+        self._payable: Optional[tuple] = None  # (energy pool, its version, payable attack indices)
+
+    def __repr__(self) -> str:
+        return f"PokemonCard({self.card_id} {self.name}, hp={self.hp}/{self.max_hp})"
+
+    def copy(self) -> 'PokemonCard':
+        """Copy the per-game fields, keeping the uid; the definition (and any attached tool) is shared."""
+        card = PokemonCard.__new__(PokemonCard)
+        card.uid = self.uid
+        card.definition = self.definition
+        card.hp = self.hp
+        card.status = self.status
+        card.attached_tool = self.attached_tool
+        card.turn_played = self.turn_played
+        card.evolved_this_turn = self.evolved_this_turn
+        card.ability_used = self.ability_used
+        card.attached_energy = EnergyPool(self.attached_energy)
+        card._payable = None
+        return card
+
+    # Static data, read through the shared definition
+    @property
+    def name(self) -> str:
+        return self.definition.name
+
+    @property
+    def card_type(self) -> CardType:
+        return self.definition.card_type
+
+    @property
+    def card_id(self) -> str:
+        return self.definition.card_id
+
+    @property
+    def max_hp(self) -> int:
+        return self.definition.hp
+
+    @property
+    def pokemon_type(self) -> PokemonType:
+        return self.definition.pokemon_type
+
+    @property
+    def is_ex(self) -> bool:
+        return self.definition.is_ex
+
+    @property
+    def weakness(self) -> Optional[PokemonType]:
+        return self.definition.weakness
+
+    @property
+    def attacks(self) -> Tuple[Attack, ...]:
+        return self.definition.attacks
+
+    @property
+    def ability(self) -> Optional[Ability]:
+        return self.definition.ability
+
+    @property
+    def can_evolve_from(self) -> Optional[str]:
+        return self.definition.can_evolve_from
+
+    @property
+    def retreat_cost(self) -> int:
+        return self.definition.retreat_cost
+
+    def payable_attacks(self) -> Tuple[int, ...]:
+        """Indices of the attacks the attached energy pays for, cached until the energy changes."""
+        energy = self.attached_energy
+        cached = self._payable
+        if cached is not None and cached[0] is energy and cached[1] == energy.version:
+            return cached[2]
+        payable = tuple(i for i, attack in enumerate(self.definition.attacks) if attack.cost.payable(energy))
+        self._payable = (energy, energy.version, payable)
+        return payable
+
+    @property
+    def stage(self) -> Optional[str]:
+        return self.definition.stage
+
     def get_stage(self) -> str:
         """Get the evolutionary stage of the Pokemon."""
-        if not self.can_evolve_from:
-            return "Basic"
-        elif "-ex" in self.card_id.lower():
-            return "EX"
-        else:
-            return "Stage 1" if "-" not in self.can_evolve_from else "Stage 2"
+        return self.definition.get_stage()
             
     def get_full_info(self) -> str:
         """Get a formatted string with complete Pokemon information."""
@@ -196,11 +387,16 @@ class PokemonCard(Card):
         """Check if the Pokemon is knocked out."""
         return self.hp <= 0
         
+    def can_use_ability(self) -> bool:
+        """Check if this Pokemon has an activatable ability it has not used this turn."""
+        ability = self.definition.ability
+        return ability is not None and ability.activatable and not self.ability_used
+
     def can_evolve(self, current_turn: int) -> bool:
         """Check if the Pokemon can evolve this turn."""
         return (current_turn > self.turn_played) and not self.evolved_this_turn
 
-@dataclass
+@dataclass(eq=False)
 class SupporterCard(Card):
     """Represents a Supporter card."""
     effect: Callable [['Player'], None]
@@ -210,7 +406,7 @@ class SupporterCard(Card):
         super().__init__(name, CardType.SUPPORTER)
         self.effect = effect
 
-@dataclass
+@dataclass(eq=False)
 class ItemCard(Card):
     """Represents an Item card."""
     effect: Callable [['Player', Optional[PokemonCard]], None]
@@ -220,7 +416,7 @@ class ItemCard(Card):
         super().__init__(name, CardType.ITEM)
         self.effect = effect
 
-@dataclass
+@dataclass(eq=False)
 class ToolCard(Card):
     """Represents a Tool card that can be attached to Pokemon."""
     effect: Callable [[PokemonCard], None]
@@ -0,0 +1 @@
+"""Simulation module: bot policies and batch self-play."""
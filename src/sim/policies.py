@@ -0,0 +1,97 @@
+"""
+Bot policies for self-play.
+
+A policy picks one of the legal actions of the acting player:
+
+    policy(engine, actions, rng) -> Action
+
+engine is a GameEngine or a CompactEngine (policies only rely on the shared
+Action interface), actions is engine.legal_actions() and rng is the
+policy's own random stream, so decisions never disturb the game's stream.
+Policies are registered by name with @policy, so worker processes and
+command lines can refer to them by name.
+"""
+from typing import Callable, Dict, List
+
+from ..game.actions import Action, ActionType
+from ..game.rng import GameRandom
+
+Policy = Callable[[object, List[Action], GameRandom], Action]
+
+POLICIES: Dict[str, Policy] = {}
+
+
+def policy(name: str) -> Callable[[Policy], Policy]:
+    """Register a policy under a name."""
+    def register(fn: Policy) -> Policy:
+        POLICIES[name] = fn
+        return fn
+    return register
+
+
+def get_policy(name: str) -> Policy:
+    """Look up a registered policy; ValueError for unknown names."""
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown policy {name!r} (known: {', '.join(sorted(POLICIES))})") from None
+
+
+@policy('random')
+def random_policy(engine, actions: List[Action], rng: GameRandom) -> Action:
+    """Pick uniformly among the legal actions."""
+    return actions[int(rng.random() * len(actions))]
+
+
+# Greedy preference order; lower comes first
+_PRIORITY = {
+    ActionType.CHOOSE_ACTIVE: 0,
+    ActionType.SETUP_BENCH: 1,
+    ActionType.EVOLVE: 2,
+    ActionType.PLAY_BASIC: 3,
+    ActionType.ATTACH_ENERGY: 4,
+    ActionType.PLAY_SUPPORTER: 5,
+    ActionType.PLAY_ITEM: 6,
+    ActionType.ATTACH_TOOL: 7,
+    ActionType.USE_ABILITY: 8,
+    ActionType.ATTACK: 9,
+    ActionType.END_SETUP: 10,
+    ActionType.END_TURN: 10,
+    ActionType.RETREAT: 11,
+}
+
+
+@policy('greedy')
+def greedy_policy(engine, actions: List[Action], rng: GameRandom) -> Action:
+    """Develop the board first, then attack with the last (usually strongest) payable attack.
+
+    Energy goes to the Active Pokemon when possible; ties are broken at random.
+    """
+    best = min(_PRIORITY[action.type] for action in actions)
+    options = [action for action in actions if _PRIORITY[action.type] == best]
+    kind = options[0].type
+    if kind is ActionType.ATTACK:
+        return max(options, key=lambda action: action.index)
+    if kind is ActionType.ATTACH_ENERGY and options[0].target == 0:
+        return options[0]
+    return options[int(rng.random() * len(options))]
+
+
+@policy('attacker')
+def attacker_policy(engine, actions: List[Action], rng: GameRandom) -> Action:
+    """Scripted play of src.game.batch: no random choices and no Evolutions, Trainers, abilities or retreats.
+
+    Fill the board from the hand in hand order, attach Energy to the Active
+    Pokemon, then attack with the last payable attack or end the turn.
+    """
+    for kind in (ActionType.CHOOSE_ACTIVE, ActionType.SETUP_BENCH, ActionType.PLAY_BASIC):
+        options = [action for action in actions if action.type is kind]
+        if options:
+            return min(options, key=lambda action: action.card)
+    for action in actions:
+        if action.type is ActionType.ATTACH_ENERGY and action.target == 0:
+            return action
+    attacks = [action for action in actions if action.type is ActionType.ATTACK]
+    if attacks:
+        return max(attacks, key=lambda action: action.index)
+    return actions[-1]  # END_SETUP or END_TURN
@@ -0,0 +1,220 @@
+"""
+Batch self-play between two decks.
+
+Plays N games of deck A against deck B on the compact engine, each side
+driven by a registered policy, spread over a process pool:
+
+    python -m src.sim.simulate DECK_A DECK_B [--games N] [--policy-a greedy] [--policy-b random]
+                               [--workers K] [--seed S] [--output report.json]
+
+Decks are deck codes (see src.cards.deck_codes), or "random" for a random
+Grass deck. Game i always uses the random stream stream_seed(seed, i), so
+results only depend on the seed, never on the number of workers or on how
+games are scheduled. Games are sent to workers in chunks and only counts
+come back, so throughput grows with the number of cores. Each worker loads
+the card catalog once, when it starts.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from ..cards.catalog import get_catalog
+from ..cards.deck_codes import decode_deck, encode_deck
+from ..game.compact import CompactEngine
+from ..game.rng import GameRandom, new_seed, stream_seed
+from ..models.enums import PokemonType
+from .policies import POLICIES, get_policy
+
+REPORT_VERSION = 1
+CHUNKS_PER_WORKER = 4  # Enough chunks to balance uneven game lengths without much IPC
+
+
+@dataclass
+class GameCounts:
+    """Outcome counts of a batch of games; deck A is player 0."""
+    games: int = 0
+    wins_a: int = 0
+    wins_b: int = 0
+    draws: int = 0
+    turns: int = 0  # Summed over the games
+
+    def add(self, other: 'GameCounts') -> None:
+        """Add the counts of another batch."""
+        self.games += other.games
+        self.wins_a += other.wins_a
+        self.wins_b += other.wins_b
+        self.draws += other.draws
+        self.turns += other.turns
+
+
+def wilson_interval(successes: float, trials: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score confidence interval of a proportion (95% by default)."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def play_out(engine: CompactEngine, policies: Sequence, rng: GameRandom) -> None:
+    """Play the engine's game to the end with a policy per player, drawing their decisions from rng.
+
+    A position without legal actions (a determinized state no real game can
+    reach) stops the game unfinished, which scores as a draw.
+    """
+    while not engine.is_terminal():
+        actions = engine.legal_actions()
+        if not actions:
+            return
+        engine.apply(policies[engine.acting_player](engine, actions, rng), validate=False)
+
+
+def play_game(engine: CompactEngine, decks: Sequence[Sequence[int]], policies: Sequence, seed: int) -> CompactEngine:
+    """Play one game to the end with a policy per player; returns the engine in its final state."""
+    engine.rng = GameRandom(seed)
+    policy_rng = engine.rng.spawn(0)
+    engine.setup(decks)
+    play_out(engine, policies, policy_rng)
+    return engine
+
+
+def play_games(deck_a: Sequence[int], deck_b: Sequence[int], policy_a: str, policy_b: str,
+               seed: int, start: int, stop: int) -> GameCounts:
+    """Play games start..stop-1 of a simulation and count the outcomes."""
+    engine = CompactEngine(get_catalog())
+    decks = (deck_a, deck_b)
+    policies = (get_policy(policy_a), get_policy(policy_b))
+    counts = GameCounts()
+    for i in range(start, stop):
+        play_game(engine, decks, policies, stream_seed(seed, i))
+        counts.games += 1
+        counts.turns += engine.state.turn
+        winner = engine.winner
+        if winner is None:
+            counts.draws += 1
+        elif winner == 0:
+            counts.wins_a += 1
+        else:
+            counts.wins_b += 1
+    return counts
+
+
+def _chunks(games: int, count: int) -> List[Tuple[int, int]]:
+    """Split range(games) into count contiguous (start, stop) chunks."""
+    count = max(1, min(count, games))
+    bounds = [games * i // count for i in range(count + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(count) if bounds[i] < bounds[i + 1]]
+
+
+@dataclass
+class SimulationReport:
+    """Results of a simulation."""
+    deck_a: str
+    deck_b: str
+    policy_a: str
+    policy_b: str
+    seed: int
+    workers: int
+    games: int
+    wins_a: int
+    wins_b: int
+    draws: int
+    win_rate_a: float
+    win_rate_a_ci: Tuple[float, float]  # 95% Wilson interval; draws count as half a win
+    average_turns: float
+    seconds: float
+    games_per_second: float
+    version: int = REPORT_VERSION
+
+
+def simulate(deck_a: Sequence[int], deck_b: Sequence[int], games: int = 1000, policy_a: str = 'greedy',
+             policy_b: str = 'greedy', workers: Optional[int] = None, seed: Optional[int] = None) -> SimulationReport:
+    """Play games between two decks (catalog indices) and report the win rates.
+
+    workers defaults to the number of CPUs; with 1 the games run in this
+    process. The seed defaults to a fresh one (it is in the report).
+    """
+    get_policy(policy_a), get_policy(policy_b)  # Fail early on unknown names
+    workers = max(1, workers or os.cpu_count() or 1)
+    seed = new_seed() if seed is None else seed
+    deck_a, deck_b = tuple(deck_a), tuple(deck_b)
+    counts = GameCounts()
+    start = time.perf_counter()
+    if workers == 1:
+        counts.add(play_games(deck_a, deck_b, policy_a, policy_b, seed, 0, games))
+    else:
+        chunks = _chunks(games, workers * CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=workers, initializer=get_catalog) as pool:
+            futures = [pool.submit(play_games, deck_a, deck_b, policy_a, policy_b, seed, lo, hi) for lo, hi in chunks]
+            for future in futures:
+                counts.add(future.result())
+    seconds = time.perf_counter() - start
+    score = counts.wins_a + counts.draws / 2
+    return SimulationReport(
+        deck_a=encode_deck(deck_a), deck_b=encode_deck(deck_b), policy_a=policy_a, policy_b=policy_b,
+        seed=seed, workers=workers, games=counts.games, wins_a=counts.wins_a, wins_b=counts.wins_b,
+        draws=counts.draws, win_rate_a=score / counts.games if counts.games else 0.0,
+        win_rate_a_ci=wilson_interval(score, counts.games),
+        average_turns=counts.turns / counts.games if counts.games else 0.0,
+        seconds=seconds, games_per_second=counts.games / seconds if seconds > 0 else 0.0)
+
+
+def print_report(report: SimulationReport) -> None:
+    """Print a simulation report in a readable form."""
+    low, high = report.win_rate_a_ci
+    print(f"{report.games} games, {report.policy_a} (A) vs {report.policy_b} (B), seed {report.seed}")
+    print(f"  A: {report.deck_a}")
+    print(f"  B: {report.deck_b}")
+    print(f"  A wins {report.wins_a}, B wins {report.wins_b}, draws {report.draws}")
+    print(f"  A win rate {report.win_rate_a:.1%} (95% CI {low:.1%} - {high:.1%})")
+    print(f"  Average turns {report.average_turns:.1f}")
+    print(f"  {report.seconds:.2f} s on {report.workers} worker(s), {report.games_per_second:.0f} games/s")
+
+
+def _parse_deck(text: str, seed: int, index: int) -> Tuple[int, ...]:
+    catalog = get_catalog()
+    if text == 'random':  # Negative stream indices never collide with the games' streams
+        return catalog.deck_generator.sample([PokemonType.GRASS], rng=GameRandom(stream_seed(seed, -1 - index)))
+    return decode_deck(text, len(catalog))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Play many games between two decks and report win rates.")
+    parser.add_argument('deck_a', help="deck code of deck A, or 'random'")
+    parser.add_argument('deck_b', help="deck code of deck B, or 'random'")
+    parser.add_argument('--games', type=int, default=1000, help="number of games")
+    parser.add_argument('--policy-a', default='greedy', choices=sorted(POLICIES), help="policy of deck A")
+    parser.add_argument('--policy-b', default='greedy', choices=sorted(POLICIES), help="policy of deck B")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, help="master seed (default: a fresh one)")
+    parser.add_argument('--output', help="write the report as JSON to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    seed = new_seed() if args.seed is None else args.seed
+    try:
+        decks = [_parse_deck(text, seed, i) for i, text in enumerate((args.deck_a, args.deck_b))]
+    except ValueError as e:
+        parser.error(str(e))
+    report = simulate(decks[0], decks[1], max(1, args.games), args.policy_a, args.policy_b, args.workers, seed)
+    if args.output == '-':
+        json.dump(asdict(report), sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(asdict(report), f, indent=2)
+            print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
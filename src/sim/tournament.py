@@ -0,0 +1,227 @@
+"""
+Round-robin deck tournaments with cached matchup results.
+
+Plays every pairing of a list of decks on the compact engine and reports a
+matchup matrix:
+
+    python -m src.sim.tournament DECK [DECK ...] [--decks FILE] [--games N] [--policy greedy]
+                                 [--workers K] [--seed S] [--cache DIR] [--output matrix.json]
+
+Decks are deck codes (see src.cards.deck_codes); --decks reads more from a
+file, one code per line (blank lines and lines starting with # are
+skipped). Every pairing plays the same games as simulate() would: game i on
+stream_seed(seed, i), the decks in canonical order (the smaller code is
+deck A, and the first player is decided by a coin flip).
+
+Results are cached on disk, one small JSON file per pairing, keyed by the
+deck pair, ENGINE_VERSION, a fingerprint of the catalog's gameplay data,
+the policy and the seed range (seed and number of games). Rerunning a
+tournament only plays the pairings it has not seen: adding one deck to a
+pool of 50 plays 50 pairings. A pairing's file is written as soon as its
+games are done, so an interrupted tournament keeps its finished pairings.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..cards.catalog import get_catalog
+from ..cards.deck_codes import decode_deck, encode_deck
+from ..game.compact import ENGINE_VERSION
+from .policies import POLICIES, get_policy
+from .simulate import CHUNKS_PER_WORKER, GameCounts, play_games
+
+REPORT_VERSION = 1
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = '.tournament_cache'
+DEFAULT_SEED = 0  # Fixed by default: a fresh seed per run would never hit the cache
+
+
+def matchup_key(code_a: str, code_b: str, policy: str, seed: int, games: int, fingerprint: str) -> str:
+    """Cache key of a pairing (deck codes in canonical order) and the games played for it."""
+    text = f"{CACHE_VERSION}|{ENGINE_VERSION}|{fingerprint}|{code_a}|{code_b}|{policy}|{seed}|{games}"
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class MatchupCache:
+    """Matchup results on disk, one JSON file per key."""
+
+    def __init__(self, directory: str):
+        """Use (and create on first write) a cache directory."""
+        self.directory = directory
+
+    def path(self, key: str) -> str:
+        """File of a key."""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[GameCounts]:
+        """Cached counts of a key, or None if missing or unreadable."""
+        try:
+            with open(self.path(key), encoding='utf-8') as f:
+                return GameCounts(**json.load(f)['counts'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, counts: GameCounts, **details) -> None:
+        """Store the counts of a key atomically, with details for whoever reads the file."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'counts': asdict(counts), **details}, f, indent=1)
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class TournamentReport:
+    """Results of a round-robin tournament."""
+    decks: List[str]
+    policy: str
+    seed: int
+    games: int  # Per pairing
+    matrix: List[List[Optional[float]]]  # Win rate of the row deck against the column deck; draws count half
+    average: List[float]  # Average win rate of each deck over its pairings
+    pairings: int
+    played: int  # Pairings played in this run; the others came from the cache
+    seconds: float
+    engine_version: int = ENGINE_VERSION
+    version: int = REPORT_VERSION
+
+
+def run_tournament(decks: Sequence[Sequence[int]], games: int = 200, policy: str = 'greedy',
+                   workers: Optional[int] = None, seed: int = DEFAULT_SEED,
+                   cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> TournamentReport:
+    """Play every pairing of decks (catalog indices) that is not cached and report the matchup matrix.
+
+    Decks are compared by their cards, so listing a deck twice raises
+    ValueError. workers defaults to the number of CPUs; with 1 the games run
+    in this process. cache_dir None disables the cache.
+    """
+    get_policy(policy)  # Fail early on unknown names
+    workers = max(1, workers or os.cpu_count() or 1)
+    codes = [encode_deck(deck) for deck in decks]
+    if len(set(codes)) != len(codes):
+        raise ValueError("The same deck is listed more than once")
+    catalog = get_catalog()
+    fingerprint = catalog.fingerprint.hex()
+    cache = MatchupCache(cache_dir) if cache_dir else None
+    start = time.perf_counter()
+
+    results: Dict[Tuple[str, str], GameCounts] = {}
+    pending: List[Tuple[str, str, str]] = []  # (code A, code B, key) still to play
+    for i, code in enumerate(codes):
+        for other in codes[i + 1:]:
+            code_a, code_b = sorted((code, other))
+            key = matchup_key(code_a, code_b, policy, seed, games, fingerprint)
+            counts = cache.get(key) if cache is not None else None
+            if counts is not None and counts.games == games:
+                results[code_a, code_b] = counts
+            else:
+                pending.append((code_a, code_b, key))
+
+    def finish(code_a: str, code_b: str, key: str, counts: GameCounts) -> None:
+        results[code_a, code_b] = counts
+        if cache is not None:
+            cache.put(key, counts, deck_a=code_a, deck_b=code_b, policy=policy, seed=seed, games=games,
+                      engine_version=ENGINE_VERSION, catalog=fingerprint)
+
+    size = len(catalog)
+    if workers == 1 or not pending:
+        for code_a, code_b, key in pending:
+            finish(code_a, code_b, key, play_games(decode_deck(code_a, size), decode_deck(code_b, size),
+                                                   policy, policy, seed, 0, games))
+    else:
+        # Split pairings into chunks only when there are too few to keep every worker busy
+        chunks = max(1, min(games, math.ceil(workers * CHUNKS_PER_WORKER / len(pending))))
+        bounds = [(games * c // chunks, games * (c + 1) // chunks) for c in range(chunks)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=get_catalog) as pool:
+            futures = [[pool.submit(play_games, decode_deck(code_a, size), decode_deck(code_b, size),
+                                    policy, policy, seed, lo, hi) for lo, hi in bounds if lo < hi]
+                       for code_a, code_b, _ in pending]
+            for (code_a, code_b, key), pairing in zip(pending, futures):
+                counts = GameCounts()
+                for future in pairing:
+                    counts.add(future.result())
+                finish(code_a, code_b, key, counts)
+
+    matrix: List[List[Optional[float]]] = [[None] * len(codes) for _ in codes]
+    for i, code in enumerate(codes):
+        for j, other in enumerate(codes):
+            if i == j:
+                continue
+            code_a, code_b = sorted((code, other))
+            counts = results[code_a, code_b]
+            rate_a = (counts.wins_a + counts.draws / 2) / counts.games if counts.games else 0.5
+            matrix[i][j] = rate_a if code == code_a else 1 - rate_a
+    average = [sum(rate for rate in row if rate is not None) / max(1, len(codes) - 1) for row in matrix]
+    return TournamentReport(decks=codes, policy=policy, seed=seed, games=games, matrix=matrix, average=average,
+                            pairings=len(results), played=len(pending), seconds=time.perf_counter() - start)
+
+
+def print_report(report: TournamentReport, max_matrix: int = 10) -> None:
+    """Print the ranking of a tournament, and its matrix if it has at most max_matrix decks."""
+    print(f"{len(report.decks)} decks, {report.pairings} pairings of {report.games} games, {report.policy} policy, "
+          f"seed {report.seed}")
+    print(f"  {report.played} pairing(s) played, {report.pairings - report.played} from the cache, "
+          f"{report.seconds:.2f} s")
+    ranking = sorted(range(len(report.decks)), key=lambda i: -report.average[i])
+    for rank, i in enumerate(ranking, 1):
+        print(f"  {rank:3}. [{i}] {report.average[i]:6.1%}  {report.decks[i]}")
+    if len(report.decks) <= max_matrix:
+        print("  Win rate of row against column:")
+        print("       " + "".join(f"{f'[{j}]':>7}" for j in range(len(report.decks))))
+        for i, row in enumerate(report.matrix):
+            print(f"  {f'[{i}]':>5}" + "".join(f"{'-':>7}" if rate is None else f"{rate:7.1%}" for rate in row))
+
+
+def _read_deck_file(path: str) -> List[str]:
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Play a round-robin tournament between decks, reusing cached "
+                                                 "matchup results.")
+    parser.add_argument('decks', nargs='*', help="deck codes")
+    parser.add_argument('--decks', dest='deck_file', help="file with more deck codes, one per line")
+    parser.add_argument('--games', type=int, default=200, help="games per pairing")
+    parser.add_argument('--policy', default='greedy', choices=sorted(POLICIES), help="policy of both decks")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="master seed")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_DIR, help="cache directory ('' to disable)")
+    parser.add_argument('--output', help="write the report as JSON to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    codes = list(args.decks)
+    try:
+        if args.deck_file:
+            codes += _read_deck_file(args.deck_file)
+        decks = [decode_deck(code, len(get_catalog())) for code in codes]
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if len(decks) < 2:
+        parser.error("a tournament needs at least two decks")
+    try:
+        report = run_tournament(decks, max(1, args.games), args.policy, args.workers, args.seed, args.cache or None)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.output == '-':
+        json.dump(asdict(report), sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(asdict(report), f, indent=2)
+            print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
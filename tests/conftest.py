@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# Make the src package importable when pytest runs from anywhere
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cards.catalog import get_catalog  # noqa: E402
+from src.game.compact import CompactEngine, CompactState  # noqa: E402
+from src.game.engine import GameEngine  # noqa: E402
+from src.game.player import Player  # noqa: E402
+
+
+@pytest.fixture
+def new_game():
+    """Factory of seeded GameEngine games, set up and waiting for the first setup move."""
+    def make(seed):
+        game = GameEngine(Player("A"), Player("B"), get_catalog(), seed=seed)
+        game.setup_game()
+        return game
+    return make
+
+
+@pytest.fixture
+def compact_copy():
+    """Factory of CompactEngines on a game's state, with their own copy of its random stream."""
+    def make(game):
+        return CompactEngine(game.catalog, rng=game.rng.copy(), state=CompactState.from_game(game))
+    return make
@@ -0,0 +1,25 @@
+from src.cards.abilities import compile_ability, create_ability
+from src.cards.catalog import get_catalog
+from src.game.compact import CardTables
+
+
+def test_matched_ability_is_activatable():
+    ability = create_ability("Heal", "Once during your turn, you may heal 20 damage from each of your Pokémon.")
+    assert ability.activatable
+    assert ability.effect.key == 'heal_all'
+
+
+def test_unmatched_ability_is_not_activatable():
+    record = compile_ability("Mystery", "Once during your turn, you may do something nobody simulates.")
+    assert record[2] is False
+    assert record[3] == ('announce', ())
+
+
+def test_no_catalog_ability_activates_to_nothing():
+    catalog = get_catalog()
+    tables = CardTables(catalog)
+    for idx, card in enumerate(catalog):
+        ability = getattr(card, 'ability', None)
+        if ability is not None and ability.activatable:
+            assert ability.effect.key != 'announce', card.name
+            assert tables.ability[idx] is not None
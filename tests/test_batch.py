@@ -0,0 +1,10 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.game.batch import check_consistency  # noqa: E402
+
+
+@pytest.mark.parametrize('seed', [0, 7])
+def test_batch_engine_matches_game_engine(seed):
+    assert check_consistency(60, seed=seed) == []
@@ -0,0 +1,60 @@
+import os
+import shutil
+
+import pytest
+
+from src.cards import catalog_cache
+from src.cards.catalog import DEFAULT_CARDS_PATH
+from src.cards.card_loader import load_cards_from_json
+
+
+@pytest.fixture
+def cards_json(tmp_path):
+    path = str(tmp_path / 'cards.json')
+    shutil.copyfile(DEFAULT_CARDS_PATH, path)
+    return path
+
+
+@pytest.fixture
+def compiles(monkeypatch):
+    """Count the compilations of the catalog."""
+    calls = []
+    compile_catalog = catalog_cache.compile_catalog
+
+    def counting(json_path, cache_path=None):
+        calls.append(json_path)
+        return compile_catalog(json_path, cache_path)
+    monkeypatch.setattr(catalog_cache, 'compile_catalog', counting)
+    return calls
+
+
+def test_cached_records_match_a_fresh_compile(cards_json, compiles):
+    records = catalog_cache.load_card_records(cards_json)
+    assert len(compiles) == 1 and os.path.exists(catalog_cache.cache_path_for(cards_json))
+    assert catalog_cache.load_card_records(cards_json) == records
+    assert len(compiles) == 1
+    assert len(load_cards_from_json(cards_json, use_cache=False)) == len(records)
+
+
+def test_touched_source_with_same_content_is_not_recompiled(cards_json, compiles):
+    catalog_cache.load_card_records(cards_json)
+    stat = os.stat(cards_json)
+    os.utime(cards_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    catalog_cache.load_card_records(cards_json)
+    assert len(compiles) == 1
+
+
+def test_changed_compiler_invalidates_the_cache(cards_json, compiles, monkeypatch):
+    catalog_cache.load_card_records(cards_json)
+    # As if effects.py or abilities.py had been edited since the cache was written
+    monkeypatch.setattr(catalog_cache, '_compiler_digest', bytes(16))
+    catalog_cache.load_card_records(cards_json)
+    assert len(compiles) == 2
+    catalog_cache.load_card_records(cards_json)
+    assert len(compiles) == 2
+
+
+def test_compiler_digest_covers_the_compiler_modules():
+    assert {module.__name__.rsplit('.', 1)[1] for module in catalog_cache._COMPILER_MODULES} == {
+        'card_loader', 'effects', 'abilities'}
+    assert len(catalog_cache.compiler_digest()) == 16
@@ -0,0 +1,46 @@
+"""make()/unmake() and clone() of CompactEngine."""
+import random
+
+import pytest
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_unmake_restores_every_action(seed, new_game, compact_copy):
+    engine = compact_copy(new_game(seed))
+    pick = random.Random(seed)
+    while not engine.is_terminal():
+        before, before_hash = engine.state.key(), engine.state.hash
+        actions = engine.legal_actions()
+        for action in actions:
+            engine.make(action)
+            engine.unmake()
+            assert engine.state.key() == before
+            assert engine.state.hash == before_hash
+        assert engine.legal_actions() == actions
+        engine.apply(pick.choice(actions), validate=False)
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_unmake_restores_a_line_of_moves(seed, new_game, compact_copy):
+    engine = compact_copy(new_game(seed))
+    pick = random.Random(seed)
+    start = engine.state.key(), engine.state.hash
+    keys = []
+    while not engine.is_terminal() and len(keys) < 60:
+        keys.append((engine.state.key(), engine.state.hash))
+        engine.make(pick.choice(engine.legal_actions()))
+    while keys:
+        engine.unmake()
+        assert (engine.state.key(), engine.state.hash) == keys.pop()
+    assert engine.journal is None
+    assert (engine.state.key(), engine.state.hash) == start
+
+
+def test_clone_does_not_share_state(new_game, compact_copy):
+    engine = compact_copy(new_game(3))
+    clone = engine.clone()
+    assert clone.state.key() == engine.state.key()
+    before = engine.state.key()
+    clone.apply(clone.legal_actions()[0])
+    assert engine.state.key() == before
+    assert clone.state.key() != before
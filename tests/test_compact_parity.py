@@ -0,0 +1,66 @@
+"""GameEngine and CompactEngine play the same games step by step."""
+import random
+
+import pytest
+
+from src.game.actions import ActionType
+from src.game.compact import CompactState
+from src.models.cards import EnergyPool
+from src.models.enums import PokemonType
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_random_games_match(seed, new_game, compact_copy):
+    game = new_game(seed)
+    compact = compact_copy(game)
+    pick = random.Random(seed)
+    while not game.is_terminal():
+        actions = game.legal_actions()
+        assert compact.legal_actions() == actions
+        action = pick.choice(actions)
+        game.apply(action, validate=False)
+        compact.apply(action, validate=False)
+        assert CompactState.from_game(game).key() == compact.state.key()
+    assert compact.is_terminal()
+    assert compact.winner == game.winner
+
+
+def play_until_retreat_possible(game, pick):
+    """Play random non-attacking moves until the acting player has a Bench and a retreat cost."""
+    while game.setup_phase:
+        game.apply(pick.choice(game.legal_actions()))
+    while True:
+        player = game.acting_player
+        if player.bench and player.active.definition.retreat_cost >= 1:
+            return player
+        game.apply(pick.choice([a for a in game.legal_actions() if a.type is not ActionType.ATTACK]))
+
+
+@pytest.mark.parametrize('energy', [
+    [(PokemonType.GRASS, 2), (PokemonType.ELECTRIC, 3)],
+    [(PokemonType.ELECTRIC, 3), (PokemonType.GRASS, 2)],
+    [(PokemonType.METAL, 1), (PokemonType.FIRE, 1), (PokemonType.GRASS, 1)],
+])
+def test_retreat_with_mixed_energy_matches(energy, new_game, compact_copy):
+    game = new_game(26)
+    player = play_until_retreat_possible(game, random.Random(0))
+    player.active.attached_energy = EnergyPool(energy)
+    player.retreated_this_turn = False
+    compact = compact_copy(game)
+    retreat = next(a for a in game.legal_actions() if a.type is ActionType.RETREAT)
+    game.apply(retreat)
+    compact.apply(retreat)
+    assert CompactState.from_game(game).key() == compact.state.key()
+
+
+def test_pay_cost_ignores_attachment_order(new_game):
+    game = new_game(26)
+    player = play_until_retreat_possible(game, random.Random(0))
+    left = []
+    for energy in ([(PokemonType.GRASS, 2), (PokemonType.ELECTRIC, 3)],
+                   [(PokemonType.ELECTRIC, 3), (PokemonType.GRASS, 2)]):
+        poke = player.active
+        poke.attached_energy = EnergyPool(energy)
+        assert player.pay_cost(poke, ["Colorless", "Colorless"])
+        left.append({t: n for t, n in poke.attached_energy.items() if n})
+    assert left[0] == left[1]
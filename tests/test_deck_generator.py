@@ -0,0 +1,72 @@
+import random
+from collections import Counter
+
+import pytest
+
+from src.cards.card_loader import POKEMON_TYPE_MAP
+from src.cards.catalog import get_catalog
+from src.cards.deck_generator import DECK_SIZE, MAX_COPIES, DeckGenerator
+from src.models.enums import PokemonType
+
+
+def test_energy_types_come_from_attack_costs():
+    catalog = get_catalog()
+    costs = {POKEMON_TYPE_MAP.get(cost) for card in catalog.pokemon for attack in card.attacks
+             for cost in attack.cost_types}
+    energy_types = catalog.deck_generator.energy_types
+    assert energy_types
+    assert PokemonType.NORMAL not in energy_types
+    assert set(energy_types) <= costs
+
+
+def test_sampled_decks_use_their_energy_types():
+    catalog = get_catalog()
+    generator = DeckGenerator(catalog, random.Random(5))
+    for energy_type in generator.energy_types:
+        deck = generator.sample([energy_type])
+        for idx in deck:
+            for attack in catalog[idx].attacks:
+                assert {POKEMON_TYPE_MAP.get(cost) for cost in attack.cost_types} <= {energy_type, PokemonType.NORMAL}
+
+
+def check_rules(catalog, deck):
+    """Assert the deck building rules without going through DeckGenerator.is_legal."""
+    graph = catalog.evolution
+    assert len(deck) == DECK_SIZE
+    names = Counter(catalog[idx].name for idx in deck)
+    assert max(names.values()) <= MAX_COPIES
+    assert any(graph.stage_of(name) == "Basic" for name in names)
+    for name in names:
+        assert set(graph.chain_of(name)) <= set(names), f"{name} without its whole evolution line"
+        assert graph.stage_of(graph.chain_of(name)[0]) == "Basic"
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_sampled_decks_follow_the_deck_building_rules(seed):
+    catalog = get_catalog()
+    generator = catalog.deck_generator
+    rng = random.Random(seed)
+    deck = generator.sample(rng=rng)
+    assert generator.is_legal(deck)
+    check_rules(catalog, deck)
+    assert list(deck) == sorted(deck)
+
+
+def test_is_legal_rejects_broken_decks():
+    catalog = get_catalog()
+    generator = DeckGenerator(catalog, random.Random(1))
+    deck = next(deck for deck in map(list, generator.generate(50, [PokemonType.GRASS]))
+                if any(catalog.evolution.parent_of(catalog[idx].name) for idx in deck))
+    assert generator.is_legal(deck)
+    assert not generator.is_legal(deck[:-1])
+    assert not generator.is_legal(deck + deck[:1])
+    names = Counter(catalog[idx].name for idx in deck)
+    pair = next(idx for idx in deck if names[catalog[idx].name] == MAX_COPIES)
+    single = next(idx for idx in deck if names[catalog[idx].name] == 1)
+    assert not generator.is_legal([pair if idx == single else idx for idx in deck])  # Three copies
+    graph = catalog.evolution
+    evolved = next(idx for idx in deck if graph.parent_of(catalog[idx].name))
+    parent = graph.parent_of(catalog[evolved].name)
+    outsider = next(catalog.index_of(card) for card in catalog.basics if card.name not in names)
+    # The pre-evolution is swapped for a Basic outside the deck: only the line is broken
+    assert not generator.is_legal([outsider if catalog[idx].name == parent else idx for idx in deck])
@@ -0,0 +1,35 @@
+import pytest
+
+from src.ai.estimator import estimate_win_probability
+
+
+@pytest.mark.parametrize('max_rollouts', [0, -5])
+def test_rollout_budget_below_one_is_rejected(max_rollouts, new_game):
+    with pytest.raises(ValueError):
+        estimate_win_probability(new_game(1), max_rollouts=max_rollouts, seed=0)
+
+
+def test_batch_size_below_one_is_rejected(new_game):
+    with pytest.raises(ValueError):
+        estimate_win_probability(new_game(1), batch_size=0, seed=0)
+
+
+def test_expired_deadline_still_runs_one_batch(new_game):
+    estimate = estimate_win_probability(new_game(2), batch_size=5, time_limit=0.0, seed=0)
+    assert estimate.rollouts == 5
+    assert 0.0 <= estimate.win_probability <= 1.0
+    assert not estimate.converged
+
+
+def test_estimate_depends_only_on_seed(new_game):
+    game = new_game(3)
+    first = estimate_win_probability(game, max_rollouts=40, batch_size=10, seed=11)
+    second = estimate_win_probability(game, max_rollouts=40, batch_size=20, seed=11)
+    assert (first.rollouts, first.wins, first.draws) == (second.rollouts, second.wins, second.draws)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_estimate_from_setup(seed, new_game):
+    # The opponent's redealt hand must let it choose an Active Pokemon
+    estimate = estimate_win_probability(new_game(seed), max_rollouts=50, batch_size=50, seed=0)
+    assert estimate.rollouts == 50
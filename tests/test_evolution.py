@@ -0,0 +1,60 @@
+"""Both engines answer evolution questions from the catalog's EvolutionGraph."""
+from src.cards.catalog import CardCatalog, get_catalog
+from src.game.compact import CardTables
+from src.game.engine import GameEngine
+from src.game.player import Player
+from src.game.zones import Hand
+from src.models.cards import PokemonDefinition
+from src.models.enums import PokemonType
+
+
+def pokemon(name, card_id, evolves_from=None, stage=None):
+    return PokemonDefinition(name, card_id, 60, PokemonType.GRASS, can_evolve_from=evolves_from, stage=stage)
+
+
+def test_catalog_fills_in_missing_stages():
+    catalog = CardCatalog([pokemon("Venusaur", "T-003", "Ivysaur"), pokemon("Ivysaur", "T-002", "Bulbasaur"),
+                           pokemon("Bulbasaur", "T-001")])
+    assert [card.stage for card in catalog] == ["Stage 2", "Stage 1", "Basic"]
+    assert catalog[0].create_card().get_stage() == "Stage 2"
+    assert [card.name for card in catalog.by_stage("Stage 2")] == ["Venusaur"]
+
+
+def test_catalog_stages_match_the_graph():
+    catalog = get_catalog()
+    for card in catalog.pokemon:
+        assert card.get_stage() == catalog.evolution.stage_of(card.name)
+
+
+def test_printings_follow_the_graph():
+    # The second Ivysaur printing lacks its evolves-from data; the graph knows the species
+    catalog = CardCatalog([pokemon("Bulbasaur", "T-001"), pokemon("Ivysaur", "T-002", "Bulbasaur"),
+                           pokemon("Ivysaur", "T-102")])
+    evolution = catalog.evolution
+    assert evolution.parent_of_card(catalog[2]) == "Bulbasaur"
+    assert not evolution.is_basic(catalog[2])
+
+    hand = Hand((card.create_card() for card in catalog), evolution)
+    assert [card.name for card in hand.basics.values()] == ["Bulbasaur"]
+    assert [card.name for card in hand.evolutions.values()] == ["Ivysaur", "Ivysaur"]
+
+    tables = CardTables(catalog)
+    assert tables.basic == [True, False, False]
+    assert tables.parent[1] == tables.parent[2] == tables.species[0]
+
+    game = GameEngine(Player("A"), Player("B"), catalog, seed=0)
+    player = game.players[0]
+    assert player.evolution is evolution and player.hand.evolution is evolution
+    target, evolved = catalog[0].create_card(), catalog[2].create_card()
+    target.turn_played = 1
+    player.active = target
+    player.hand.append(evolved)
+    player.index_board()
+    assert player.evolve_pokemon(evolved, target, 2)
+    assert player.active is evolved
+
+
+def test_cards_outside_a_game_use_their_own_data():
+    hand = Hand([pokemon("Bulbasaur", "T-001").create_card(), pokemon("Ivysaur", "T-002", "Bulbasaur").create_card()])
+    assert [card.name for card in hand.basics.values()] == ["Bulbasaur"]
+    assert [card.name for card in hand.evolutions.values()] == ["Ivysaur"]
@@ -0,0 +1,112 @@
+"""MCTSAgent budgets, determinism, tree reuse, legality and strength."""
+from array import array
+
+import pytest
+
+from src.ai.mcts import MCTSAgent, Node
+from src.game.actions import ActionType
+from src.game.compact import CompactEngine
+from src.game.rng import GameRandom
+from src.sim.policies import get_policy
+from src.sim.simulate import play_out
+
+# Actions whose outcome the agent observes in full, so the next search finds it in the tree
+DETERMINISTIC = {ActionType.CHOOSE_ACTIVE, ActionType.SETUP_BENCH, ActionType.PLAY_BASIC,
+                 ActionType.ATTACH_ENERGY, ActionType.EVOLVE, ActionType.RETREAT}
+
+
+def play(game, agent, seat, seed):
+    """Play a game to the end, agent in seat against the greedy policy; returns the agent's moves."""
+    greedy = get_policy('greedy')
+    rng = GameRandom(seed)
+    moves = []
+    while not game.is_terminal():
+        actions = game.legal_actions()
+        if game.acting_player_index == seat:
+            action = agent.choose(game)
+            assert action in actions
+            moves.append(action)
+        else:
+            action = greedy(game, actions, rng)
+        game.apply(action)
+    return moves
+
+
+def with_choice(game):
+    """Advance a game with the first legal action until the acting player has a choice."""
+    while len(game.legal_actions()) == 1:
+        game.apply(game.legal_actions()[0])
+    return game
+
+
+def test_a_budget_is_required():
+    with pytest.raises(ValueError):
+        MCTSAgent(time_limit=None, iterations=None)
+
+
+def test_iteration_budget(new_game):
+    game = with_choice(new_game(2))
+    agent = MCTSAgent(time_limit=None, iterations=25, seed=0)
+    assert agent.choose(game) in game.legal_actions()
+    assert agent.last_iterations == 25
+
+
+def test_same_seed_same_moves(new_game):
+    first = play(new_game(2), MCTSAgent(time_limit=None, iterations=15, seed=7), 0, 2)
+    second = play(new_game(2), MCTSAgent(time_limit=None, iterations=15, seed=7), 0, 2)
+    assert first == second
+
+
+def test_tree_is_reused_after_own_moves(new_game):
+    agent = MCTSAgent(time_limit=None, iterations=20, seed=0)
+    game = new_game(5)
+    greedy = get_policy('greedy')
+    rng = GameRandom(5)
+    previous = None  # The agent's action if it took the last decision
+    reused = []
+    while not game.is_terminal():
+        actions = game.legal_actions()
+        if game.acting_player_index == 0:
+            action = agent.choose(game)
+            if len(actions) > 1 and previous is not None and previous.type in DETERMINISTIC:
+                reused.append(agent.last_reused)
+            previous = action
+        else:
+            action = greedy(game, actions, rng)
+            previous = None
+        game.apply(action)
+    assert reused and all(reused)
+
+
+@pytest.mark.parametrize('seed', [1000, 9, 30, 36])
+@pytest.mark.parametrize('seat', [0, 1])
+def test_choices_are_legal_from_setup_to_the_end(seed, seat, new_game):
+    # These games crashed in setup when determinization dealt the opponent no Basic Pokemon
+    game = new_game(seed)
+    play(game, MCTSAgent(time_limit=None, iterations=10, seed=0), seat, seed)
+    assert game.is_terminal()
+
+
+def test_beats_the_greedy_policy(new_game):
+    wins = 0
+    for seed in range(10):
+        seat = seed % 2
+        game = new_game(seed)
+        play(game, MCTSAgent(time_limit=None, iterations=30, seed=seed), seat, seed)
+        wins += game.winner == seat
+    assert wins >= 7
+
+
+def test_position_without_actions_ends_the_search(new_game, compact_copy):
+    # No real game gets here: the player to choose an Active Pokemon holds no Basic
+    engine = compact_copy(new_game(2))
+    basic = engine.tables.basic
+    p = engine.acting_player
+    others = [idx for idx in engine.state.deck[p] if not basic[idx]]
+    engine.state.hand[p][:] = array('h', others[:len(engine.state.hand[p])])
+    assert engine.legal_actions() == [] and not engine.is_terminal()
+    play_out(engine, (get_policy('greedy'),) * 2, GameRandom(0))
+    assert not engine.is_terminal()
+    agent = MCTSAgent(time_limit=None, iterations=5, seed=0)
+    agent._engine = CompactEngine(engine.catalog)
+    agent._iterate(Node(b''), engine.state, p)
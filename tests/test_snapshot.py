@@ -0,0 +1,118 @@
+"""Binary snapshots of compact states and running games."""
+import random
+
+import pytest
+
+from src.cards.catalog import CardCatalog, get_catalog
+from src.game.actions import ActionType
+from src.game.compact import CompactEngine, CompactState
+from src.game.engine import GameEngine
+from src.game.player import Player
+from src.models.cards import EnergyPool
+from src.models.enums import PokemonType
+
+
+def play(game, pick, moves):
+    for _ in range(moves):
+        if game.is_terminal():
+            return
+        game.apply(pick.choice(game.legal_actions()), validate=False)
+
+
+def assert_same_games(game, copy, pick):
+    """Play both games with the same choices to the end, comparing them after every step."""
+    while not game.is_terminal():
+        actions = game.legal_actions()
+        assert copy.legal_actions() == actions
+        action = pick.choice(actions)
+        game.apply(action, validate=False)
+        copy.apply(action, validate=False)
+        assert CompactState.from_game(copy).key() == CompactState.from_game(game).key()
+    assert copy.is_terminal()
+    assert copy.winner == game.winner
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_compact_state_round_trip(seed, new_game):
+    game = new_game(seed)
+    play(game, random.Random(seed), 30)
+    state = CompactState.from_game(game)
+    restored = CompactState.from_bytes(state.to_bytes())
+    assert restored.key() == state.key()
+    assert restored.to_bytes() == state.to_bytes()
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_compact_engine_continues_after_round_trip(seed, new_game):
+    engine = CompactEngine(get_catalog())
+    game = new_game(seed)
+    engine.load_state(CompactState.from_game(game))
+    pick = random.Random(seed)
+    for _ in range(20):
+        if engine.is_terminal():
+            break
+        engine.apply(pick.choice(engine.legal_actions()), validate=False)
+    copy = CompactEngine(get_catalog(), rng=engine.rng.copy(), state=CompactState.from_bytes(engine.state.to_bytes()))
+    while not engine.is_terminal():
+        actions = engine.legal_actions()
+        assert copy.legal_actions() == actions
+        action = pick.choice(actions)
+        engine.apply(action, validate=False)
+        copy.apply(action, validate=False)
+        assert copy.state.key() == engine.state.key()
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_game_continues_after_round_trip(seed, new_game):
+    game = new_game(seed)
+    pick = random.Random(seed)
+    play(game, pick, 25)
+    copy = GameEngine.from_bytes(game.to_bytes(), game.catalog)
+    assert_same_games(game, copy, pick)
+
+
+def test_game_before_setup_round_trips():
+    game = GameEngine(Player("A"), Player("B"), get_catalog(), seed=1)
+    copy = GameEngine.from_bytes(game.to_bytes(), game.catalog)
+    assert copy.first_player == game.first_player
+    assert copy.rng.getstate() == game.rng.getstate()
+
+
+def test_mixed_energy_retreat_after_round_trip(new_game):
+    game = new_game(26)
+    pick = random.Random(0)
+    while game.setup_phase:
+        game.apply(pick.choice(game.legal_actions()))
+    while not (game.acting_player.bench and game.acting_player.active.definition.retreat_cost >= 1):
+        game.apply(pick.choice([a for a in game.legal_actions() if a.type is not ActionType.ATTACK]))
+    player = game.acting_player
+    # Attached in the opposite of PokemonType order; the snapshot restores PokemonType order
+    player.active.attached_energy = EnergyPool([(PokemonType.GRASS, 2), (PokemonType.ELECTRIC, 3)])
+    player.retreated_this_turn = False
+    copy = GameEngine.from_bytes(game.to_bytes(), game.catalog)
+    retreat = next(a for a in game.legal_actions() if a.type is ActionType.RETREAT)
+    game.apply(retreat)
+    copy.apply(retreat)
+    assert CompactState.from_game(copy).key() == CompactState.from_game(game).key()
+    assert_same_games(game, copy, pick)
+
+
+def test_malformed_snapshots_are_rejected(new_game):
+    data = new_game(3).to_bytes()
+    with pytest.raises(ValueError):
+        GameEngine.from_bytes(data[:len(data) // 2], get_catalog())
+    with pytest.raises(ValueError):
+        GameEngine.from_bytes(b'XXXX' + data[4:], get_catalog())
+    with pytest.raises(ValueError):
+        CompactState.from_bytes(b'PTCS\x63' + bytes(100))
+
+
+def test_snapshot_from_another_catalog_is_rejected(new_game):
+    catalog = get_catalog()
+    data = new_game(3).to_bytes()
+    reordered = CardCatalog(catalog.cards[1:] + catalog.cards[:1])
+    assert len(reordered) == len(catalog)
+    assert reordered.fingerprint != catalog.fingerprint
+    with pytest.raises(ValueError, match="different card catalog"):
+        GameEngine.from_bytes(data, reordered)
+    assert CardCatalog(catalog.cards).fingerprint == catalog.fingerprint
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from src.cards.catalog import CardCatalog, get_catalog
+from src.cards.deck_generator import DeckGenerator
+from src.models.enums import PokemonType
+from src.sim.tournament import run_tournament
+
+
+@pytest.fixture(scope='module')
+def decks():
+    generator = DeckGenerator(get_catalog(), random.Random(0))
+    return [generator.sample([energy_type]) for energy_type in
+            (PokemonType.GRASS, PokemonType.FIRE, PokemonType.WATER, PokemonType.ELECTRIC, PokemonType.PSYCHIC)]
+
+
+def run(decks, cache_dir, **options):
+    settings = dict(games=4, policy='greedy', workers=1, seed=0, cache_dir=cache_dir and str(cache_dir))
+    settings.update(options)
+    return run_tournament(decks, **settings)
+
+
+def test_rerun_comes_from_the_cache(decks, tmp_path):
+    first = run(decks[:4], tmp_path)
+    assert (first.pairings, first.played) == (6, 6)
+    second = run(decks[:4], tmp_path)
+    assert second.played == 0
+    assert second.matrix == first.matrix
+
+
+def test_new_deck_plays_only_its_pairings(decks, tmp_path):
+    run(decks[:4], tmp_path)
+    report = run(decks, tmp_path)
+    assert (report.pairings, report.played) == (10, 4)
+
+
+@pytest.mark.parametrize('change', [dict(seed=1), dict(games=5), dict(policy='random')])
+def test_other_games_are_not_served_from_the_cache(decks, tmp_path, change):
+    run(decks[:3], tmp_path)
+    assert run(decks[:3], tmp_path, **change).played == 3
+    assert run(decks[:3], tmp_path, **change).played == 0
+
+
+def test_other_catalog_is_not_served_from_the_cache(decks, tmp_path, monkeypatch):
+    run(decks[:3], tmp_path)
+    monkeypatch.setattr(CardCatalog, 'fingerprint', property(lambda self: bytes(8)))
+    assert run(decks[:3], tmp_path).played == 3
+
+
+def test_result_does_not_depend_on_workers(decks):
+    serial = run(decks[:3], None)
+    parallel = run(decks[:3], None, workers=2)
+    assert parallel.matrix == serial.matrix
+    assert parallel.played == 3
+
+
+def test_duplicate_decks_are_rejected(decks, tmp_path):
+    with pytest.raises(ValueError):
+        run([decks[0], decks[1], decks[0]], tmp_path)
@@ -0,0 +1,40 @@
+"""The Zobrist hash CompactEngine keeps up to date incrementally."""
+import random
+
+import pytest
+
+
+def full_hash(engine):
+    return engine.tables.zobrist.state_hash(engine.state)
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_incremental_hash_matches_full_rehash(seed, new_game, compact_copy):
+    engine = compact_copy(new_game(seed))
+    pick = random.Random(seed)
+    assert engine.state.hash == full_hash(engine)
+    while not engine.is_terminal():
+        actions = engine.legal_actions()
+        for action in actions:
+            engine.make(action)
+            assert engine.state.hash == full_hash(engine)
+            engine.unmake()
+        engine.apply(pick.choice(actions), validate=False)
+        assert engine.state.hash == full_hash(engine)
+
+
+def test_equal_states_have_equal_hashes(new_game, compact_copy):
+    engine = compact_copy(new_game(3))
+    clone = engine.clone()
+    assert clone.state.key() == engine.state.key()
+    assert clone.state.hash == engine.state.hash == full_hash(engine)
+
+
+def test_different_states_have_different_hashes(new_game, compact_copy):
+    engine = compact_copy(new_game(4))
+    hashes = {engine.state.key(): engine.state.hash}
+    pick = random.Random(4)
+    while not engine.is_terminal():
+        engine.apply(pick.choice(engine.legal_actions()), validate=False)
+        hashes[engine.state.key()] = engine.state.hash
+    assert len(set(hashes.values())) == len(hashes)
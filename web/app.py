@@ -1,6 +1,8 @@
-from flask import Flask, render_template, redirect, url_for, session, request
+from flask import Flask, jsonify, render_template, redirect, url_for, session, request
 import os
 import sys
+import uuid
+from typing import Optional
 
 # Add src to the path so we can import game logic
 src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -10,77 +12,97 @@ if src_path not in sys.path:
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
+from src.ai.estimator import estimate_win_probability
+from src.cards.catalog import get_catalog
 from src.game.engine import GameEngine
 from src.game.player import Player
-from src.models.cards import PokemonCard
 
 app = Flask(__name__)
 app.secret_key = "supersecretkey"  # For session management
 
-game = None  # Global for demo; for production, use a better state manager
+catalog = get_catalog()  # Loaded once at startup and shared by every game
+
+# Games in progress are stored as binary snapshots, one file per game, so they survive restarts
+GAMES_DIR = os.environ.get("GAMES_DIR", os.path.join(app.instance_path, "games"))
+
+def game_path(game_id: str) -> str:
+    return os.path.join(GAMES_DIR, f"{game_id}.game")
+
+def save_game(game_id: str, game: GameEngine) -> None:
+    """Write a game's snapshot atomically."""
+    os.makedirs(GAMES_DIR, exist_ok=True)
+    path = game_path(game_id)
+    with open(path + ".tmp", "wb") as f:
+        f.write(game.to_bytes())
+    os.replace(path + ".tmp", path)
+
+def load_game() -> Optional[GameEngine]:
+    """Load the session's game, or None if there is none (or its snapshot is unreadable)."""
+    game_id = session.get("game_id")
+    if not game_id:
+        return None
+    try:
+        with open(game_path(game_id), "rb") as f:
+            return GameEngine.from_bytes(f.read(), catalog)
+    except (OSError, ValueError):
+        return None
 
 @app.route("/", methods=["GET", "POST"])
 def index():
-    global game
     if request.method == "POST":
         p1 = Player(request.form["player1"])
         p2 = Player(request.form["player2"])
-        game = GameEngine(p1, p2)
+        game = GameEngine(p1, p2, catalog)
         game.setup_game()
-        session["started"] = True
+        session["game_id"] = uuid.uuid4().hex
+        save_game(session["game_id"], game)
         return redirect(url_for("game_view"))
     return render_template("index.html")
 
 @app.route("/game")
 def game_view():
-    global game
-    if not session.get("started") or game is None:
+    game = load_game()
+    if game is None:
         return redirect(url_for("index"))
-        
+
+    actions = game.legal_actions()
     return render_template(
         "game.html",
         game=game,
         player1=game.player1,
         player2=game.player2,
         current_turn=game.current_turn,
-        current_player=game.current_player,
+        current_player=game.acting_player,
         setup_phase=game.setup_phase,
-        needs_setup=game.needs_setup
+        actions=[(idx, game.describe(action)) for idx, action in enumerate(actions)],
+        winner=game.get_winner(),
+        card_image=catalog.image_url  # Display metadata is only loaded once a page needs it
     )
 
-@app.route("/choose_active/<int:player_num>/<int:card_idx>")
-def choose_active(player_num, card_idx):
-    global game
-    if not session.get("started") or game is None:
+@app.route("/action/<int:action_idx>")
+def take_action(action_idx):
+    game = load_game()
+    if game is None:
         return redirect(url_for("index"))
-        
-    player = game.players[player_num - 1]  # Convert to 0-based index
-    
-    # Only allow choice during setup phase
-    if not game.setup_phase or player.active is not None:
-        return "Cannot choose active Pokémon at this time", 400
-        
-    # Validate card choice
-    if not (0 <= card_idx < len(player.hand)):
-        return "Invalid card index", 400
-        
-    chosen_card = player.hand[card_idx]
-    if not (isinstance(chosen_card, PokemonCard) and not chosen_card.can_evolve_from):
-        return "Invalid card choice - must be a basic Pokémon", 400
-        
-    # Move card from hand to active position
-    player.hand.remove(chosen_card)
-    player.active = chosen_card
-    
-    # Mark this player's setup as complete
-    player_idx = game.players.index(player)
-    game.setup_complete[player_idx] = True
-    
-    # Check if setup phase is complete
-    if all(game.setup_complete):
-        game.setup_phase = False
-        
+
+    # Actions are addressed by their position in the list the page was rendered with
+    actions = game.legal_actions()
+    if not (0 <= action_idx < len(actions)):
+        return "Invalid action", 400
+    game.apply(actions[action_idx], validate=False)
+    save_game(session["game_id"], game)
     return redirect(url_for("game_view"))
 
+@app.route("/odds")
+def odds():
+    """Estimated win probability of the acting player, within an interactive time budget."""
+    game = load_game()
+    if game is None:
+        return jsonify(error="No game in progress"), 404
+    estimate = estimate_win_probability(game, tolerance=0.02, time_limit=0.5, catalog=catalog)
+    low, high = estimate.interval
+    return jsonify(player=game.players[estimate.player].name, win_probability=estimate.win_probability,
+                   standard_error=estimate.standard_error, interval=[low, high], rollouts=estimate.rollouts)
+
 if __name__ == "__main__":
     app.run(debug=True)